@@ -1,10 +1,2216 @@
+import time
+_STARTUP_T0 = time.perf_counter()  # 시작 시간 보고의 기준 시각
+
 from PyQt5.QtWidgets import (QMainWindow, QToolBar, QAction, QVBoxLayout, 
                            QWidget, QPushButton, QFileDialog, QLabel, 
                            QColorDialog, QComboBox, QInputDialog, QHBoxLayout, 
-                           QSizePolicy, QTextEdit, QScrollArea, QStackedLayout)
-from PyQt5.QtCore import Qt, QPoint, QPointF, QRectF, QByteArray, QSize, QTimer
-from PyQt5.QtGui import QIcon, QPixmap, QPainter, QColor, QImage, QPen, qRgba
-import fitz  # PyMuPDF
+                           QSizePolicy, QTextEdit, QScrollArea, QStackedLayout,
+                           QListView, QMenu)
+from PyQt5.QtCore import (Qt, QPoint, QPointF, QRectF, QSize, QTimer,
+                          QObject, QThread, pyqtSignal, QAbstractListModel, QModelIndex)
+from PyQt5.QtGui import (QIcon, QIconEngine, QPixmap, QPainter, QColor, QImage, QPen, qRgba,
+                         QFont, QFontMetricsF, QPolygonF, QTransform)
+import base64
+import bisect
+import gzip
+import hashlib
+import importlib
+import importlib.util
+import json
+import math
+import mmap
+import os
+import string
+import struct
+import threading
+from collections import OrderedDict, deque
+from enum import IntEnum
+
+
+class _LazyModule:
+    """처음 속성에 접근할 때 모듈을 import 하는 대리 객체 (시작 시간을 줄이기 위해)
+
+    import 후에는 모듈 전역 이름을 실제 모듈로 바꿔 이후 접근에는 비용이 없다.
+    """
+
+    def __init__(self, name, alias):
+        self._name = name
+        self._alias = alias
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self._name)
+        globals()[self._alias] = module
+        return getattr(module, attr)
+
+
+fitz = _LazyModule('fitz', 'fitz')  # PyMuPDF (Markdown 만 여는 경우에는 불러오지 않음)
+# numpy 가 없으면 픽셀 필터 없이 원본 래스터만 사용 (있는지만 확인하고 import 는 처음 쓸 때)
+np = _LazyModule('numpy', 'np') if importlib.util.find_spec('numpy') else None
+
+
+class StartupProfile:
+    """시작 단계별 소요 시간을 기록해 보고 (--startup-report)"""
+
+    def __init__(self, start):
+        self.start = start
+        self.marks = []  # (단계 이름, 끝난 시각)
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+
+    def report(self):
+        print("시작 시간 보고:")
+        previous = self.start
+        for name, at in self.marks:
+            print(f"  {name:<20}{(at - previous) * 1000:8.1f} ms   (누적 {(at - self.start) * 1000:8.1f} ms)")
+            previous = at
+
+
+startup_profile = StartupProfile(_STARTUP_T0)
+
+
+class _NullSpan:
+    """계측이 꺼져 있을 때 쓰는 아무것도 하지 않는 구간"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _TraceSpan:
+    __slots__ = ('tracer', 'name', 'args', 'start')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.start, time.perf_counter(), self.args)
+        return False
+
+    def set(self, **args):
+        """구간이 끝나기 전에 알게 된 값(바이트 수 등)을 인자로 추가"""
+        self.args.update(args)
+
+
+class RenderTracer:
+    """렌더/합성 단계별 소요 시간, 캐시 적중, 할당 바이트를 기록해 Chrome trace-event JSON 으로 내보냄
+
+    여러 스레드에서 호출된다. 꺼져 있으면 span() 이 공용 빈 구간을 돌려줘 비용이 거의 없다.
+    구간 인자에 'bytes' 가 있으면 할당 바이트로 누적한다.
+    """
+
+    max_events = 200000  # 오래된 이벤트부터 버림
+
+    def __init__(self):
+        self.enabled = False
+        self.events = deque(maxlen=self.max_events)  # (ph, 이름, 시작, 길이, 스레드, 인자)
+        self.stages = {}  # 단계 이름 -> [횟수, 총 시간, 최대, 마지막] (초)
+        self.counters = {}  # 이름 -> 누적 값
+        self.thread_names = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def reset(self):
+        with self._lock:
+            self.events.clear()
+            self.stages = {}
+            self.counters = {}
+            self._origin = time.perf_counter()
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _TraceSpan(self, name, args)
+
+    def record(self, name, start, end, args):
+        duration = end - start
+        thread = threading.get_ident()
+        with self._lock:
+            self.events.append(('X', name, start, duration, thread, args))
+            if thread not in self.thread_names:
+                self.thread_names[thread] = threading.current_thread().name
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = self.stages[name] = [0, 0.0, 0.0, 0.0]
+            stage[0] += 1
+            stage[1] += duration
+            stage[2] = max(stage[2], duration)
+            stage[3] = duration
+            if 'bytes' in args:
+                self.counters['bytes_allocated'] = self.counters.get('bytes_allocated', 0) + args['bytes']
+
+    def count(self, name, value=1):
+        """캐시 적중 같은 누적 카운터 증가"""
+        if not self.enabled:
+            return
+        with self._lock:
+            total = self.counters[name] = self.counters.get(name, 0) + value
+            self.events.append(('C', name, time.perf_counter(), 0.0, threading.get_ident(), {name: total}))
+
+    def summary_lines(self):
+        """HUD 에 보여줄 단계별 요약 (총 시간이 큰 순서)"""
+        with self._lock:
+            stages = sorted(self.stages.items(), key=lambda item: -item[1][1])
+            counters = dict(self.counters)
+        lines = [f"{name:<18}{n:6d}  평균 {total / n * 1000:7.2f}  최대 {peak * 1000:7.2f}  "
+                 f"최근 {last * 1000:7.2f} ms" for name, (n, total, peak, last) in stages]
+        hits = counters.get('cache_hit_memory', 0) + counters.get('cache_hit_disk', 0)
+        lookups = hits + counters.get('cache_miss', 0)
+        if lookups:
+            lines.append(f"캐시 적중 {hits}/{lookups} ({hits * 100 // lookups}%, 디스크 "
+                         f"{counters.get('cache_hit_disk', 0)})  타일 적중 {counters.get('tile_cache_hit', 0)}")
+        if counters.get('display_list_hit'):
+            lines.append(f"디스플레이 리스트 재사용 {counters['display_list_hit']}")
+        lines.append(f"할당 {counters.get('bytes_allocated', 0) / (1024 * 1024):.1f} MB")
+        return lines
+
+    def export_chrome_trace(self, path):
+        """chrome://tracing / Perfetto 에서 열 수 있는 trace-event JSON 으로 저장"""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+            thread_names = dict(self.thread_names)
+            counters = dict(self.counters)
+            origin = self._origin
+        trace = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                 for tid, name in thread_names.items()]
+        for ph, name, start, duration, tid, args in events:
+            event = {'name': name, 'cat': 'render', 'ph': ph, 'pid': pid, 'tid': tid,
+                     'ts': round((start - origin) * 1e6, 3), 'args': args}
+            if ph == 'X':
+                event['dur'] = round(duration * 1e6, 3)
+            trace.append(event)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms',
+                       'otherData': {'counters': counters}}, f, default=str)
+
+
+# 계측 스위치: PDFVIEW_TRACE 가 있으면 시작부터 켜고, 값이 .json 경로면 종료 시 그 파일로 내보냄
+tracer = RenderTracer()
+tracer.enabled = bool(os.environ.get('PDFVIEW_TRACE'))
+
+
+class PageCache:
+    """(페이지, 배율, 회전, 렌더 옵션) 키로 래스터를 보관하는 메모리 제한 LRU 캐시"""
+
+    def __init__(self, max_bytes=512 * 1024 * 1024):
+        self.max_bytes = max_bytes  # 캐시가 사용할 수 있는 최대 바이트 수
+        self.entries = OrderedDict()  # key -> (이미지, 크기), 가장 최근 사용이 끝에 위치
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(page_num, scale, rotation, options=()):
+        # 부동소수점 오차로 같은 상태가 다른 키가 되지 않도록 배율을 반올림
+        return (page_num, round(scale, 4), rotation % 360, tuple(options))
+
+    @staticmethod
+    def image_bytes(image):
+        """QPixmap / QImage 가 차지하는 대략적인 메모리 크기"""
+        return image.width() * image.height() * max(image.depth(), 8) // 8
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, image):
+        size = self.image_bytes(image)
+        if key in self.entries:
+            self.current_bytes -= self.entries.pop(key)[1]
+        # 예산보다 큰 래스터는 캐시하지 않음 (다른 항목을 모두 밀어내는 것을 방지)
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (image, size)
+        self.current_bytes += size
+        self._evict()
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self.entries:
+            _, (_, size) = self.entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def set_budget(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def best_key(self, page_num, rotation=None, options=None):
+        """해당 페이지의 캐시 항목 중 배율이 가장 큰 것의 키"""
+        best = None
+        for key in self.entries:
+            if key[0] != page_num:
+                continue
+            if rotation is not None and key[2] != rotation % 360:
+                continue
+            if options is not None and key[3] != tuple(options):
+                continue
+            if best is None or key[1] > best[1]:
+                best = key
+        return best
+
+    def find_page(self, page_num, rotation=None, options=None):
+        """배율과 무관하게 해당 페이지의 가장 선명한 래스터를 반환 (표시용 대체 이미지)"""
+        key = self.best_key(page_num, rotation, options)
+        return None if key is None else self.entries[key][0]
+
+    def remove(self, key):
+        """항목 하나 제거"""
+        item = self.entries.pop(key, None)
+        if item is not None:
+            self.current_bytes -= item[1]
+
+    def invalidate(self, page_num=None):
+        """특정 페이지(또는 전체)의 캐시 항목 제거"""
+        if page_num is None:
+            self.entries.clear()
+            self.current_bytes = 0
+            return
+        for key in [k for k in self.entries if k[0] == page_num]:
+            self.current_bytes -= self.entries.pop(key)[1]
+
+    def clear(self):
+        self.invalidate()
+
+    def stats(self):
+        return {
+            'entries': len(self.entries),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def _filter_paper_alpha(rgba, threshold=240, alpha=128):
+    """흰 종이에 가까운 픽셀(모든 채널이 threshold 이상)을 반투명하게 만듦"""
+    paper = rgba[..., :3].min(axis=2) >= threshold
+    rgba[..., 3][paper] = alpha
+
+
+def _filter_invert(rgba):
+    """다크 모드용 색상 반전 (알파는 유지)"""
+    np.subtract(255, rgba[..., :3], out=rgba[..., :3])
+
+
+_SEPIA_MATRIX = (
+    (0.393, 0.769, 0.189),
+    (0.349, 0.686, 0.168),
+    (0.272, 0.534, 0.131),
+)
+
+
+def _filter_sepia(rgba):
+    """세피아 톤 적용"""
+    toned = rgba[..., :3].astype(np.float32) @ np.array(_SEPIA_MATRIX, dtype=np.float32).T
+    np.clip(toned, 0, 255, out=toned)
+    rgba[..., :3] = toned
+
+
+# 필터 이름 -> 함수. 필터 사양은 (이름, *인자) 튜플이며 렌더 옵션(캐시 키)에 그대로 들어감
+PIXEL_FILTERS = {
+    'paper_alpha': _filter_paper_alpha,
+    'invert': _filter_invert,
+    'sepia': _filter_sepia,
+}
+
+
+def pixel_filters_of(options):
+    """렌더 옵션에서 픽셀 필터 사양만 골라냄"""
+    return tuple(opt for opt in options
+                 if isinstance(opt, tuple) and opt and opt[0] in PIXEL_FILTERS)
+
+
+def apply_pixel_filters(pix, filters):
+    """RGBA 픽스맵의 samples 를 NumPy 배열로 보고 필터를 순서대로 적용 (가능하면 제자리에서 수정)"""
+    with tracer.span('pixel_filters', filters=len(filters)) as span:
+        samples = np.frombuffer(pix.samples_mv, dtype=np.uint8)
+        if not samples.flags.writeable:
+            samples = samples.copy()
+            span.set(bytes=samples.nbytes)
+        rows = samples.reshape(pix.height, pix.stride)
+        rgba = rows[:, :pix.width * 4].reshape(pix.height, pix.width, 4)
+        for name, *args in filters:
+            PIXEL_FILTERS[name](rgba, *args)
+    return samples
+
+
+class RasterImage(QImage):
+    """외부 버퍼(MuPDF 픽스맵, NumPy 배열, 공유 메모리)를 복사 없이 보는 QImage
+
+    Qt 는 외부 버퍼의 수명을 관리하지 않으므로 버퍼 소유 객체를 함께 붙잡아 둔다.
+    시그널로 넘길 때는 QImage 값 복사가 일어나지 않도록 object 타입으로 전달해야 한다.
+    """
+
+    def __init__(self, owner, buffer, width, height, stride, image_format):
+        super().__init__(buffer, width, height, stride, image_format)
+        self.owner = owner  # 이 이미지가 살아있는 동안 버퍼가 해제되지 않도록 유지
+        self.buffer = buffer  # 디스크 캐시가 복사 없이 쓸 수 있도록 원래 버퍼도 보관
+
+
+def draw_device(pix):
+    """픽스맵에 그리는 MuPDF draw 장치 (PyMuPDF 1.24 부터 fitz.Device 가 DeviceWrapper 로 바뀜)"""
+    if hasattr(fitz, 'Device'):
+        return fitz.Device(pix, None)
+    device = fitz.DeviceWrapper(pix, None)
+    device.device = device.this  # Page.run / DisplayList.run 이 찾는 속성 이름
+    return device
+
+
+def close_device(device):
+    """장치를 닫아 렌더링을 마무리 (DeviceWrapper 는 명시적으로 닫아야 픽스맵에 반영됨)"""
+    if not hasattr(fitz, 'Device'):
+        fitz.mupdf.fz_close_device(device.this)
+
+
+class DisplayListCache:
+    """페이지별 MuPDF 디스플레이 리스트를 보관해 배율/타일/회전만 바뀐 렌더링에서 콘텐츠 해석을 건너뛰는 캐시
+
+    PyMuPDF 문서는 스레드 간에 공유하지 않으므로 문서 핸들마다 하나씩 두고, 문서가 바뀌면
+    소유자가 clear() 한다. 리스트의 메모리 크기는 알 수 없어 개수로 제한한다.
+    """
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # 페이지 -> (DisplayList, 만들 때의 회전 각도)
+
+    def get(self, page):
+        """페이지의 (디스플레이 리스트, 만들 때의 회전) 반환 (없으면 페이지를 한 번 해석해 만듦)"""
+        entry = self.entries.get(page.number)
+        if entry is not None:
+            self.entries.move_to_end(page.number)
+            tracer.count('display_list_hit')
+            return entry
+        with tracer.span('display_list_build', page=page.number):
+            entry = (page.get_displaylist(), page.rotation)
+        self.entries[page.number] = entry
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        self.entries.clear()
+
+    @staticmethod
+    def rotation_matrix(display_list, built_rotation, rotation):
+        """built_rotation 으로 기록된 리스트를 rotation 으로 회전한 페이지 좌표로 옮기는 행렬"""
+        delta = (rotation - built_rotation) % 360
+        if not delta:
+            return fitz.Identity
+        rotate = fitz.Matrix(delta)
+        bounds = display_list.rect * rotate
+        return rotate * fitz.Matrix(1, 0, 0, 1, -bounds.x0, -bounds.y0)
+
+
+def hide_annotations(document, annots):
+    """(페이지, xref) 로 주어진 PDF 주석을 이 문서 핸들에서만 숨김 (저장하지 않는 렌더 전용 핸들에 사용)
+
+    뷰어가 PDF 에 써 넣은 주석은 주석 레이어가 따로 그리므로 페이지 래스터에는 넣지 않는다.
+    다른 프로그램이 만든 주석은 그대로 래스터에 남는다.
+    """
+    for page_num, xref in annots:
+        if page_num >= len(document):
+            continue
+        page = document[page_num]  # 주석은 페이지 객체가 살아 있는 동안만 쓸 수 있음
+        try:
+            annot = page.load_annot(xref)
+        except Exception:
+            continue  # 이 핸들에는 없는 주석 (핸들을 연 뒤에 저장된 주석 등)
+        if annot is not None:
+            annot.set_flags(annot.flags | fitz.PDF_ANNOT_IS_HIDDEN)
+
+
+def rasterize_page(page, scale, clip=None, display_lists=None):
+    """흰 배경의 프리멀티플라이드 RGBA 픽스맵에 페이지를 직접 렌더링 (Qt 가 그대로 쓸 수 있는 형식)
+
+    display_lists 가 있으면 캐시된 디스플레이 리스트를 재생해 콘텐츠 스트림을 다시 해석하지 않는다.
+    """
+    with tracer.span('rasterize', page=page.number, scale=round(scale, 4)) as span:
+        matrix = fitz.Matrix(scale, scale)
+        area = page.rect if clip is None else fitz.Rect(clip) & page.rect
+        pix = fitz.Pixmap(fitz.csRGB, (area * matrix).irect, True)
+        span.set(bytes=pix.stride * pix.height)
+        pix.clear_with(255)  # 불투명한 흰 종이
+        device = draw_device(pix)
+        if display_lists is None:
+            page.run(device, matrix)
+        else:
+            display_list, built_rotation = display_lists.get(page)
+            # 보이는 영역(장치 좌표) 밖의 항목은 MuPDF 가 건너뜀
+            display_list.run(device, DisplayListCache.rotation_matrix(
+                display_list, built_rotation, page.rotation) * matrix, area * matrix)
+        close_device(device)
+        del device
+    return pix
+
+
+def render_page_image(page, scale, clip=None, filters=(), display_lists=None):
+    """페이지(또는 clip 영역)를 래스터화하고 픽셀 필터를 적용해 MuPDF 버퍼를 그대로 보는 QImage 로 반환"""
+    pix = rasterize_page(page, scale, clip, display_lists)
+    if filters and np is not None:
+        samples = apply_pixel_filters(pix, filters)
+        # 필터 결과는 프리멀티플라이 되지 않은 알파이므로 RGBA8888 로 표시
+        with tracer.span('qimage_wrap'):
+            return RasterImage((pix, samples), samples.data, pix.width, pix.height,
+                               pix.stride, QImage.Format_RGBA8888)
+    with tracer.span('qimage_wrap'):
+        return RasterImage(pix, pix.samples_mv, pix.width, pix.height,
+                           pix.stride, QImage.Format_RGBA8888_Premultiplied)
+
+
+class DiskRenderCache:
+    """렌더링한 래스터를 디스크에 원시 픽셀 그대로 저장해 다음 세션에서 mmap 으로 바로 쓰는 캐시
+
+    키는 (문서 내용 해시, 페이지, 배율, 회전, 렌더 옵션) 이고, 전체 크기가 max_bytes 를 넘으면
+    마지막 사용 시각(mtime)이 오래된 파일부터 지운다. 렌더 스레드는 put_later() 로 쓰기를
+    쓰기 스레드에 넘겨 파일 I/O 를 기다리지 않는다.
+    """
+
+    HEADER = struct.Struct('<4sIIII')  # 매직, 너비, 높이, 줄 바이트 수, QImage 형식
+    MAGIC = b'PVR1'
+    max_pending = 8  # 쓰기를 기다리는 래스터가 이보다 많으면 새 래스터는 저장하지 않음
+
+    def __init__(self, directory, max_bytes=2048 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.current_bytes = None  # 첫 저장 때 디렉터리를 훑어 계산
+        self._lock = threading.Lock()
+        self._queue = deque()  # 쓰기 스레드가 저장할 (문서 해시, 키, RasterImage)
+        self._closing = False
+        self._condition = threading.Condition()
+        self._thread = None  # 첫 put_later() 때 시작
+        os.makedirs(directory, exist_ok=True)
+
+    def entry_path(self, fingerprint, key):
+        name = hashlib.sha1(repr((fingerprint, key)).encode()).hexdigest()
+        return os.path.join(self.directory, name + '.raster')
+
+    def get(self, fingerprint, key):
+        """저장된 래스터를 복사 없이 mmap 으로 보는 QImage 로 반환 (없으면 None)"""
+        path = self.entry_path(fingerprint, key)
+        try:
+            with tracer.span('disk_cache_get'):
+                with open(path, 'rb') as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                os.utime(path)  # LRU 순서를 위해 사용 시각 갱신
+        except (OSError, ValueError):
+            return None
+        if len(mapped) < self.HEADER.size:
+            return None
+        magic, width, height, stride, image_format = self.HEADER.unpack_from(mapped)
+        end = self.HEADER.size + stride * height
+        if magic != self.MAGIC or len(mapped) < end:
+            return None
+        buffer = memoryview(mapped)[self.HEADER.size:end]
+        return RasterImage((mapped, buffer), buffer, width, height, stride, QImage.Format(image_format))
+
+    def put(self, fingerprint, key, buffer, width, height, stride, image_format):
+        """원시 픽셀을 임시 파일에 쓴 뒤 원자적으로 교체 (쓰기 스레드나 렌더 프로세스에서 호출)"""
+        path = self.entry_path(fingerprint, key)
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with tracer.span('disk_cache_put', bytes=stride * height):
+                with open(temp_path, 'wb') as f:
+                    f.write(self.HEADER.pack(self.MAGIC, width, height, stride, int(image_format)))
+                    f.write(buffer)
+                os.replace(temp_path, path)
+        except OSError as e:
+            print(f"디스크 캐시 저장 중 오류: {str(e)}")
+            return
+        with self._lock:
+            if self.current_bytes is None:
+                self.current_bytes = self._scan_bytes()
+            else:
+                self.current_bytes += self.HEADER.size + stride * height
+            if self.current_bytes > self.max_bytes:
+                self._evict()
+
+    def put_later(self, fingerprint, key, image):
+        """RasterImage 를 쓰기 스레드에서 저장 (버퍼를 복사하지 않도록 쓸 때까지 이미지를 붙잡아 둠)"""
+        with self._condition:
+            if self._closing or len(self._queue) >= self.max_pending:
+                return  # 캐시는 최선 노력: 디스크가 밀리면 메모리를 쌓아 두지 않고 건너뜀
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._queue.append((fingerprint, key, image))
+            self._condition.notify()
+
+    def close(self):
+        """대기 중인 래스터를 모두 쓰고 쓰기 스레드 종료"""
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._closing:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                fingerprint, key, image = self._queue.popleft()
+            self.put(fingerprint, key, image.buffer, image.width(), image.height(),
+                     image.bytesPerLine(), image.format())
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.raster'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _scan_bytes(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """오래 쓰지 않은 파일부터 지워 예산의 90% 아래로 줄임"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass  # 다른 곳에서 mmap 중이거나 이미 지워진 파일
+        self.current_bytes = total
+
+
+class ScratchBuffers:
+    """화면 합성용 QImage 를 크기별로 재사용해 갱신마다 새 버퍼를 만들지 않도록 하는 버퍼 풀"""
+
+    def __init__(self):
+        self._images = {}
+
+    def get(self, width, height, image_format=QImage.Format_ARGB32_Premultiplied):
+        key = (width, height, image_format)
+        image = self._images.get(key)
+        if image is None:
+            self._images.clear()  # 창 크기가 바뀌면 이전 크기의 버퍼는 버림
+            image = QImage(width, height, image_format)
+            self._images[key] = image
+        return image
+
+
+class RenderWorker(QThread):
+    """전용 스레드에서 페이지를 QImage 로 렌더링해 시그널로 돌려주는 렌더 서비스"""
+
+    imageReady = pyqtSignal(int, object, object)  # (문서 세대, 캐시 키, RasterImage)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._condition = threading.Condition()
+        self._pending = OrderedDict()  # key -> (우선순위, 순번, 페이지, 배율, 회전, clip, 디스크 저장 여부)
+        self._cancelled = set()  # 결과를 버릴 진행 중 요청
+        self._current_key = None  # 현재 렌더링 중인 요청
+        self._file_name = None
+        self._fingerprint = None
+        self._hidden_annots = ()
+        self._reopen = False
+        self._running = True
+        self._seq = 0
+        self.generation = 0  # 문서가 바뀔 때마다 바뀌어 이전 문서의 결과를 구분
+        self.disk_cache = None  # 설정되어 있으면 렌더링한 래스터를 디스크 캐시에도 저장
+        self.display_lists = DisplayListCache()  # 워커 문서 핸들 전용 (같은 페이지의 배율/회전 변경에 재사용)
+
+    def open_document(self, file_name, generation, fingerprint=None, hidden_annots=()):
+        """워커 전용 문서 핸들을 새 파일로 교체 (PyMuPDF 문서는 스레드 간 공유 불가)
+
+        hidden_annots 의 (페이지, xref) 주석은 주석 레이어가 그리므로 래스터에서 뺀다.
+        """
+        with self._condition:
+            self._file_name = file_name
+            self._fingerprint = fingerprint
+            self._hidden_annots = tuple(hidden_annots)
+            self._reopen = True
+            self.generation = generation
+            self._pending.clear()
+            if self._current_key is not None:
+                self._cancelled.add(self._current_key)
+            self._condition.notify()
+
+    def request(self, key, page_num, scale, rotation, priority=0, clip=None, persist=True):
+        """렌더링 요청 추가 (우선순위가 낮은 값, 같은 우선순위에서는 최신 요청이 먼저 처리됨)
+
+        clip 이 주어지면 그 PDF 좌표 영역(확대 보기의 타일)만 렌더링한다. persist 가 거짓이면
+        (미리보기 단계 등) 결과를 디스크 캐시에 저장하지 않는다. 타일은 보기 위치마다 달라 저장하지 않는다.
+        """
+        with self._condition:
+            if key == self._current_key and key not in self._cancelled:
+                return
+            self._cancelled.discard(key)
+            self._seq += 1
+            self._pending[key] = (priority, self._seq, page_num, scale, rotation, clip,
+                                  persist and clip is None)
+            self._condition.notify()
+
+    def supersede(self, page_num, keys):
+        """한 페이지에 대해 keys 에 없는 (배율이 바뀐 이전 단계 등) 요청을 취소"""
+        with self._condition:
+            for key in [k for k in self._pending if k[0] == page_num and k not in keys]:
+                del self._pending[key]
+            if (self._current_key is not None and self._current_key[0] == page_num
+                    and self._current_key not in keys):
+                self._cancelled.add(self._current_key)
+
+    def retain(self, pages):
+        """더 이상 필요 없는 페이지의 대기 요청을 버리고 진행 중인 요청의 결과도 무시"""
+        with self._condition:
+            for key in [k for k, req in self._pending.items() if req[2] not in pages]:
+                del self._pending[key]
+            if self._current_key is not None and self._current_key[0] not in pages:
+                self._cancelled.add(self._current_key)
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self.wait()
+
+    def run(self):
+        document = None
+        while True:
+            with self._condition:
+                while self._running and not self._reopen and not (self._pending and document):
+                    self._condition.wait()
+                if not self._running:
+                    break
+                reopen = self._reopen
+                file_name = self._file_name
+                hidden_annots = self._hidden_annots
+                self._reopen = False
+                if not reopen:
+                    key = min(self._pending, key=lambda k: (self._pending[k][0], -self._pending[k][1]))
+                    _, _, page_num, scale, rotation, clip, persist = self._pending.pop(key)
+                    self._current_key = key
+                    generation = self.generation
+                    fingerprint = self._fingerprint
+
+            if reopen:
+                if document is not None:
+                    document.close()
+                self.display_lists.clear()
+                try:
+                    document = fitz.open(file_name)
+                    hide_annotations(document, hidden_annots)
+                except Exception as e:
+                    document = None
+                    print(f"렌더 워커 문서 열기 오류: {str(e)}")
+                continue
+
+            image = None
+            try:
+                with tracer.span('render_request', page=page_num, scale=round(scale, 4)):
+                    page = document[page_num]
+                    if page.rotation != rotation:
+                        page.set_rotation(rotation)
+                    image = render_page_image(page, scale, clip, pixel_filters_of(key[3]),
+                                              self.display_lists)
+            except Exception as e:
+                print(f"페이지 {page_num} 렌더링 중 오류: {str(e)}")
+
+            with self._condition:
+                cancelled = key in self._cancelled
+                self._cancelled.discard(key)
+                self._current_key = None
+            if image is not None and not cancelled:
+                self.imageReady.emit(generation, key, image)
+            if image is not None and persist and self.disk_cache is not None and fingerprint:
+                self.disk_cache.put_later(fingerprint, key, image)
+
+        if document is not None:
+            document.close()
+
+
+_process_document = None  # 렌더 프로세스마다 따로 여는 문서 핸들
+_process_disk_cache = None  # 렌더 프로세스가 결과를 저장할 디스크 캐시
+_process_fingerprint = None
+_process_display_lists = None  # 렌더 프로세스의 문서 핸들 전용 디스플레이 리스트 캐시
+
+
+def _render_process_init(file_name, disk_cache_args=None, fingerprint=None, hidden_annots=()):
+    global _process_document, _process_disk_cache, _process_fingerprint, _process_display_lists
+    _process_document = fitz.open(file_name)
+    hide_annotations(_process_document, hidden_annots)
+    _process_display_lists = DisplayListCache()
+    if disk_cache_args is not None and fingerprint:
+        _process_disk_cache = DiskRenderCache(*disk_cache_args)
+        _process_fingerprint = fingerprint
+
+
+def _render_process_task(page_num, scale, rotation, clip, filters, key=None):
+    """렌더 프로세스에서 실행: 픽셀을 공유 메모리에 써서 (이름, 너비, 높이, 줄 바이트 수, 형식) 만 반환"""
+    page = _process_document[page_num]
+    if page.rotation != rotation:
+        page.set_rotation(rotation)
+    pix = rasterize_page(page, scale, clip, _process_display_lists)
+    if filters and np is not None:
+        data = apply_pixel_filters(pix, filters)
+        pixel_format = 'rgba'
+    else:
+        data = pix.samples_mv
+        pixel_format = 'rgba_premultiplied'
+
+    stride = pix.stride
+    nbytes = stride * pix.height
+    from multiprocessing import resource_tracker, shared_memory
+    shm = shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+    if os.name == 'posix':
+        # 블록의 수명은 결과를 받는 GUI 프로세스가 관리하므로 이 프로세스의 추적에서는 뺌
+        # (남겨 두면 렌더 프로세스가 끝날 때 아직 받지 않은 블록을 지우고 누수 경고를 냄)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    shm.buf[:nbytes] = memoryview(data).cast('B')
+    shm.close()  # 해제(unlink)는 결과를 받은 쪽에서 수행
+    if key is not None and _process_disk_cache is not None:
+        image_format = (QImage.Format_RGBA8888 if pixel_format == 'rgba'
+                        else QImage.Format_RGBA8888_Premultiplied)
+        _process_disk_cache.put(_process_fingerprint, key, memoryview(data).cast('B'),
+                                pix.width, pix.height, stride, image_format)
+    return shm.name, pix.width, pix.height, stride, pixel_format
+
+
+def _image_from_shared(name, width, height, stride, pixel_format):
+    """렌더 프로세스가 남긴 공유 메모리를 복사 없이 보는 QImage 로 감쌈"""
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=name)
+    # 이름만 먼저 제거하고 매핑은 이미지가 살아있는 동안 유지 (SharedMemory 가 해제될 때 닫힘)
+    shm.unlink()
+    image_format = (QImage.Format_RGBA8888 if pixel_format == 'rgba'
+                    else QImage.Format_RGBA8888_Premultiplied)
+    tracer.count('process_results')
+    return RasterImage(shm, shm.buf, width, height, stride, image_format)
+
+
+class ProcessRenderPool(QObject):
+    """여러 프로세스에서 페이지를 렌더링하는 선택적 백엔드 (프로세스마다 자체 fitz 핸들 사용)"""
+
+    imageReady = pyqtSignal(int, object, object)  # (문서 세대, 캐시 키, RasterImage)
+    thumbnailReady = pyqtSignal(int, object, object)  # 썸네일 결과 (같은 형식)
+
+    def __init__(self, processes=None, parent=None):
+        super().__init__(parent)
+        self.processes = processes or os.cpu_count() or 1
+        self._executor = None
+        self._futures = {}  # key -> Future
+        self._thumbnail_futures = {}  # 썸네일 key -> Future (페이지 retain 에 취소되지 않도록 따로 보관)
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.disk_cache = None  # 설정되어 있으면 각 프로세스가 같은 디렉터리의 디스크 캐시에 저장
+
+    def open_document(self, file_name, generation, fingerprint=None, hidden_annots=()):
+        """새 문서로 프로세스 풀을 다시 만듦 (각 프로세스가 initializer 에서 파일을 직접 엶)"""
+        self._shutdown()
+        self.generation = generation
+        disk_cache_args = None
+        if self.disk_cache is not None:
+            disk_cache_args = (self.disk_cache.directory, self.disk_cache.max_bytes)
+        from concurrent.futures import ProcessPoolExecutor  # 프로세스 풀을 켤 때만 불러옴
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            initializer=_render_process_init,
+            initargs=(file_name, disk_cache_args, fingerprint, tuple(hidden_annots))
+        )
+
+    def request(self, key, page_num, scale, rotation, priority=0, clip=None):
+        """렌더링 요청 (프로세스 풀은 요청 순서대로 처리하므로 priority 는 호출 순서로 반영)"""
+        self._submit(self._futures, self.imageReady, key, page_num, scale, rotation, clip,
+                     key if clip is None else None)
+
+    def request_thumbnail(self, key, page_num, scale, rotation):
+        """썸네일 렌더링 요청 (결과는 thumbnailReady 로 오고 디스크 캐시에는 저장하지 않음)"""
+        self._submit(self._thumbnail_futures, self.thumbnailReady, key, page_num, scale, rotation)
+
+    def _submit(self, futures, signal, key, page_num, scale, rotation, clip=None, persist_key=None):
+        if self._executor is None:
+            return
+        with self._lock:
+            if key in futures:
+                return
+            future = self._executor.submit(
+                _render_process_task, page_num, scale, rotation, clip, pixel_filters_of(key[3]),
+                persist_key)
+            futures[key] = future
+        generation = self.generation
+        future.add_done_callback(lambda f: self._finished(futures, signal, generation, key, f))
+
+    def _finished(self, futures, signal, generation, key, future):
+        # 풀 관리 스레드에서 호출됨: 시그널은 GUI 스레드로 큐잉되어 전달
+        with self._lock:
+            if futures.get(key) is future:
+                del futures[key]
+        if future.cancelled():
+            return
+        try:
+            image = _image_from_shared(*future.result())
+        except Exception as e:
+            print(f"페이지 {key[0]} 프로세스 렌더링 중 오류: {str(e)}")
+            return
+        if generation == self.generation:
+            signal.emit(generation, key, image)
+
+    def retain(self, pages):
+        """필요 없는 페이지의 대기 중인 작업 취소"""
+        self._cancel_except(self._futures, pages)
+
+    def retain_thumbnails(self, pages):
+        """보이지 않게 된 썸네일의 대기 중인 작업 취소"""
+        self._cancel_except(self._thumbnail_futures, pages)
+
+    def _cancel_except(self, futures, pages):
+        with self._lock:
+            stale = [f for k, f in futures.items() if k[0] not in pages]
+        for future in stale:
+            future.cancel()
+
+    def _shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        with self._lock:
+            self._futures.clear()
+            self._thumbnail_futures.clear()
+
+    def stop(self):
+        self._shutdown()
+
+
+class Prefetcher:
+    """탐색 방향과 속도를 보고 앞쪽(과 약간의 뒤쪽) 페이지를 미리 렌더링할 목록을 정하는 프리페처"""
+
+    def __init__(self, ahead=3, behind=1, max_ahead=8, budget_fraction=0.5, idle_seconds=10.0):
+        self.ahead = ahead  # 기본으로 미리 렌더링할 진행 방향 페이지 수
+        self.behind = behind  # 반대 방향으로 유지할 페이지 수
+        self.max_ahead = max_ahead  # 빠르게 넘길 때 내다볼 최대 페이지 수
+        self.budget_fraction = budget_fraction  # 프리페치가 쓸 수 있는 캐시 예산 비율
+        self.idle_seconds = idle_seconds  # 이 시간 동안 이동이 없으면 프리페치 중단
+        self.history = deque(maxlen=6)  # 최근 이동 기록 (시각, 페이지)
+        self.direction = 1  # 최근 이동 방향 (1: 다음, -1: 이전)
+
+    def note_page(self, page_num):
+        """페이지 이동 기록 (같은 페이지를 다시 그리는 경우는 무시)"""
+        if self.history and self.history[-1][1] == page_num:
+            return
+        if self.history:
+            self.direction = 1 if page_num > self.history[-1][1] else -1
+        self.history.append((time.monotonic(), page_num))
+
+    def speed(self):
+        """최근 이동 속도 (초당 페이지 수)"""
+        if len(self.history) < 2:
+            return 0.0
+        (t0, p0), (t1, p1) = self.history[0], self.history[-1]
+        return abs(p1 - p0) / (t1 - t0) if t1 > t0 else 0.0
+
+    def is_idle(self):
+        return not self.history or time.monotonic() - self.history[-1][0] > self.idle_seconds
+
+    def plan(self, page_num, page_count, page_bytes, budget_bytes):
+        """미리 렌더링할 (페이지, 우선순위) 목록 - 우선순위 값이 작을수록 먼저 렌더링"""
+        if self.is_idle():
+            return []
+        # 빠르게 넘길수록 더 멀리 내다봄
+        ahead = min(self.max_ahead, self.ahead + int(self.speed()))
+        pages = []
+        for distance in range(1, ahead + 1):
+            pages.append((page_num + self.direction * distance, distance))
+        for distance in range(1, self.behind + 1):
+            # 반대 방향은 같은 거리의 진행 방향 페이지보다 늦게 처리
+            pages.append((page_num - self.direction * distance, distance * 2))
+        pages = [(p, prio) for p, prio in pages if 0 <= p < page_count]
+        pages.sort(key=lambda item: item[1])
+        # 메모리 예산 안에 들어가는 페이지 수만큼만 요청
+        limit = int(budget_bytes // max(1, page_bytes))
+        return pages[:limit]
+
+
+class TileRenderer:
+    """확대 시 보이는 영역을 MuPDF clip 사각형 단위 타일로 나누고 캐시된 타일을 합성하는 도우미
+
+    타일 래스터화는 렌더 워커가 맡는다. 합성은 캐시에 있는 타일만 쓰고, 아직 없는 타일
+    자리에는 같은 페이지의 다른 배율 래스터를 늘려 그린 뒤 필요한 타일 목록을 돌려준다.
+    """
+
+    def __init__(self, cache, tile_size=256):
+        self.cache = cache  # 타일도 페이지 캐시의 메모리 예산을 함께 사용
+        self.tile_size = tile_size  # 타일 한 변의 크기 (장치 픽셀)
+
+    def tile_key(self, page_num, scale, rotation, options, col, row):
+        return PageCache.make_key(page_num, scale, rotation,
+                                  tuple(options) + (('tile', self.tile_size, col, row),))
+
+    def tile_clip(self, page_rect, scale, col, row):
+        """(col, row) 타일 영역을 PDF 좌표 clip 사각형 (x0, y0, x1, y1) 으로 변환"""
+        x0 = col * self.tile_size
+        y0 = row * self.tile_size
+        x1 = min(x0 + self.tile_size, page_rect.width * scale)
+        y1 = min(y0 + self.tile_size, page_rect.height * scale)
+        return (page_rect.x0 + x0 / scale, page_rect.y0 + y0 / scale,
+                page_rect.x0 + x1 / scale, page_rect.y0 + y1 / scale)
+
+    def compose(self, page_num, page_rect, rotation, scale, options, view_x, view_y, canvas, fallback=None):
+        """보이는 영역(장치 픽셀)에 걸치는 타일을 캔버스에 합성하고 아직 없는 타일의 (키, clip) 목록 반환
+
+        fallback 은 같은 페이지 전체의 (배율이 다른) 래스터로, 없는 타일 자리를 채우는 데 쓴다.
+        """
+        size = self.tile_size
+        raster_width = page_rect.width * scale
+        raster_height = page_rect.height * scale
+        view_width = canvas.width()
+        view_height = canvas.height()
+
+        # 보이는 영역은 항상 페이지 안쪽이므로 타일이 캔버스 전체를 덮음
+        canvas.fill(Qt.transparent)
+        painter = QPainter(canvas)
+        missing = []
+        first_col = max(0, int(view_x // size))
+        first_row = max(0, int(view_y // size))
+        last_col = int((min(view_x + view_width, raster_width) - 1) // size)
+        last_row = int((min(view_y + view_height, raster_height) - 1) // size)
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                # 반올림으로 타일 크기가 1픽셀 달라져도 틈이 생기지 않도록 목표 영역에 맞춰 그림
+                tile_width = min(size, raster_width - col * size)
+                tile_height = min(size, raster_height - row * size)
+                target = QRectF(col * size - view_x, row * size - view_y, tile_width, tile_height)
+                key = self.tile_key(page_num, scale, rotation, options, col, row)
+                tile = self.cache.get(key)
+                if tile is not None:
+                    tracer.count('tile_cache_hit')
+                    painter.drawImage(target, tile, QRectF(0, 0, tile.width(), tile.height()))
+                    continue
+                tracer.count('tile_request')
+                missing.append((key, self.tile_clip(page_rect, scale, col, row)))
+                if fallback is None:
+                    painter.fillRect(target, Qt.white)
+                else:
+                    # 타일이 올 때까지 저해상도 래스터의 같은 영역을 늘려 보여줌
+                    ratio_x = fallback.width() / raster_width
+                    ratio_y = fallback.height() / raster_height
+                    painter.drawImage(target, fallback,
+                                      QRectF(col * size * ratio_x, row * size * ratio_y,
+                                             tile_width * ratio_x, tile_height * ratio_y))
+        painter.end()
+        return missing
+
+
+def _distance_to_segment(px, py, x0, y0, x1, y1):
+    """점 (px, py) 와 선분 (x0, y0)-(x1, y1) 사이의 거리"""
+    dx = x1 - x0
+    dy = y1 - y0
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return math.hypot(px - x0, py - y0)
+    t = max(0.0, min(1.0, ((px - x0) * dx + (py - y0) * dy) / length_sq))
+    return math.hypot(px - (x0 + t * dx), py - (y0 + t * dy))
+
+
+class AnnotationIndex:
+    """한 페이지의 주석을 페이지 좌표 기준 균일 격자에 넣어 두는 공간 인덱스 (추가/삭제 시 증분 갱신)
+
+    항목은 ('rect' | 'line' | 'text', (x0, y0, x1, y1)) 형태로 저장한다.
+    rect/text 는 영역, line 은 시작점과 끝점이다.
+    """
+
+    def __init__(self, cell_size=64.0):
+        self.cell_size = cell_size
+        self.cells = {}  # (열, 행) -> 주석 id 집합
+        self.items = {}  # 주석 id -> (종류, 좌표, 경계 상자)
+
+    @staticmethod
+    def _bounds(x0, y0, x1, y1):
+        return min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)
+
+    def _cells_for(self, bounds):
+        left, top, right, bottom = bounds
+        size = self.cell_size
+        for col in range(int(math.floor(left / size)), int(math.floor(right / size)) + 1):
+            for row in range(int(math.floor(top / size)), int(math.floor(bottom / size)) + 1):
+                yield col, row
+
+    def insert(self, ann_id, kind, geometry):
+        if ann_id in self.items:
+            self.remove(ann_id)
+        bounds = self._bounds(*geometry)
+        self.items[ann_id] = (kind, geometry, bounds)
+        for cell in self._cells_for(bounds):
+            self.cells.setdefault(cell, set()).add(ann_id)
+
+    def remove(self, ann_id):
+        item = self.items.pop(ann_id, None)
+        if item is None:
+            return
+        for cell in self._cells_for(item[2]):
+            ids = self.cells.get(cell)
+            if ids is not None:
+                ids.discard(ann_id)
+                if not ids:
+                    del self.cells[cell]
+
+    def _candidates(self, bounds):
+        found = set()
+        for cell in self._cells_for(bounds):
+            found |= self.cells.get(cell, set())
+        return found
+
+    def hit_test(self, x, y, tolerance=0.0):
+        """점에 닿는 주석 id 목록 (나중에 추가되어 위에 그려진 주석이 먼저)"""
+        hits = []
+        for ann_id in self._candidates((x - tolerance, y - tolerance, x + tolerance, y + tolerance)):
+            kind, geometry, bounds = self.items[ann_id]
+            if kind == 'line':
+                if _distance_to_segment(x, y, *geometry) <= tolerance:
+                    hits.append(ann_id)
+            else:
+                left, top, right, bottom = bounds
+                if left - tolerance <= x <= right + tolerance and top - tolerance <= y <= bottom + tolerance:
+                    hits.append(ann_id)
+        hits.sort(reverse=True)
+        return hits
+
+    def query_rect(self, x0, y0, x1, y1):
+        """사각형(러버 밴드) 안에 완전히 들어오는 주석 id 집합"""
+        left, top, right, bottom = self._bounds(x0, y0, x1, y1)
+        found = set()
+        for ann_id in self._candidates((left, top, right, bottom)):
+            item_left, item_top, item_right, item_bottom = self.items[ann_id][2]
+            if left <= item_left and item_right <= right and top <= item_top and item_bottom <= bottom:
+                found.add(ann_id)
+        return found
+
+    def query_polygon(self, points):
+        """올가미 다각형 안에 완전히 들어오는 주석 id 집합"""
+        if len(points) < 3:
+            return set()
+        polygon = QPolygonF([QPointF(x, y) for x, y in points])
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        found = set()
+        for ann_id in self._candidates((min(xs), min(ys), max(xs), max(ys))):
+            kind, geometry, bounds = self.items[ann_id]
+            x0, y0, x1, y1 = geometry if kind == 'line' else bounds
+            corners = [(x0, y0), (x1, y1)] if kind == 'line' else [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+            if all(polygon.containsPoint(QPointF(cx, cy), Qt.OddEvenFill) for cx, cy in corners):
+                found.add(ann_id)
+        return found
+
+
+class AnnotationType(IntEnum):
+    RECT = 0
+    ARROW = 1
+    TEXT = 2
+
+
+# 툴바 도구 이름 -> 주석 종류
+ANNOTATION_TOOLS = {
+    '사각형': AnnotationType.RECT,
+    '화살표': AnnotationType.ARROW,
+    '텍스트': AnnotationType.TEXT,
+}
+
+ANNOTATION_FONT_SIZE = 12  # 텍스트 주석 글자 크기 (PDF 포인트)
+
+
+class Annotation:
+    """주석 한 개. 좌표는 회전 전 PDF 페이지 좌표(포인트), 색상은 0xAARRGGBB 정수"""
+
+    __slots__ = ('id', 'kind', 'x0', 'y0', 'x1', 'y1', 'color', 'text')
+
+    def __init__(self, ann_id, kind, x0, y0, x1, y1, color, text=''):
+        self.id = ann_id
+        self.kind = kind
+        self.x0 = x0
+        self.y0 = y0
+        self.x1 = x1
+        self.y1 = y1
+        self.color = color
+        self.text = text
+
+    def qcolor(self):
+        return QColor.fromRgba(self.color)
+
+    def copy(self):
+        return Annotation(self.id, self.kind, self.x0, self.y0, self.x1, self.y1, self.color, self.text)
+
+    def rgb(self):
+        """PyMuPDF 가 쓰는 0~1 범위의 (r, g, b)"""
+        return (((self.color >> 16) & 0xFF) / 255,
+                ((self.color >> 8) & 0xFF) / 255,
+                (self.color & 0xFF) / 255)
+
+
+class AnnotationStore:
+    """페이지별 주석 목록과 공간 인덱스를 함께 관리하는 저장소
+
+    좌표를 PDF 페이지 좌표로 보관하므로 줌/회전/창 크기가 바뀌어도 주석은 그대로이고,
+    화면에 그릴 때 페이지마다 하나의 변환 행렬로 한꺼번에 옮긴다.
+    """
+
+    def __init__(self):
+        self.pages = {}  # 페이지 -> [Annotation, ...] (그린 순서)
+        self.indexes = {}  # 페이지 -> AnnotationIndex
+        self.next_id = 0
+        self.journal = None  # 설정되어 있으면 모든 변경을 AnnotationJournal 에 기록
+        self._font_metrics = None
+
+    @staticmethod
+    def font():
+        font = QFont('Helvetica')
+        font.setPixelSize(ANNOTATION_FONT_SIZE)
+        return font
+
+    def _geometry(self, ann):
+        """공간 인덱스에 넣을 주석의 (종류, 좌표)"""
+        if ann.kind == AnnotationType.ARROW:
+            return 'line', (ann.x0, ann.y0, ann.x1, ann.y1)
+        if ann.kind == AnnotationType.TEXT:
+            # 텍스트는 시작점이 기준선이므로 글꼴 크기로 경계 상자를 계산
+            if self._font_metrics is None:
+                self._font_metrics = QFontMetricsF(self.font())
+            bounds = self._font_metrics.boundingRect(ann.text or ' ')
+            return 'text', (ann.x0 + bounds.left(), ann.y0 + bounds.top(),
+                            ann.x0 + bounds.right(), ann.y0 + bounds.bottom())
+        return 'rect', (ann.x0, ann.y0, ann.x1, ann.y1)
+
+    def create(self, page_num, kind, x0, y0, x1, y1, color, text=''):
+        ann = Annotation(self.next_id, kind, x0, y0, x1, y1, color, text)
+        self.next_id += 1
+        self.add(page_num, ann)
+        return ann
+
+    def add(self, page_num, ann):
+        self.pages.setdefault(page_num, []).append(ann)
+        self.next_id = max(self.next_id, ann.id + 1)
+        self.indexes.setdefault(page_num, AnnotationIndex()).insert(ann.id, *self._geometry(ann))
+        if self.journal is not None:
+            self.journal.append(AnnotationJournal.encode('add', page_num, ann))
+
+    def update(self, page_num, ann):
+        """좌표, 텍스트, 색상이 바뀐 주석의 인덱스 갱신"""
+        self.indexes.setdefault(page_num, AnnotationIndex()).insert(ann.id, *self._geometry(ann))
+        if self.journal is not None:
+            self.journal.append(AnnotationJournal.encode('update', page_num, ann))
+
+    def remove(self, page_num, ann_ids):
+        ann_ids = set(ann_ids)
+        index = self.indexes.get(page_num)
+        if index is not None:
+            for ann_id in ann_ids:
+                index.remove(ann_id)
+        self.pages[page_num] = [ann for ann in self.pages.get(page_num, []) if ann.id not in ann_ids]
+        if self.journal is not None:
+            self.journal.append({'op': 'delete', 'ids': sorted(ann_ids)})
+
+    def get(self, page_num, ann_id):
+        for ann in self.pages.get(page_num, ()):
+            if ann.id == ann_id:
+                return ann
+        return None
+
+    def page(self, page_num):
+        return self.pages.get(page_num, ())
+
+    def index(self, page_num):
+        return self.indexes.get(page_num)
+
+    def clear(self):
+        self.pages = {}
+        self.indexes = {}
+        self.next_id = 0
+
+    def __iter__(self):
+        """(페이지, 주석) 을 모든 페이지에 대해 순회"""
+        for page_num, anns in self.pages.items():
+            for ann in anns:
+                yield page_num, ann
+
+    def __contains__(self, page_num):
+        return bool(self.pages.get(page_num))
+
+    def __len__(self):
+        return sum(len(anns) for anns in self.pages.values())
+
+
+def document_fingerprint(file_name, sample=1024 * 1024):
+    """파일 크기와 앞/뒤 1MB 로 만든 내용 해시 (큰 파일도 전체를 읽지 않고 바로 계산)"""
+    digest = hashlib.sha1()
+    size = os.path.getsize(file_name)
+    digest.update(str(size).encode())
+    with open(file_name, 'rb') as f:
+        digest.update(f.read(sample))
+        if size > sample:
+            f.seek(max(sample, size - sample))
+            digest.update(f.read(sample))
+    return digest.hexdigest()
+
+
+class AnnotationJournal:
+    """주석 변경을 PDF 옆 파일에 한 줄씩 덧붙이는 추가 전용 저널
+
+    기록은 백그라운드 스레드가 모아서 쓰고 fsync 하며, 비정상 종료 후 다음에 문서를 열 때
+    replay() 로 주석을 복원한다. 기록이 살아 있는 주석 수보다 많이 쌓이면 현재 상태만 남도록
+    압축해서 재생 시간을 짧게 유지한다.
+
+    PDF 에 이미 저장한 주석은 기록에 'xref' 를 함께 두어, 다음 저장 때 그 PDF 주석을 바꾸거나
+    지울 수 있게 한다. 저장된 주석을 삭제하면 xref 만 남은 'stale' 기록이 된다.
+    """
+
+    flush_interval = 0.5  # 첫 기록 후 이 시간(초) 동안 들어온 기록을 한 번에 씀
+    compact_min_records = 1000
+
+    def __init__(self, path):
+        self.path = path
+        self.state = {}  # 주석 id -> 마지막 'add' 기록 (압축용, 그린 순서 유지)
+        self.records = 0  # 저널 파일에 있는 기록 수
+        self._queue = []
+        self._closing = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def path_for(file_name, fingerprint):
+        folder, base = os.path.split(os.path.abspath(file_name))
+        return os.path.join(folder, f'.{base}.{fingerprint[:16]}.journal')
+
+    @staticmethod
+    def encode(op, page_num, ann, xref=None):
+        record = {'op': op, 'page': page_num, 'id': ann.id, 'kind': int(ann.kind),
+                  'rect': [ann.x0, ann.y0, ann.x1, ann.y1], 'color': ann.color, 'text': ann.text}
+        if xref is not None:
+            record['xref'] = xref  # 이 주석이 PDF 에 저장된 주석 객체
+        return record
+
+    @staticmethod
+    def _apply(state, record):
+        op = record['op']
+        if op == 'reset':
+            state.clear()
+            for saved in record['records']:
+                state[saved['id']] = saved
+        elif op == 'stale':
+            state[record['id']] = record  # 압축된 파일에 남은 삭제된 저장 주석
+        elif op == 'delete':
+            for ann_id in record['ids']:
+                old = state.pop(ann_id, None)
+                if old is not None and 'xref' in old:
+                    # PDF 에 저장된 주석은 다음 저장 때 지울 수 있도록 xref 만 남김
+                    state[ann_id] = {'op': 'stale', 'page': old['page'], 'id': ann_id, 'xref': old['xref']}
+        elif record['id'] in state or op == 'add':
+            updated = dict(record, op='add')
+            old = state.get(record['id'])
+            if old is not None and 'xref' in old:
+                updated['xref'] = old['xref']
+            state[record['id']] = updated
+
+    @classmethod
+    def read(cls, path):
+        """저널 파일을 읽어 (주석 id -> 'add' 기록, 기록 수) 반환 (잘린 마지막 줄은 무시, 쓰기 스레드 불필요)"""
+        state = {}
+        records = 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # 기록 도중 종료되어 잘린 줄
+                    cls._apply(state, record)
+                    records += 1
+        except FileNotFoundError:
+            pass
+        return state, records
+
+    @staticmethod
+    def annotations_of(state):
+        return [(r['page'], Annotation(r['id'], AnnotationType(r['kind']), *r['rect'], r['color'], r['text']))
+                for r in state.values() if r['op'] == 'add']
+
+    @staticmethod
+    def saved_xrefs_of(state):
+        """PDF 에 저장된 주석의 {주석 id: (페이지, xref)} (삭제된 주석 포함)"""
+        return {r['id']: (r['page'], r['xref']) for r in state.values() if 'xref' in r}
+
+    def replay(self):
+        """저널을 읽어 [(페이지, Annotation), ...] 로 복원"""
+        state, records = self.read(self.path)
+        with self._condition:
+            self.state = state
+            self.records = records
+        return self.annotations_of(state)
+
+    def reset(self, records):
+        """저널 내용을 records ('add'/'stale' 기록 목록) 로 통째로 바꿈 (저장 후 새 해시로 다시 시작할 때)"""
+        self.append({'op': 'reset', 'records': records})
+
+    def append(self, record):
+        with self._condition:
+            self._queue.append(record)
+            if len(self._queue) == 1:
+                self._condition.notify()  # 첫 기록만 깨움 (묶는 동안 들어온 기록은 기다림을 끊지 않음)
+
+    def discard(self):
+        """주석이 PDF 에 저장되어 더 이상 필요 없는 저널을 닫고 삭제"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def close(self):
+        """남은 기록을 모두 쓰고 스레드 종료"""
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._closing:
+                    self._condition.wait()
+                # 연속된 편집을 한 번의 쓰기/fsync 로 묶음 (close() 만 기다림을 끊음)
+                deadline = time.monotonic() + self.flush_interval
+                while not self._closing:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = self._queue
+                self._queue = []
+                closing = self._closing
+            if batch:
+                try:
+                    self._write(batch)
+                except OSError as e:
+                    print(f"주석 저널 기록 중 오류: {str(e)}")
+            if closing:
+                return
+
+    def _write(self, batch):
+        if any(record['op'] == 'reset' for record in batch):
+            # 이전 내용은 더 이상 의미가 없으므로 덧붙이지 않고 현재 상태로 파일을 새로 씀
+            for record in batch:
+                self._apply(self.state, record)
+            self._compact()
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in batch))
+            f.flush()
+            os.fsync(f.fileno())
+        for record in batch:
+            self._apply(self.state, record)
+        self.records += len(batch)
+        if self.records > max(self.compact_min_records, 2 * len(self.state)):
+            self._compact()
+
+    def _compact(self):
+        """현재 살아 있는 주석만 새 파일에 쓰고 원자적으로 교체"""
+        temp_path = self.path + '.compact'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in self.state.values()))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self.records = len(self.state)
+
+
+def write_pdf_annotation(page, ann):
+    """주석을 PDF 주석 객체로 페이지에 추가하고 xref 를 반환"""
+    if ann.kind == AnnotationType.RECT:
+        annot = page.add_rect_annot(fitz.Rect(ann.x0, ann.y0, ann.x1, ann.y1).normalize())
+        annot.set_colors(stroke=ann.rgb())
+        annot.set_border(width=2)
+    elif ann.kind == AnnotationType.ARROW:
+        annot = page.add_line_annot(fitz.Point(ann.x0, ann.y0), fitz.Point(ann.x1, ann.y1))
+        annot.set_colors(stroke=ann.rgb())
+        annot.set_border(width=2)
+    else:
+        # 텍스트는 시작점이 기준선이므로 글자 크기만큼 위로 영역을 잡음
+        width = fitz.get_text_length(ann.text, fontsize=ANNOTATION_FONT_SIZE)
+        rect = fitz.Rect(ann.x0, ann.y0 - ANNOTATION_FONT_SIZE,
+                         ann.x0 + width + ANNOTATION_FONT_SIZE, ann.y0 + ANNOTATION_FONT_SIZE / 2)
+        annot = page.add_freetext_annot(rect, ann.text, fontsize=ANNOTATION_FONT_SIZE,
+                                        text_color=ann.rgb())
+    annot.update()
+    return annot.xref
+
+
+class SaveWorker(QThread):
+    """화면에 열린 문서는 건드리지 않고, 원본 파일을 따로 열어 주석을 써 넣고 저장하는 스레드
+
+    대상이 원본 파일이면 MuPDF 증분 저장으로 변경분만 파일 끝에 덧붙인다.
+    """
+
+    progress = pyqtSignal(int, int)  # 처리한 페이지 수, 전체
+    saved = pyqtSignal(str, object, str)  # 대상 파일, {주석 id: (페이지, xref)}, 오류 메시지
+
+    def __init__(self, source, target, annotations, rotations, stale_xrefs, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.target = target
+        self.annotations = annotations  # [(페이지, Annotation 사본), ...]
+        self.rotations = rotations  # 페이지 -> 회전 각도
+        self.stale_xrefs = stale_xrefs  # 이전 저장에서 이 파일에 써 넣은 {주석 id: (페이지, xref)}
+
+    def run(self):
+        written = {}
+        try:
+            doc = fitz.open(self.source)
+            try:
+                by_page = {}
+                for page_num, ann in self.annotations:
+                    by_page.setdefault(page_num, []).append(ann)
+                stale_by_page = {}
+                for page_num, xref in self.stale_xrefs.values():
+                    stale_by_page.setdefault(page_num, []).append(xref)
+                pages = sorted(set(by_page) | set(stale_by_page) | set(self.rotations))
+                total = len(pages) + 1  # 마지막 단계는 파일 쓰기
+
+                for done, page_num in enumerate(pages):
+                    page = doc[page_num]
+                    if page_num in self.rotations:
+                        page.set_rotation(self.rotations[page_num])
+                    # 같은 파일에 다시 저장할 때 이전에 써 넣은 주석을 지워 중복을 막음
+                    for xref in stale_by_page.get(page_num, ()):
+                        annot = page.load_annot(xref)
+                        if annot is not None:
+                            page.delete_annot(annot)
+                    for ann in by_page.get(page_num, ()):
+                        written[ann.id] = (page_num, write_pdf_annotation(page, ann))
+                    self.progress.emit(done + 1, total)
+
+                same_file = os.path.abspath(self.source) == os.path.abspath(self.target)
+                if same_file and doc.can_save_incrementally():
+                    doc.save(self.target, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+                elif same_file:
+                    # 증분 저장이 불가능한 문서는 임시 파일에 쓴 뒤 교체
+                    temp_name = self.target + '.saving'
+                    doc.save(temp_name)
+                    doc.close()
+                    os.replace(temp_name, self.target)
+                else:
+                    doc.save(self.target)
+                self.progress.emit(total, total)
+            finally:
+                if not doc.is_closed:
+                    doc.close()
+        except Exception as e:
+            self.saved.emit(self.target, {}, str(e))
+            return
+        self.saved.emit(self.target, written, '')
+
+
+class SearchIndex:
+    """페이지별 단어 상자 목록과 단어 -> (페이지, 단어 번호) 역색인
+
+    단어 상자는 주석과 같은 회전 전 PDF 페이지 좌표로 보관한다. 색인 스레드가 페이지를 추가하는
+    동안에도 검색할 수 있도록 잠금으로 보호한다.
+    """
+
+    PUNCTUATION = string.punctuation + '“”‘’«»…·「」『』'
+    VERSION = 2  # 저장 형식이나 좌표 규칙이 바뀌면 올려서 예전 색인 캐시는 다시 만들게 함
+
+    def __init__(self):
+        self.page_words = {}  # 페이지 -> [(단어, x0, y0, x1, y1), ...] (읽는 순서)
+        self.postings = {}  # 단어 -> [(페이지, 단어 번호), ...]
+        self._lock = threading.Lock()
+
+    @classmethod
+    def normalize(cls, word):
+        return word.strip(cls.PUNCTUATION).lower()
+
+    def add_page(self, page_num, words):
+        with self._lock:
+            if page_num in self.page_words:
+                return
+            self.page_words[page_num] = words
+            for word_no, word in enumerate(words):
+                if word[0]:
+                    self.postings.setdefault(word[0], []).append((page_num, word_no))
+
+    def is_indexed(self, page_num):
+        return page_num in self.page_words
+
+    def __len__(self):
+        return len(self.page_words)
+
+    def search(self, query):
+        """검색어(여러 단어면 연속된 구절)가 나오는 곳의 [(페이지, [단어 상자, ...]), ...] (페이지 순)"""
+        terms = [term for term in (self.normalize(w) for w in query.split()) if term]
+        if not terms:
+            return []
+        hits = []
+        with self._lock:
+            for page_num, start in self.postings.get(terms[0], ()):
+                words = self.page_words[page_num]
+                if start + len(terms) > len(words):
+                    continue
+                if all(words[start + k][0] == term for k, term in enumerate(terms[1:], 1)):
+                    hits.append((page_num, [words[start + k][1:] for k in range(len(terms))]))
+        hits.sort(key=lambda hit: hit[0])  # 같은 페이지 안에서는 읽는 순서 유지
+        return hits
+
+    def save(self, path):
+        with self._lock:
+            data = {'version': self.VERSION, 'pages': {str(p): w for p, w in self.page_words.items()}}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + '.tmp'
+        with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    def load(self, path):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != self.VERSION:
+            return  # 예전 형식: 처음부터 다시 색인
+        for page_num, words in data['pages'].items():
+            self.add_page(int(page_num), [tuple(word) for word in words])
+
+
+def extract_page_words(page):
+    """MuPDF 로 페이지 단어를 뽑아 [(정규화한 단어, x0, y0, x1, y1), ...] 로 반환 (회전 전 좌표)
+
+    get_text 는 페이지 회전과 무관하게 회전 전 좌표를 돌려주므로 그대로 쓴다.
+    """
+    return [(SearchIndex.normalize(word), round(x0, 2), round(y0, 2), round(x1, 2), round(y1, 2))
+            for x0, y0, x1, y1, word, *_ in page.get_text('words')]
+
+
+class SearchIndexer(QThread):
+    """백그라운드에서 현재 페이지에 가까운 페이지부터 텍스트를 뽑아 SearchIndex 를 채우는 스레드
+
+    문서 해시별로 완성된 색인을 디스크에 저장해 두고, 다음에는 파일에서 바로 읽는다.
+    """
+
+    progress = pyqtSignal(int, int, int)  # (문서 세대, 색인된 페이지 수, 전체 페이지 수)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._condition = threading.Condition()
+        self._file_name = None
+        self._cache_path = None
+        self._index = None
+        self._reopen = False
+        self._running = True
+        self.center = 0  # 이 페이지에 가까운 페이지부터 색인
+        self.generation = 0
+
+    def open_document(self, file_name, generation, index, cache_path=None):
+        with self._condition:
+            self._file_name = file_name
+            self._cache_path = cache_path
+            self._index = index
+            self.generation = generation
+            self.center = 0
+            self._reopen = True
+            self._condition.notify()
+
+    def set_center(self, page_num):
+        self.center = page_num
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self.wait()
+
+    def _next_page(self, remaining, page_count):
+        """남은 페이지 중 center 에 가장 가까운 페이지 (앞쪽 우선)"""
+        center = min(max(self.center, 0), page_count - 1)
+        for distance in range(page_count):
+            for page_num in (center + distance, center - distance):
+                if page_num in remaining:
+                    return page_num
+        return None
+
+    def run(self):
+        document = None
+        remaining = set()
+        while True:
+            with self._condition:
+                while self._running and not self._reopen and not remaining:
+                    self._condition.wait()
+                if not self._running:
+                    break
+                reopen = self._reopen
+                self._reopen = False
+                file_name = self._file_name
+                index = self._index
+                cache_path = self._cache_path
+                generation = self.generation
+
+            if reopen:
+                if document is not None:
+                    document.close()
+                remaining = set()
+                try:
+                    document = fitz.open(file_name)
+                    if cache_path and os.path.exists(cache_path):
+                        index.load(cache_path)
+                    remaining = {p for p in range(len(document)) if not index.is_indexed(p)}
+                    self.progress.emit(generation, len(index), len(document))
+                except Exception as e:
+                    document = None
+                    print(f"검색 색인 준비 중 오류: {str(e)}")
+                continue
+
+            page_num = self._next_page(remaining, len(document))
+            remaining.discard(page_num)
+            try:
+                index.add_page(page_num, extract_page_words(document[page_num]))
+            except Exception as e:
+                index.add_page(page_num, [])
+                print(f"페이지 {page_num} 텍스트 추출 중 오류: {str(e)}")
+
+            # 검색 결과 갱신이 너무 잦지 않도록 몇 페이지마다 알림
+            if not remaining or len(index) % 25 == 0:
+                self.progress.emit(generation, len(index), len(document))
+            if not remaining and cache_path:
+                try:
+                    index.save(cache_path)
+                except OSError as e:
+                    print(f"검색 색인 저장 중 오류: {str(e)}")
+
+        if document is not None:
+            document.close()
+
+
+class DocumentOpener(QThread):
+    """창이 멈추지 않도록 백그라운드 스레드에서 PDF 를 여는 서비스
+
+    경로로 연 문서는 MuPDF 가 필요한 부분(xref 와 요청된 객체)만 읽으므로, 여기서는 문서 해시
+    계산, 구조 파싱, 손상된 xref 복구만 맡고 페이지 크기와 목차는 쓰일 때 읽는다.
+    여는 도중 다른 파일을 요청하면 이전 결과는 버린다.
+    """
+
+    progress = pyqtSignal(int, str)  # (열기 요청 번호, 진행 단계)
+    opened = pyqtSignal(int, str, object, object, str)  # (요청 번호, 파일, 문서, 문서 해시, 오류 메시지)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._condition = threading.Condition()
+        self._request = None  # (요청 번호, 파일)
+        self._running = True
+
+    def open(self, request, file_name):
+        with self._condition:
+            self._request = (request, file_name)
+            self._condition.notify()
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self.wait()
+
+    def _superseded(self):
+        with self._condition:
+            return self._request is not None or not self._running
+
+    def run(self):
+        while True:
+            with self._condition:
+                while self._running and self._request is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                request, file_name = self._request
+                self._request = None
+
+            document = None
+            fingerprint = None
+            error = ''
+            try:
+                # 해시는 파일 앞/뒤만 읽으므로 MuPDF 가 처음 읽을 헤더와 trailer/xref 도 미리 캐시에 올라옴
+                self.progress.emit(request, '문서 해시 계산 중')
+                try:
+                    fingerprint = document_fingerprint(file_name)
+                except OSError as e:
+                    print(f"문서 해시 계산 오류: {str(e)}")
+                if self._superseded():
+                    continue
+                self.progress.emit(request, '문서 구조 읽는 중')
+                with tracer.span('document_open'):
+                    document = fitz.open(file_name)
+                    document.page_count  # 페이지 트리까지 읽어 둠
+                if document.is_repaired:
+                    self.progress.emit(request, '손상된 xref 복구됨')
+            except Exception as e:
+                error = str(e)
+            if self._superseded():
+                if document is not None:
+                    document.close()
+                continue
+            self.opened.emit(request, file_name, document, fingerprint, error)
+
+
+class ThumbnailModel(QAbstractListModel):
+    """페이지 썸네일 목록 모델
+
+    뷰는 화면에 보이는 항목에 대해서만 data() 를 부르므로, 그때 뷰어에 썸네일을 요청해
+    수천 페이지 문서에서도 보이는 썸네일만 만들어진다.
+    """
+
+    def __init__(self, viewer):
+        super().__init__(viewer)
+        self.viewer = viewer
+        self.page_count = 0
+
+    def set_page_count(self, page_count):
+        self.beginResetModel()
+        self.page_count = page_count
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.page_count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return str(index.row() + 1)
+        if role == Qt.DecorationRole:
+            return self.viewer.thumbnailImage(index.row())
+        return None
+
+    def page_changed(self, page_num):
+        """썸네일이 준비되거나 바뀐 페이지를 다시 그리도록 알림"""
+        if 0 <= page_num < self.page_count:
+            index = self.index(page_num)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+
+class ContinuousPageView(QScrollArea):
+    """모든 페이지를 세로로 이어 보여주는 연속 스크롤 보기
+
+    페이지 크기만으로 전체 배치를 잡아 두고, 화면과 위아래 여유 영역에 걸친 페이지만 래스터를
+    요청해 그린다. 멀리 벗어난 페이지의 래스터는 페이지 캐시에서도 바로 내보낸다.
+    """
+
+    gap = 8  # 페이지 사이 간격 (논리 픽셀)
+
+    def __init__(self, viewer):
+        super().__init__(viewer)
+        self.viewer = viewer
+        self.canvas = _ContinuousCanvas(self)
+        self.setWidget(self.canvas)
+        self.setAlignment(Qt.AlignHCenter)
+        self.setFrameShape(QScrollArea.NoFrame)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)  # 스크롤바가 생겼다 사라지며 배치가 반복되지 않도록
+        self.page_sizes = []  # 회전이 반영된 페이지 크기 (포인트)
+        self.tops = []  # 각 페이지의 위쪽 y 좌표 (논리 픽셀)
+        self.scale = 1.0  # 포인트 -> 논리 픽셀
+        self.keys = {}  # 여유 영역 안 페이지 -> 요청한 캐시 키
+        self.images = {}  # 여유 영역 안 페이지 -> 표시할 래스터
+        self.verticalScrollBar().valueChanged.connect(self.update_visible)
+
+    def set_document(self, document):
+        """페이지를 렌더링하지 않고 크기만 읽어 배치 (실제 크기가 다르면 표시할 때 고침)"""
+        self.page_sizes = []
+        for page_num in range(len(document)):
+            try:
+                box = document.page_cropbox(page_num)
+                width, height = box.width, box.height
+            except AttributeError:
+                width, height = document[page_num].rect.width, document[page_num].rect.height
+            if self.viewer.rotated_pages.get(page_num, 0) % 180 == 90:
+                width, height = height, width
+            self.page_sizes.append((width, height))
+        self.keys = {}
+        self.images = {}
+        self.relayout()
+
+    def relayout(self):
+        if not self.page_sizes:
+            return
+        max_width = max(width for width, _ in self.page_sizes)
+        available = max(1, self.viewport().width() - 2 * self.gap)
+        self.scale = available / max_width * self.viewer.zoom_factor
+        self.tops = []
+        y = self.gap
+        for _, height in self.page_sizes:
+            self.tops.append(y)
+            y += round(height * self.scale) + self.gap
+        self.canvas.setFixedSize(round(max_width * self.scale) + 2 * self.gap, y)
+        self.keys = {}
+        self.update_visible()
+
+    def page_rect(self, page_num):
+        width, height = self.page_sizes[page_num]
+        x = (self.canvas.width() - round(width * self.scale)) / 2
+        return QRectF(x, self.tops[page_num], round(width * self.scale), round(height * self.scale))
+
+    def page_at(self, y):
+        return max(0, bisect.bisect_right(self.tops, y) - 1)
+
+    def scroll_to_page(self, page_num):
+        if 0 <= page_num < len(self.tops):
+            self.verticalScrollBar().setValue(self.tops[page_num] - self.gap)
+
+    def zoom(self, zoom_factor):
+        """줌을 바꾸고 화면 가운데에 있던 페이지 위치를 유지"""
+        center = self.verticalScrollBar().value() + self.viewport().height() / 2
+        page_num = self.page_at(center)
+        ratio = (center - self.tops[page_num]) / max(1.0, self.page_rect(page_num).height())
+        self.viewer.zoom_factor = zoom_factor
+        self.relayout()
+        center = self.tops[page_num] + ratio * self.page_rect(page_num).height()
+        self.verticalScrollBar().setValue(round(center - self.viewport().height() / 2))
+
+    def update_visible(self):
+        """화면 근처 페이지만 래스터를 요청하고, 멀리 벗어난 페이지의 래스터는 내보냄"""
+        viewer = self.viewer
+        if not self.page_sizes or viewer.pdf_document is None or not viewer.continuous_mode:
+            return
+        top = self.verticalScrollBar().value()
+        height = self.viewport().height()
+        first = self.page_at(top - height)
+        last = self.page_at(top + 2 * height)
+        center = self.page_at(top + height / 2)
+        nearby = set(range(first, last + 1))
+
+        for page_num in [p for p in self.keys if p not in nearby]:
+            viewer.page_cache.remove(self.keys.pop(page_num))
+            self.images.pop(page_num, None)
+        viewer.render_worker.retain(nearby)
+
+        dpr = self.devicePixelRatioF()
+        for page_num in sorted(nearby, key=lambda p: abs(p - center)):
+            key = viewer._page_cache_key(page_num, self.scale * dpr)
+            if self.keys.get(page_num) == key and page_num in self.images:
+                continue
+            self.keys[page_num] = key
+            self._check_page_size(page_num)
+            image = viewer._cached_image(key)
+            if image is not None:
+                self.images[page_num] = image
+            else:
+                viewer.render_worker.request(key, page_num, key[1], key[2], abs(page_num - center))
+
+        if center != viewer.current_page:
+            viewer.current_page = center
+            viewer.prefetcher.note_page(center)
+            viewer.search_indexer.set_center(center)
+            viewer._sync_thumbnail_selection()
+        self.canvas.update()
+
+    def _check_page_size(self, page_num):
+        rect = self.viewer.pdf_document[page_num].rect
+        if abs(rect.width - self.page_sizes[page_num][0]) > 0.5 or abs(rect.height - self.page_sizes[page_num][1]) > 0.5:
+            # 파일에 지정된 회전 등으로 실제 크기가 다르면 그 뒤 페이지 위치를 다시 계산
+            self.page_sizes[page_num] = (rect.width, rect.height)
+            QTimer.singleShot(0, self.relayout)
+
+    def image_ready(self, key, image):
+        page_num = key[0]
+        if self.keys.get(page_num) == key:
+            self.images[page_num] = image
+            self.canvas.update(self.page_rect(page_num).toAlignedRect())
+
+    def paint_pages(self, painter, rect):
+        viewer = self.viewer
+        if not self.page_sizes or viewer.pdf_document is None:
+            return
+        first = self.page_at(rect.top())
+        last = self.page_at(rect.bottom())
+        for page_num in range(first, last + 1):
+            target = self.page_rect(page_num)
+            image = self.images.get(page_num)
+            if image is None:
+                painter.fillRect(target, Qt.white)  # 아직 렌더링되지 않은 페이지 자리
+            else:
+                painter.drawImage(target, image)
+            page = viewer.pdf_document[page_num]
+            m = page.rotation_matrix * fitz.Matrix(self.scale, self.scale)
+            viewer.paintPageAnnotations(
+                painter, page_num, QTransform(m.a, m.b, m.c, m.d, m.e + target.x(), m.f + target.y()))
+            painter.resetTransform()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.relayout()
+
+    def wheelEvent(self, event):
+        # Ctrl + 휠은 줌, Shift + 휠은 투명도, 나머지는 스크롤
+        if event.modifiers() == Qt.ControlModifier:
+            # 연속 줌도 프레임마다 모아서 한 번만 다시 배치 (연속 보기는 화면 가운데를 기준으로 확대)
+            zoom_change = 1.2 if event.angleDelta().y() > 0 else 0.8
+            self.viewer.input_scheduler.zoom(zoom_change, 0.5, 0.5)
+        elif event.modifiers() == Qt.ShiftModifier:
+            self.viewer.wheelEvent_opacity(event)
+        else:
+            super().wheelEvent(event)
+
+
+class _ContinuousCanvas(QWidget):
+    """연속 스크롤 보기의 전체 크기 캔버스 (다시 그릴 영역에 걸친 페이지만 그림)"""
+
+    def __init__(self, view):
+        super().__init__()
+        self.view = view
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        self.view.paint_pages(painter, event.rect())
+        painter.end()
+
+
+class PageImageLabel(QLabel):
+    """페이지 래스터(QImage)를 QPixmap 으로 바꾸지 않고 가운데에 직접 그리는 레이블
+
+    표시할 때마다 래스터 전체를 QPixmap 으로 복사하지 않도록, 캐시된 이미지를 그대로 들고 있다가
+    paintEvent 에서 그린다. 배경은 스타일시트의 QLabel 설정을 그대로 따른다.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._image = None
+        self._dpr = 1.0
+
+    def image(self):
+        return self._image
+
+    def setImage(self, image, dpr=1.0):
+        """image 를 dpr 배 밀도로 표시 (이미지는 수정하지 않으므로 캐시된 래스터를 그대로 넘겨도 됨)"""
+        self._image = image
+        self._dpr = dpr
+        self.updateGeometry()
+        self.update()
+
+    def sizeHint(self):
+        if self._image is None:
+            return super().sizeHint()
+        return QSize(round(self._image.width() / self._dpr), round(self._image.height() / self._dpr))
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._image is None:
+            return
+        with tracer.span('paint_page'):
+            width = self._image.width() / self._dpr
+            height = self._image.height() / self._dpr
+            painter = QPainter(self)
+            painter.drawImage(QRectF((self.width() - width) / 2, (self.height() - height) / 2, width, height),
+                              self._image)
+            painter.end()
+
+
+class AnnotationOverlay(QWidget):
+    """페이지 래스터 위에 겹쳐 주석만 그리는 투명 레이어 (주석이 바뀌어도 페이지는 다시 그리지 않음)"""
+
+    def __init__(self, viewer, parent=None):
+        super().__init__(parent)
+        self.viewer = viewer
+        # 마우스 이벤트는 기존처럼 메인 창이 처리
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WA_NoSystemBackground)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+
+    def paintEvent(self, event):
+        with tracer.span('paint_annotations'):
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.Antialiasing)
+            self.viewer.paintAnnotations(painter)
+            painter.end()
+
+
+class InputCoalescer(QObject):
+    """휠/키 입력을 모아 화면 주사율에 맞춰 한 프레임에 한 번만 반영하는 스케줄러
+
+    프레임 사이에 들어온 페이지 이동, 확대/축소, 투명도 변화를 합쳐 결과만 적용한다.
+    입력이 이어지는 동안 뷰어는 빠른 근사 표시(interactive_pass)를 쓰고, 입력이 settle_ms
+    동안 멈추면 고품질로 다시 그린다.
+    """
+
+    settle_ms = 150
+    wheel_step = 120  # 휠 한 칸의 angleDelta (고해상도 휠/트랙패드는 작은 값으로 여러 번 옴)
+
+    def __init__(self, viewer):
+        super().__init__(viewer)
+        self.viewer = viewer
+        self.page_delta = 0
+        self.wheel_remainder = 0  # 아직 한 칸이 되지 않은 휠 이동량
+        self.zoom_change = 1.0
+        self.zoom_anchor = (0.5, 0.5)  # 마지막 입력의 마우스 위치 (레이블 크기 대비 비율)
+        self.opacity_delta = 0.0
+        self._last_flush = 0.0
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.timeout.connect(self.flush)
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(self.settle_ms)
+        self.settle_timer.timeout.connect(self._settle)
+
+    def frame_interval(self):
+        """디스플레이 한 프레임의 길이 (초, 주사율을 알 수 없으면 60Hz)"""
+        screen = QApplication.primaryScreen()
+        rate = screen.refreshRate() if screen is not None else 0
+        return 1.0 / (rate if rate >= 24 else 60.0)
+
+    def navigate_pages(self, pages):
+        self.page_delta += pages
+        self._schedule()
+
+    def scroll_wheel(self, delta):
+        """페이지 넘김 휠: angleDelta 를 모아 한 칸마다 한 페이지 (위로 굴리면 이전 페이지)"""
+        if self.wheel_remainder and (self.wheel_remainder > 0) != (delta > 0):
+            self.wheel_remainder = 0  # 방향이 바뀌면 모아 둔 양은 버림
+        self.wheel_remainder += delta
+        pages = int(self.wheel_remainder / self.wheel_step)
+        self.wheel_remainder -= pages * self.wheel_step
+        self.page_delta -= pages
+        self._schedule()
+
+    def zoom(self, change, rel_x, rel_y):
+        self.zoom_change *= change
+        self.zoom_anchor = (rel_x, rel_y)
+        self._schedule()
+
+    def change_opacity(self, delta):
+        self.opacity_delta += delta
+        self._schedule()
+
+    def _schedule(self):
+        """마지막 반영 후 한 프레임이 지났으면 바로, 아니면 다음 프레임에 반영"""
+        self.viewer.interactive_pass = True
+        self.settle_timer.start()
+        if self.frame_timer.isActive():
+            return
+        wait = self._last_flush + self.frame_interval() - time.perf_counter()
+        if wait <= 0:
+            self.flush()
+        else:
+            self.frame_timer.start(max(1, math.ceil(wait * 1000)))
+
+    def flush(self):
+        """모아 둔 입력의 합만 뷰어에 적용"""
+        self.frame_timer.stop()
+        self._last_flush = time.perf_counter()
+        page_delta, self.page_delta = self.page_delta, 0
+        zoom_change, self.zoom_change = self.zoom_change, 1.0
+        opacity_delta, self.opacity_delta = self.opacity_delta, 0.0
+        viewer = self.viewer
+        with tracer.span('input_flush'):
+            if opacity_delta:
+                opacity = min(1.0, max(0.1, viewer.opacity + opacity_delta))
+                if opacity != viewer.opacity:
+                    viewer.opacity = opacity
+                    # 창 자체의 투명도 설정 (PDF 내용과 주석 레이어는 다시 그리지 않음)
+                    viewer.setWindowOpacity(viewer.opacity)
+            if viewer.pdf_document is None:
+                return
+            if page_delta:
+                target = min(max(0, viewer.current_page + page_delta), len(viewer.pdf_document) - 1)
+                if target != viewer.current_page:
+                    viewer.current_page = target
+                    viewer.showPage()
+            if zoom_change != 1.0:
+                new_zoom = max(0.1, min(5.0, viewer.zoom_factor * zoom_change))
+                if new_zoom != viewer.zoom_factor:
+                    if viewer.continuous_mode:
+                        viewer.continuous_view.zoom(new_zoom)
+                    else:
+                        viewer.zoom_factor = new_zoom
+                        viewer._update_zoomed_page(*self.zoom_anchor)
+
+    def _settle(self):
+        """입력이 멈추면 근사 표시로 그린 화면을 고품질로 다시 그림"""
+        if self.frame_timer.isActive():
+            self.flush()
+        self.wheel_remainder = 0
+        viewer = self.viewer
+        viewer.interactive_pass = False
+        if viewer._needs_quality_pass:
+            viewer._needs_quality_pass = False
+            viewer.showPage()
+
+
+class LazyIconEngine(QIconEngine):
+    """처음 그려질 때 factory 로 실제 아이콘을 만드는 엔진 (화면에 나오지 않는 아이콘은 디코딩하지 않음)"""
+
+    def __init__(self, factory, source):
+        super().__init__()
+        self.factory = factory
+        self.source = source
+        self._icon = None
+
+    def icon(self):
+        if self._icon is None:
+            self._icon = self.factory(self.source)
+        return self._icon
+
+    def paint(self, painter, rect, mode, state):
+        self.icon().paint(painter, rect, Qt.AlignCenter, mode, state)
+
+    def pixmap(self, size, mode, state):
+        return self.icon().pixmap(size, mode, state)
+
+    def actualSize(self, size, mode, state):
+        return self.icon().actualSize(size, mode, state)
+
+    def clone(self):
+        engine = LazyIconEngine(self.factory, self.source)
+        engine._icon = self._icon
+        return engine
+
+
+class LazyIcons:
+    """아이콘 이름 -> SVG 데이터를 들고 있다가 요청되면 처음 그릴 때 디코딩하는 QIcon 을 만들어 보관"""
+
+    def __init__(self, factory, sources):
+        self.factory = factory
+        self.sources = sources
+        self.icons = {}
+
+    def __getitem__(self, name):
+        icon = self.icons.get(name)
+        if icon is None:
+            icon = self.icons[name] = QIcon(LazyIconEngine(self.factory, self.sources[name]))
+        return icon
+
+    def __contains__(self, name):
+        return name in self.sources
+
 
 class PDFViewer(QMainWindow):
     def __init__(self):
@@ -22,14 +2228,87 @@ class PDFViewer(QMainWindow):
         self.drawing = False
         self.start_pos = None
         self.current_color = QColor(255, 0, 0)
-        self.annotations = {}
+        self.annotations = AnnotationStore()  # 페이지 좌표로 보관하는 주석 저장소
         self.opacity = 1.0  # 불투명도 초기값 추가
         self.is_maximized = False  # 최대화 상태 추적을 위한 변수 추가
-        self.page_cache = {}  # 페이지 캐시를 저장할 딕셔너리 추가
-        self.preload_thread = None  # 프리로딩 쓰레드
-        self.render_dpi = 300  # 고품질 렌더링을 위한 DPI 설정
+        self.cache_budget_mb = 512  # 페이지 캐시 메모리 예산 (MB)
+        self.page_cache = PageCache(self.cache_budget_mb * 1024 * 1024)  # 렌더 상태별 LRU 페이지 캐시
+        self.render_dpi = 300  # 인쇄 품질 모드에서 사용하는 DPI
+        self.preview_fraction = 0.25  # 먼저 보여줄 저해상도 단계의 배율 (화면 배율 대비)
+        self.render_quality = 'screen'  # 'screen': 화면 해상도에 맞춰 렌더링, 'print': render_dpi 로 렌더링
+        self.tile_renderer = TileRenderer(self.page_cache)  # 확대 시 보이는 영역만 렌더링
+        self.scratch_buffers = ScratchBuffers()  # 화면 합성용 버퍼 재사용
+        self.view_origin = QPointF(0, 0)  # 확대 보기에서 보이는 영역의 좌상단 (페이지 논리 픽셀)
+        self._view_page = None  # view_origin 이 가리키는 페이지
+        self._view_zoom = 1.0  # 현재 화면에 표시된 줌 배율
+        self._pending_display_key = None  # 렌더 워커에 요청한 현재 페이지의 캐시 키
+        self._pending_tile_keys = set()  # 렌더 워커에 요청한 확대 보기 타일의 캐시 키
+        self.tile_timer = QTimer(self)  # 한 번에 도착한 여러 타일을 한 번의 합성으로 반영
+        self.tile_timer.setSingleShot(True)
+        self.tile_timer.setInterval(0)
+        self.tile_timer.timeout.connect(self.showPage)
+        self.prefetcher = Prefetcher()  # 읽는 방향의 다음 페이지를 미리 렌더링
+        self._prefetch_pages = set()  # 마지막으로 프리페치를 요청한 페이지
+        self.prefetch_timer = QTimer(self)  # 현재 페이지 표시 후 잠시 뒤에 프리페치 시작
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(150)
+        self.prefetch_timer.timeout.connect(self._prefetch)
+        self.document_generation = 0  # 문서를 열 때마다 증가해 이전 문서의 렌더 결과를 구분
+        self.render_worker = RenderWorker(self)  # GUI 스레드를 막지 않는 렌더 서비스
+        self.render_worker.imageReady.connect(self._on_image_ready)
+        self.render_processes = 0  # 프로세스 풀 렌더링에 쓸 프로세스 수 (0이면 사용 안 함)
+        self.process_pool = None  # 프리페치 등 대량 작업용 다중 프로세스 렌더 백엔드
+        self.pdf_file_name = None
+        self.document_fingerprint = None  # 열린 PDF 의 내용 해시 (디스크 캐시/저널 키)
+        self.disk_cache_mb = 2048  # 세션 간 유지되는 디스크 래스터 캐시 크기 (0이면 사용 안 함)
+        self.disk_cache = None  # 처음 문서를 열 때 _start_backends 에서 만듦
+        self._backends_started = False  # 렌더/썸네일/검색/열기 스레드를 시작했는지
+        self.thumbnail_width = 120  # 썸네일 너비 (논리 픽셀)
+        self.thumbnail_cache = PageCache(64 * 1024 * 1024)  # 썸네일 전용 메모리 캐시
+        self.thumbnail_worker = RenderWorker(self)  # 본문 렌더링을 막지 않도록 썸네일은 별도 스레드
+        self.thumbnail_worker.imageReady.connect(self._on_thumbnail_ready)
+        self.thumbnail_model = ThumbnailModel(self)
+        self.search_index = SearchIndex()  # 열린 문서의 전문 검색 색인
+        self.search_indexer = SearchIndexer(self)
+        self.search_indexer.progress.connect(self._on_search_progress)
+        self.document_opener = DocumentOpener(self)  # 큰 PDF 도 GUI 스레드를 막지 않고 엶
+        self.document_opener.progress.connect(self._on_open_progress)
+        self.document_opener.opened.connect(self._on_document_opened)
+        self.open_request = 0  # 열기 요청마다 증가 (마지막 요청의 결과만 사용)
+        self.opening_file = None  # 백그라운드에서 여는 중인 파일
+        self._open_stage = ''
+        self._open_started = 0.0
+        self._title_before_open = ''
+        self.open_progress_timer = QTimer(self)  # 여는 동안 창 제목에 경과 시간 표시
+        self.open_progress_timer.setInterval(250)
+        self.open_progress_timer.timeout.connect(self._show_open_progress)
+        self.search_query = ''
+        self.search_hits = []  # [(페이지, [단어 상자, ...]), ...]
+        self.search_page_hits = {}  # 페이지 -> 그 페이지의 search_hits 번호 목록
+        self.search_hit_index = -1  # 현재 선택된 검색 결과
+        self.continuous_mode = False  # True 면 모든 페이지를 이어서 스크롤하는 보기
+        self.input_scheduler = InputCoalescer(self)  # 휠/키 입력을 프레임 단위로 합쳐 반영
+        self.interactive_pass = False  # 입력이 이어지는 동안 True (빠른 근사 표시)
+        self._needs_quality_pass = False  # 근사 표시로 그린 화면이 있어 입력이 멈추면 다시 그려야 함
+        self._thumbnail_placeholder = QImage(self.thumbnail_width, round(self.thumbnail_width * 1.3),
+                                             QImage.Format_RGB32)
+        self._thumbnail_placeholder.fill(Qt.white)
+        self.pixel_filters = []  # 래스터 후처리 필터 사양 목록 (적용 순서대로)
         self.selected_annotation = None  # 선택된 주석 저장
+        self.selected_ids = set()  # 러버 밴드/올가미로 여러 개 선택한 주석 id
+        self.selection_path = None  # 드래그 중인 러버 밴드/올가미 경로 (주석 좌표)
+        self.selection_lasso = False  # True 면 올가미, False 면 러버 밴드
+        self.preview_annotation = None  # 드래그 중인 주석 미리보기
+        self.rotated_pages = {}  # 회전한 페이지 -> 각도 (저장 시 반영)
+        self.save_worker = None  # 백그라운드 저장 스레드
+        self.saved_annotation_xrefs = {}  # 원본 파일에 저장한 {주석 id: (페이지, xref)}
+        # 래스터에서 뺄 (페이지, xref): 이 문서를 연 뒤 뷰어가 PDF 에 써 넣은 적 있는 주석 전부
+        # (렌더 핸들이 예전 버전의 파일을 보고 있을 수 있으므로 저장 후에도 줄이지 않음)
+        self.hidden_annotations = set()
+        self._hidden_annotations_tag = ()  # 문서를 열 때 숨긴 주석 집합의 렌더 옵션 표시
+        self._title_before_save = ''
         self.is_selecting = False  # 선택 모드 상태 저장
+        startup_profile.mark('뷰어 상태 초기화')
         
         # 흑백 테마 스타일시트 적용
         self.setStyleSheet("""
@@ -88,56 +2367,50 @@ class PDFViewer(QMainWindow):
         
         # 아이콘 초기화
         self.icons = self.init_icons()
+        startup_profile.mark('스타일/아이콘 준비')
         
         self.initUI()
+        startup_profile.mark('UI 구성')
     
     def create_icon(self, svg_data):
         if svg_data.startswith('data:image/svg+xml;base64,'):
             svg_data = svg_data[len('data:image/svg+xml;base64,'):]
         
-        # Base64 디코딩
-        import base64
-        svg_text = base64.b64decode(svg_data).decode('utf-8')
-        
-        # stroke 색상을 흰색으로 변경
-        svg_text = svg_text.replace('stroke="currentColor"', 'stroke="white"')
-        
-        # 다시 Base64 인코딩
-        svg_data = base64.b64encode(svg_text.encode('utf-8')).decode('utf-8')
-        
-        byte_array = QByteArray.fromBase64(svg_data.encode())
+        # Base64 디코딩 후 stroke 색상을 흰색으로 변경해 SVG 를 바로 읽음
+        svg_text = base64.b64decode(svg_data).replace(b'stroke="currentColor"', b'stroke="white"')
         pixmap = QPixmap()
-        pixmap.loadFromData(byte_array)
+        pixmap.loadFromData(svg_text, 'SVG')
         return QIcon(pixmap)
     
     def init_icons(self):
-        return {
-            'FOLDER_OPEN': self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWZvbGRlci1vcGVuIj48cGF0aCBkPSJtNiAxNCAxLjUtMi45QTIgMiAwIDAgMSA5LjI0IDEwSDIwYTIgMiAwIDAgMSAxLjk0IDIuNWwtMS41NCA2YTIgMiAwIDAgMS0xLjk1IDEuNUg0YTIgMiAwIDAgMS0yLTJWNWEyIDIgMCAwIDEgMi0yaDMuOWEyIDIgMCAwIDEgMS42OS45bC44MSAxLjJhMiAyIDAgMCAwIDEuNjcuOUgxOGEyIDIgMCAwIDEgMiAydjIiLz48L3N2Zz4="),
-            'SAVE': self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLXNhdmUiPjxwYXRoIGQ9Ik0xNS4yIDNhMiAyIDAgMCAxIDEuNC42bDMuOCAzLjhhMiAyIDAgMCAxIC42IDEuNFYxOWEyIDIgMCAwIDEtMiAySDVhMiAyIDAgMCAxLTItMlY1YTIgMiAwIDAgMSAyLTJ6Ii8+PHBhdGggZD0iTTE3IDIxdi03YTEgMSAwIDAgMC0xLTFIOGExIDEgMCAwIDAtMSAxdjciLz48cGF0aCBkPSJNNyAzdjRhMSAxIDAgMCAwIDEgMWg3Ii8+PC9zdmc+"),
-            'CHEVRON_LEFT': self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWNoZXZyb24tbGVmdCI+PHBhdGggZD0ibTE1IDE4LTYtNiA2LTYiLz48L3N2Zz4="),
-            'CHEVRON_RIGHT': self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWNoZXZyb24tcmlnaHQiPjxwYXRoIGQ9Im05IDE4IDYtNi02LTYiLz48L3N2Zz4="),
-            'SELECT': self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLW1vdXNlLXBvaW50ZXItY2xpY2siPjxwYXRoIGQ9Ik0xNCA0LjEgMTIgNiIvPjxwYXRoIGQ9Im01LjEgOC0yLjktLjgiLz48cGF0aCBkPSJtNiAxMi0xLjkgMiIvPjxwYXRoIGQ9Ik03LjIgMi4yIDggNS4xIi8+PHBhdGggZD0iTTkuMDM3IDkuNjlhLjQ5OC40OTggMCAwIDEgLjY1My0uNjUzbDExIDQuNWEuNS41IDAgMCAxLS4wNzQuOTQ5bC00LjM0OSAxLjA0MWExIDEgMCAwIDAtLjc0LjczOWwtMS4wNCA0LjM1YS41LjUgMCAwIDEtLjk1LjA3NHoiLz48L3N2Zz4="),
-            'SQUARE': self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiPjxyZWN0IHg9IjMiIHk9IjMiIHdpZHRoPSIxOCIgaGVpZ2h0PSIxOCIgcng9IjIiIHJ5PSIyIi8+PC9zdmc+"),
-            'ARROW_RIGHT': self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiPjxsaW5lIHgxPSI1IiB5MT0iMTIiIHgyPSIxOSIgeTI9IjEyIi8+PHBvbHlsaW5lIHBvaW50cz0iMTIgNSAxOSAxMiAxMiAxOSIvPjwvc3ZnPg=="),
-            'TYPE': self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiPjxwb2x5bGluZSBwb2ludHM9IjQgNyAxMCA3IDE2IDcgMjAgNyIvPjxsaW5lIHgxPSIxMiIgeTE9IjciIHgyPSIxMiIgeTI9IjIwIi8+PC9zdmc+"),
-            'PALETTE': self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiPjxjaXJjbGUgY3g9IjEyIiBjeT0iMTIiIHI9IjEwIi8+PGNpcmNsZSBjeD0iMTIiIGN5PSI4IiByPSIxIi8+PGNpcmNsZSBjeD0iOCIgY3k9IjEyIiByPSIxIi8+PGNpcmNsZSBjeD0iMTYiIGN5PSIxMiIgcj0iMSIvPjxjaXJjbGUgY3g9IjEyIiBjeT0iMTYiIHI9IjEiLz48L3N2Zz4="),
-            'close': self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLXgiPjxwYXRoIGQ9Ik0xOCA2IDYgMTgiLz48cGF0aCBkPSJtNiA2IDEyIDEyIi8+PC9zdmc+"),
-            'window-minimize': self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLW1pbnVzIj48cGF0aCBkPSJNNSAxMmgxNCIvPjwvc3ZnPg=="),
-            'window-maximum' :self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLW1heGltaXplIj48cGF0aCBkPSJNOCAzSDVhMiAyIDAgMCAwLTIgMnYzIi8+PHBhdGggZD0iTTIxIDhWNWEyIDIgMCAwIDAtMi0yaC0zIi8+PHBhdGggZD0iTTMgMTZ2M2EyIDIgMCAwIDAgMiAyaDMiLz48cGF0aCBkPSJNMTYgMjFoM2EyIDIgMCAwIDAgMi0ydi0zIi8+PC9zdmc+"),
-            'window-small' :self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLXBpY3R1cmUtaW4tcGljdHVyZSI+PHBhdGggZD0iTTIgMTBoNlY0Ii8+PHBhdGggZD0ibTIgNCA2IDYiLz48cGF0aCBkPSJNMjEgMTBWN2EyIDIgMCAwIDAtMi0yaC03Ii8+PHBhdGggZD0iTTMgMTR2MmEyIDIgMCAwIDAgMiAyaDMiLz48cmVjdCB4PSIxMiIgeT0iMTQiIHdpZHRoPSIxMCIgaGVpZ2h0PSI3IiByeD0iMSIvPjwvc3ZnPg=="),
-            'rotate-ccw' :self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLXJvdGF0ZS1jY3ciPjxwYXRoIGQ9Ik0zIDEyYTkgOSAwIDEgMCA5LTkgOS43NSA5Ljc1IDAgMCAwLTYuNzQgMi43NEwzIDgiLz48cGF0aCBkPSJNMyAzdjVoNSIvPjwvc3ZnPg=="),
-            'roatate-cc' :self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLXJvdGF0ZS1jdyI+PHBhdGggZD0iTTIxIDEyYTkgOSAwIDEgMS05LTljMi41MiAwIDQuOTMgMSA2Ljc0IDIuNzRMMjEgOCIvPjxwYXRoIGQ9Ik0yMSAzdjVoLTUiLz48L3N2Zz4="),
-            'right_arrow' :self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWNoZXZyb25zLXJpZ2h0Ij48cGF0aCBkPSJtNiAxNyA1LTUtNS01Ii8+PHBhdGggZD0ibTEzIDE3IDUtNS01LTUiLz48L3N2Zz4="),
-            'left_arrow' :self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWNoZXZyb25zLWxlZnQiPjxwYXRoIGQ9Im0xMSAxNy01LTUgNS01Ii8+PHBhdGggZD0ibTE4IDE3LTUtNSA1LTUiLz48L3N2Zz4="),
-            'square-split-horizontal':self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLXNxdWFyZS1zcGxpdC1ob3Jpem9udGFsIj48cGF0aCBkPSJNOCAxOUg1Yy0xIDAtMi0xLTItMlY3YzAtMSAxLTIgMi0yaDMiLz48cGF0aCBkPSJNMTYgNWgzYzEgMCAyIDEgMiAydjEwYzAgMS0xIDItMiAyaC0zIi8+PGxpbmUgeDE9IjEyIiB4Mj0iMTIiIHkxPSI0IiB5Mj0iMjAiLz48L3N2Zz4="),
-            'settings' :self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLXNldHRpbmdzIj48cGF0aCBkPSJNMTIuMjIgMmgtLjQ0YTIgMiAwIDAgMC0yIDJ2LjE4YTIgMiAwIDAgMS0xIDEuNzNsLS40My4yNWEyIDIgMCAwIDEtMiAwbC0uMTUtLjA4YTIgMiAwIDAgMC0yLjczLjczbC0uMjIuMzhhMiAyIDAgMCAwIC43MyAyLjczbC4xNS4xYTIgMiAwIDAgMSAxIDEuNzJ2LjUxYTIgMiAwIDAgMS0xIDEuNzRsLS4xNS4wOWEyIDIgMCAwIDAtLjczIDIuNzNsLjIyLjM4YTIgMiAwIDAgMC0yLjczLS43M2wtLjE1LjA4YTIgMiAwIDAgMS0yIDBsLS40My0uMjVhMiAyIDAgMCAxLTEtMS43M1Y0YTIgMiAwIDAgMC0yLTJ6Ii8+PGNpcmNsZSBjeD0iMTIiIGN5PSIxMiIgcj0iMyIvPjwvc3ZnPg=="),
-            'list' :self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWxpc3QiPjxwYXRoIGQ9Ik0zIDEyaC4wMSIvPjxwYXRoIGQ9Ik0zIDE4aC4wMSIvPjxwYXRoIGQ9Ik0zIDZoLjAxIi8+PHBhdGggZD0iTTggMTJoMTMiLz48cGF0aCBkPSJNOCAxOGgxMyIvPjxwYXRoIGQ9Ik04IDZoMTMiLz48L3N2Zz4="),#주석리스트
-            'lock' :self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWxvY2sta2V5aG9sZSI+PGNpcmNsZSBjeD0iMTIiIGN5PSIxNiIgcj0iMSIvPjxyZWN0IHg9IjMiIHk9IjEwIiB3aWR0aD0iMTgiIGhlaWdodD0iMTIiIHJ4PSIyIi8+PHBhdGggZD0iTTcgMTBWN2E1IDUgMCAwIDEgMTAgMHYzIi8+PC9zdmc+"),
-            'unlock' :self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWxvY2sta2V5aG9sZS1vcGVuIj48Y2lyY2xlIGN4PSIxMiIgY3k9IjE2IiByPSIxIi8+PHJlY3Qgd2lkdGg9IjE4IiBoZWlnaHQ9IjEyIiB4PSIzIiB5PSIxMCIgcng9IjIiLz48cGF0aCBkPSJNNyAxMFY3YTUgNSAwIDAgMSA5LjMzLTIuNSIvPjwvc3ZnPg=="),
-            'bookmark' :self.create_icon("data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWJvb2ttYXJrIj48cGF0aCBkPSJtMTkgMjEtNy00LTcgNFY1YTIgMiAwIDAgMSAyLTJoMTBhMiAyIDAgMCAxIDIgMnYxNnoiLz48L3N2Zz4="),
+        # 아이콘은 처음 쓸 때 만들어짐 (쓰지 않는 아이콘은 디코딩하지 않음)
+        return LazyIcons(self.create_icon, {
+            'FOLDER_OPEN': "data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWZvbGRlci1vcGVuIj48cGF0aCBkPSJtNiAxNCAxLjUtMi45QTIgMiAwIDAgMSA5LjI0IDEwSDIwYTIgMiAwIDAgMSAxLjk0IDIuNWwtMS41NCA2YTIgMiAwIDAgMS0xLjk1IDEuNUg0YTIgMiAwIDAgMS0yLTJWNWEyIDIgMCAwIDEgMi0yaDMuOWEyIDIgMCAwIDEgMS42OS45bC44MSAxLjJhMiAyIDAgMCAwIDEuNjcuOUgxOGEyIDIgMCAwIDEgMiAydjIiLz48L3N2Zz4=",
+            'SAVE': "data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLXNhdmUiPjxwYXRoIGQ9Ik0xNS4yIDNhMiAyIDAgMCAxIDEuNC42bDMuOCAzLjhhMiAyIDAgMCAxIC42IDEuNFYxOWEyIDIgMCAwIDEtMiAySDVhMiAyIDAgMCAxLTItMlY1YTIgMiAwIDAgMSAyLTJ6Ii8+PHBhdGggZD0iTTE3IDIxdi03YTEgMSAwIDAgMC0xLTFIOGExIDEgMCAwIDAtMSAxdjciLz48cGF0aCBkPSJNNyAzdjRhMSAxIDAgMCAwIDEgMWg3Ii8+PC9zdmc+",
+            'CHEVRON_LEFT': "data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWNoZXZyb24tbGVmdCI+PHBhdGggZD0ibTE1IDE4LTYtNiA2LTYiLz48L3N2Zz4=",
+            'CHEVRON_RIGHT': "data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWNoZXZyb24tcmlnaHQiPjxwYXRoIGQ9Im05IDE4IDYtNi02LTYiLz48L3N2Zz4=",
+            'SELECT': "data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLW1vdXNlLXBvaW50ZXItY2xpY2siPjxwYXRoIGQ9Ik0xNCA0LjEgMTIgNiIvPjxwYXRoIGQ9Im01LjEgOC0yLjktLjgiLz48cGF0aCBkPSJtNiAxMi0xLjkgMiIvPjxwYXRoIGQ9Ik03LjIgMi4yIDggNS4xIi8+PHBhdGggZD0iTTkuMDM3IDkuNjlhLjQ5OC40OTggMCAwIDEgLjY1My0uNjUzbDExIDQuNWEuNS41IDAgMCAxLS4wNzQuOTQ5bC00LjM0OSAxLjA0MWExIDEgMCAwIDAtLjc0LjczOWwtMS4wNCA0LjM1YS41LjUgMCAwIDEtLjk1LjA3NHoiLz48L3N2Zz4=",
+            'SQUARE': "data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiPjxyZWN0IHg9IjMiIHk9IjMiIHdpZHRoPSIxOCIgaGVpZ2h0PSIxOCIgcng9IjIiIHJ5PSIyIi8+PC9zdmc+",
+            'ARROW_RIGHT': "data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiPjxsaW5lIHgxPSI1IiB5MT0iMTIiIHgyPSIxOSIgeTI9IjEyIi8+PHBvbHlsaW5lIHBvaW50cz0iMTIgNSAxOSAxMiAxMiAxOSIvPjwvc3ZnPg==",
+            'TYPE': "data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiPjxwb2x5bGluZSBwb2ludHM9IjQgNyAxMCA3IDE2IDcgMjAgNyIvPjxsaW5lIHgxPSIxMiIgeTE9IjciIHgyPSIxMiIgeTI9IjIwIi8+PC9zdmc+",
+            'PALETTE': "data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiPjxjaXJjbGUgY3g9IjEyIiBjeT0iMTIiIHI9IjEwIi8+PGNpcmNsZSBjeD0iMTIiIGN5PSI4IiByPSIxIi8+PGNpcmNsZSBjeD0iOCIgY3k9IjEyIiByPSIxIi8+PGNpcmNsZSBjeD0iMTYiIGN5PSIxMiIgcj0iMSIvPjxjaXJjbGUgY3g9IjEyIiBjeT0iMTYiIHI9IjEiLz48L3N2Zz4=",
+            'close': "data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLXgiPjxwYXRoIGQ9Ik0xOCA2IDYgMTgiLz48cGF0aCBkPSJtNiA2IDEyIDEyIi8+PC9zdmc+",
+            'window-minimize': "data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLW1pbnVzIj48cGF0aCBkPSJNNSAxMmgxNCIvPjwvc3ZnPg==",
+            'window-maximum' :"data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLW1heGltaXplIj48cGF0aCBkPSJNOCAzSDVhMiAyIDAgMCAwLTIgMnYzIi8+PHBhdGggZD0iTTIxIDhWNWEyIDIgMCAwIDAtMi0yaC0zIi8+PHBhdGggZD0iTTMgMTZ2M2EyIDIgMCAwIDAgMiAyaDMiLz48cGF0aCBkPSJNMTYgMjFoM2EyIDIgMCAwIDAgMi0ydi0zIi8+PC9zdmc+",
+            'window-small' :"data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLXBpY3R1cmUtaW4tcGljdHVyZSI+PHBhdGggZD0iTTIgMTBoNlY0Ii8+PHBhdGggZD0ibTIgNCA2IDYiLz48cGF0aCBkPSJNMjEgMTBWN2EyIDIgMCAwIDAtMi0yaC03Ii8+PHBhdGggZD0iTTMgMTR2MmEyIDIgMCAwIDAgMiAyaDMiLz48cmVjdCB4PSIxMiIgeT0iMTQiIHdpZHRoPSIxMCIgaGVpZ2h0PSI3IiByeD0iMSIvPjwvc3ZnPg==",
+            'rotate-ccw' :"data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLXJvdGF0ZS1jY3ciPjxwYXRoIGQ9Ik0zIDEyYTkgOSAwIDEgMCA5LTkgOS43NSA5Ljc1IDAgMCAwLTYuNzQgMi43NEwzIDgiLz48cGF0aCBkPSJNMyAzdjVoNSIvPjwvc3ZnPg==",
+            'roatate-cc' :"data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLXJvdGF0ZS1jdyI+PHBhdGggZD0iTTIxIDEyYTkgOSAwIDEgMS05LTljMi41MiAwIDQuOTMgMSA2Ljc0IDIuNzRMMjEgOCIvPjxwYXRoIGQ9Ik0yMSAzdjVoLTUiLz48L3N2Zz4=",
+            'right_arrow' :"data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWNoZXZyb25zLXJpZ2h0Ij48cGF0aCBkPSJtNiAxNyA1LTUtNS01Ii8+PHBhdGggZD0ibTEzIDE3IDUtNS01LTUiLz48L3N2Zz4=",
+            'left_arrow' :"data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWNoZXZyb25zLWxlZnQiPjxwYXRoIGQ9Im0xMSAxNy01LTUgNS01Ii8+PHBhdGggZD0ibTE4IDE3LTUtNSA1LTUiLz48L3N2Zz4=",
+            'square-split-horizontal':"data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLXNxdWFyZS1zcGxpdC1ob3Jpem9udGFsIj48cGF0aCBkPSJNOCAxOUg1Yy0xIDAtMi0xLTItMlY3YzAtMSAxLTIgMi0yaDMiLz48cGF0aCBkPSJNMTYgNWgzYzEgMCAyIDEgMiAydjEwYzAgMS0xIDItMiAyaC0zIi8+PGxpbmUgeDE9IjEyIiB4Mj0iMTIiIHkxPSI0IiB5Mj0iMjAiLz48L3N2Zz4=",
+            'settings' :"data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLXNldHRpbmdzIj48cGF0aCBkPSJNMTIuMjIgMmgtLjQ0YTIgMiAwIDAgMC0yIDJ2LjE4YTIgMiAwIDAgMS0xIDEuNzNsLS40My4yNWEyIDIgMCAwIDEtMiAwbC0uMTUtLjA4YTIgMiAwIDAgMC0yLjczLjczbC0uMjIuMzhhMiAyIDAgMCAwIC43MyAyLjczbC4xNS4xYTIgMiAwIDAgMSAxIDEuNzJ2LjUxYTIgMiAwIDAgMS0xIDEuNzRsLS4xNS4wOWEyIDIgMCAwIDAtLjczIDIuNzNsLjIyLjM4YTIgMiAwIDAgMC0yLjczLS43M2wtLjE1LjA4YTIgMiAwIDAgMS0yIDBsLS40My0uMjVhMiAyIDAgMCAxLTEtMS43M1Y0YTIgMiAwIDAgMC0yLTJ6Ii8+PGNpcmNsZSBjeD0iMTIiIGN5PSIxMiIgcj0iMyIvPjwvc3ZnPg==",
+            'list' :"data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWxpc3QiPjxwYXRoIGQ9Ik0zIDEyaC4wMSIvPjxwYXRoIGQ9Ik0zIDE4aC4wMSIvPjxwYXRoIGQ9Ik0zIDZoLjAxIi8+PHBhdGggZD0iTTggMTJoMTMiLz48cGF0aCBkPSJNOCAxOGgxMyIvPjxwYXRoIGQ9Ik04IDZoMTMiLz48L3N2Zz4=",#주석리스트
+            'lock' :"data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWxvY2sta2V5aG9sZSI+PGNpcmNsZSBjeD0iMTIiIGN5PSIxNiIgcj0iMSIvPjxyZWN0IHg9IjMiIHk9IjEwIiB3aWR0aD0iMTgiIGhlaWdodD0iMTIiIHJ4PSIyIi8+PHBhdGggZD0iTTcgMTBWN2E1IDUgMCAwIDEgMTAgMHYzIi8+PC9zdmc+",
+            'unlock' :"data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWxvY2sta2V5aG9sZS1vcGVuIj48Y2lyY2xlIGN4PSIxMiIgY3k9IjE2IiByPSIxIi8+PHJlY3Qgd2lkdGg9IjE4IiBoZWlnaHQ9IjEyIiB4PSIzIiB5PSIxMCIgcng9IjIiLz48cGF0aCBkPSJNNyAxMFY3YTUgNSAwIDAgMSA5LjMzLTIuNSIvPjwvc3ZnPg==",
+            'bookmark' :"data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWJvb2ttYXJrIj48cGF0aCBkPSJtMTkgMjEtNy00LTcgNFY1YTIgMiAwIDAgMSAyLTJoMTBhMiAyIDAgMCAxIDIgMnYxNnoiLz48L3N2Zz4=",
             
-        }
-        
+        })
+
     def initUI(self):
         # 전체 레이아웃
         main_layout = QVBoxLayout()
@@ -178,12 +2451,36 @@ class PDFViewer(QMainWindow):
         rotate_cw.setIcon(self.icons['roatate-cc'])
         rotate_cw.triggered.connect(lambda: self.rotatePage(90))
         
+        # 썸네일 사이드바 / 문서 목차 버튼
+        self.thumbnail_action = QAction('', self)
+        self.thumbnail_action.setIcon(self.icons['list'])
+        self.thumbnail_action.setToolTip('페이지 썸네일')
+        self.thumbnail_action.setCheckable(True)
+        self.thumbnail_action.triggered.connect(self.toggleThumbnails)
+        
+        outline_action = QAction('', self)
+        outline_action.setIcon(self.icons['bookmark'])
+        outline_action.setToolTip('목차')
+        outline_action.triggered.connect(self.showOutlineMenu)
+        
         main_toolbar.addAction(file_open)
         main_toolbar.addAction(file_save)
+        main_toolbar.addAction(self.thumbnail_action)
+        main_toolbar.addAction(outline_action)
         main_toolbar.addAction(prev_page)
         main_toolbar.addAction(next_page)
+        # 인쇄 품질(300 DPI) 렌더링 전환 버튼
+        self.quality_action = QAction('', self)
+        self.quality_action.setIcon(self.icons['settings'])
+        self.quality_action.setToolTip('인쇄 품질 (300 DPI) 렌더링')
+        self.quality_action.setCheckable(True)
+        self.quality_action.setChecked(self.render_quality == 'print')
+        self.quality_action.triggered.connect(
+            lambda checked: self.setRenderQuality('print' if checked else 'screen'))
+        
         main_toolbar.addAction(rotate_ccw)
         main_toolbar.addAction(rotate_cw)
+        main_toolbar.addAction(self.quality_action)
 
         # 첫 번째 스페이서 (왼쪽 그룹과 중앙 그룹 사이)
         left_spacer = QWidget()
@@ -242,10 +2539,51 @@ class PDFViewer(QMainWindow):
         main_toolbar.addAction(self.max_button)  # 최대화 버튼 추가
         main_toolbar.addAction(close_button)
 
-        # PDF 표시 영역
-        self.pdf_label = QLabel()
-        self.pdf_label.setAlignment(Qt.AlignCenter)
-        main_layout.addWidget(self.pdf_label)
+        # PDF 표시 영역 (페이지 래스터 레이블 위에 주석 레이어를 겹쳐 배치)
+        self.pdf_label = PageImageLabel()
+        self.annotation_overlay = AnnotationOverlay(self)
+        self.page_container = QWidget()
+        page_stack = QStackedLayout(self.page_container)
+        page_stack.setStackingMode(QStackedLayout.StackAll)
+        page_stack.addWidget(self.pdf_label)
+        page_stack.addWidget(self.annotation_overlay)
+        page_stack.setCurrentWidget(self.annotation_overlay)  # 주석 레이어를 위로
+        # 렌더 계측 HUD (레이아웃 밖에서 페이지 왼쪽 위에 겹쳐 표시)
+        self.trace_hud = QLabel(self.page_container)
+        self.trace_hud.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.trace_hud.setStyleSheet(
+            "QLabel { background-color: rgba(0, 0, 0, 170); color: #7CFC00; "
+            "font-family: monospace; font-size: 11px; padding: 4px; }")
+        self.trace_hud.move(8, 8)
+        self.trace_hud.hide()
+        self.trace_hud_timer = QTimer(self)
+        self.trace_hud_timer.setInterval(500)
+        self.trace_hud_timer.timeout.connect(self._update_trace_hud)
+        
+        # 썸네일 사이드바 (균일한 항목 크기로 보이는 범위만 계산)
+        self.thumbnail_view = QListView()
+        self.thumbnail_view.setModel(self.thumbnail_model)
+        self.thumbnail_view.setUniformItemSizes(True)
+        self.thumbnail_view.setViewMode(QListView.IconMode)
+        self.thumbnail_view.setFlow(QListView.TopToBottom)
+        self.thumbnail_view.setWrapping(False)
+        self.thumbnail_view.setMovement(QListView.Static)
+        self.thumbnail_view.setIconSize(QSize(self.thumbnail_width, self._thumbnail_placeholder.height()))
+        self.thumbnail_view.setGridSize(QSize(self.thumbnail_width + 20, self._thumbnail_placeholder.height() + 30))
+        self.thumbnail_view.setFixedWidth(self.thumbnail_width + 40)
+        self.thumbnail_view.clicked.connect(lambda index: self.goToPage(index.row()))
+        self.thumbnail_view.verticalScrollBar().valueChanged.connect(self._retain_visible_thumbnails)
+        self.thumbnail_view.hide()
+        
+        content_layout = QHBoxLayout()
+        content_layout.setContentsMargins(0, 0, 0, 0)
+        content_layout.setSpacing(0)
+        content_layout.addWidget(self.thumbnail_view)
+        content_layout.addWidget(self.page_container)
+        self.continuous_view = ContinuousPageView(self)
+        self.continuous_view.hide()
+        content_layout.addWidget(self.continuous_view)
+        main_layout.addLayout(content_layout)
         
         # 잠금 버튼
         self.lock_button = QPushButton()
@@ -294,229 +2632,735 @@ class PDFViewer(QMainWindow):
         # 잠금 상태 변수 추가
         self.is_locked = False
 
-    def setTool(self, tool):
-        # 이전에 선택된 도구의 체크 상태 해제
-        if self.selected_tool and self.selected_tool in self.tool_actions:
-            self.tool_actions[self.selected_tool].setChecked(False)
-        
-        # 새로운 도구 선택
-        self.selected_tool = tool
-        if tool in self.tool_actions:
-            self.tool_actions[tool].setChecked(True)
-        self.current_tool = tool
+    def setTool(self, tool):
+        # 이전에 선택된 도구의 체크 상태 해제
+        if self.selected_tool and self.selected_tool in self.tool_actions:
+            self.tool_actions[self.selected_tool].setChecked(False)
+        
+        # 새로운 도구 선택
+        self.selected_tool = tool
+        if tool in self.tool_actions:
+            self.tool_actions[tool].setChecked(True)
+        self.current_tool = tool
+
+    def openfile(self):
+        file_name, _ = QFileDialog.getOpenFileName(
+            self, 
+            "파일 선택", 
+            "", 
+            "PDF files (*.pdf);;Markdown files (*.md);;All files (*.*)"
+        )
+        if file_name:
+            self.loadFile(file_name)
+
+    def _start_backends(self):
+        """처음 PDF 를 열 때 디스크 캐시를 만들고 작업 스레드를 시작 (빈 창은 바로 뜨도록)"""
+        if self._backends_started:
+            return
+        self._backends_started = True
+        if self.disk_cache_mb > 0:
+            try:
+                self.disk_cache = DiskRenderCache(
+                    os.path.join(os.path.expanduser('~'), '.cache', 'pdfview', 'rasters'),
+                    self.disk_cache_mb * 1024 * 1024)
+            except OSError as e:
+                print(f"디스크 캐시를 만들 수 없습니다: {str(e)}")
+        self.render_worker.disk_cache = self.disk_cache  # 썸네일은 메모리 캐시만 사용
+        self.render_worker.start()
+        self.thumbnail_worker.start()
+        self.search_indexer.start()
+        self.document_opener.start()
+
+    def loadFile(self, file_name):
+        """PDF 또는 Markdown 파일을 열어 표시 (대화상자 없이 호출 가능)"""
+        file_extension = file_name.lower().split('.')[-1]
+        
+        if file_extension == 'pdf':
+            self._start_backends()
+            # 여는 동안에는 이전 문서를 그대로 보여주고, 준비되면 _on_document_opened 에서 교체
+            self.open_request += 1
+            if self.opening_file is None:
+                self._title_before_open = self.windowTitle()
+            self.opening_file = file_name
+            self._open_stage = '여는 중'
+            self._open_started = time.perf_counter()
+            self._show_open_progress()
+            self.open_progress_timer.start()
+            self.document_opener.open(self.open_request, file_name)
+        elif file_extension == 'md':
+            self._cancel_open()  # 여는 중이던 PDF 가 나중에 화면을 덮지 않도록
+            try:
+                with open(file_name, 'r', encoding='utf-8') as f:
+                    md_content = f.read()
+                    
+                # markdown 텍스트를 HTML로 변환
+                import markdown
+                html_content = markdown.markdown(md_content)
+                
+                # QTextEdit를 사용하여 HTML 표시
+                text_view = QTextEdit()
+                text_view.setReadOnly(True)
+                text_view.setHtml(html_content)
+                
+                # 스타일시트 적용
+                text_view.setStyleSheet("""
+                    QTextEdit {
+                        background-color: #1a1a1a;
+                        color: #ffffff;
+                        border: none;
+                        padding: 10px;
+                    }
+                """)
+                
+                # 텍스트뷰를 PDF 레이블 대신 표시
+                self.page_container.hide()
+                self.continuous_view.hide()
+                self.continuous_mode = False
+                self.thumbnail_view.hide()
+                self.thumbnail_model.set_page_count(0)
+                layout = self.centralWidget().layout()
+                layout.addWidget(text_view)
+                
+                # PDF 관련 변수 초기화
+                self.pdf_document = None
+                self.current_page = 0
+                
+            except Exception as e:
+                print(f"MD 파일 열기 오류: {str(e)}")
+
+    def _cancel_open(self):
+        if self.opening_file is None:
+            return
+        self.open_request += 1  # 진행 중인 열기의 결과는 버려짐
+        self.open_progress_timer.stop()
+        self.opening_file = None
+        self.setWindowTitle(self._title_before_open)
+
+    def _on_open_progress(self, request, stage):
+        if request == self.open_request:
+            self._open_stage = stage
+            self._show_open_progress()
+
+    def _show_open_progress(self):
+        self.setWindowTitle(f"{os.path.basename(self.opening_file)} {self._open_stage}... "
+                            f"{time.perf_counter() - self._open_started:.0f}초")
+
+    def _on_document_opened(self, request, file_name, document, fingerprint, error):
+        """백그라운드에서 연 문서로 교체하고 첫 페이지 렌더링을 요청"""
+        if request != self.open_request:
+            if document is not None:
+                document.close()
+            return
+        self.open_progress_timer.stop()
+        self.opening_file = None
+        self.setWindowTitle(self._title_before_open)
+        if error:
+            print(f"PDF 열기 오류: {error}")
+            return
+
+        self.pdf_document = document
+        self.page_cache.clear()  # 이전 문서의 래스터 제거
+        self._pending_tile_keys = set()
+        # 이전 문서의 주석과 인덱스 제거
+        self._close_journal()
+        self.annotations.clear()
+        self.document_fingerprint = fingerprint
+        self.saved_annotation_xrefs = {}
+        self._open_journal(file_name, self.document_fingerprint)
+        self.hidden_annotations = set(self.saved_annotation_xrefs.values())
+        self._hidden_annotations_tag = ()
+        if self.hidden_annotations:
+            digest = hashlib.sha1(repr(sorted(self.hidden_annotations)).encode()).hexdigest()[:16]
+            self._hidden_annotations_tag = (('hidden-annots', digest),)
+        self.rotated_pages = {}
+        self.selected_annotation = None
+        self.selected_ids = set()
+        self.pdf_file_name = file_name
+        self.document_generation += 1
+        self.render_worker.open_document(file_name, self.document_generation,
+                                         self.document_fingerprint, self.hidden_annotations)
+        if self.process_pool is not None:
+            self.process_pool.open_document(file_name, self.document_generation,
+                                            self.document_fingerprint, self.hidden_annotations)
+        self.thumbnail_cache.clear()
+        self.thumbnail_worker.open_document(file_name, self.document_generation,
+                                            self.document_fingerprint, self.hidden_annotations)
+        self.thumbnail_model.set_page_count(len(self.pdf_document))
+        # 검색 색인은 문서 해시별로 디스크에 저장된 것이 있으면 재사용
+        self.search_index = SearchIndex()
+        self.search_query = ''
+        self._set_search_hits([], -1)
+        search_cache = None
+        if self.document_fingerprint:
+            search_cache = os.path.join(os.path.expanduser('~'), '.cache', 'pdfview', 'search',
+                                        self.document_fingerprint + '.json.gz')
+        self.search_indexer.open_document(file_name, self.document_generation,
+                                          self.search_index, search_cache)
+        self.current_page = 0
+        if self.continuous_mode:
+            self.continuous_view.set_document(self.pdf_document)
+        self.showPage()
+
+    def _render_options(self):
+        """래스터 결과에 영향을 주는 렌더 옵션 (캐시 키의 일부)
+
+        래스터는 알파가 미리 곱해진 RGBA 로 만들어지므로 (픽셀 필터를 거치면 필터 사양이 더해짐)
+        그 형식을 그대로 키에 넣어, 형식이 다른 예전 메모리/디스크 캐시 항목과 섞이지 않게 한다.
+        주석 레이어로 옮겨 래스터에서 뺀 PDF 주석이 있으면 그 집합의 해시도 넣는다.
+        """
+        return ('rgba', 'premultiplied') + self._hidden_annotations_tag + tuple(self.pixel_filters)
+
+    def setPixelFilter(self, name, enabled, *args):
+        """픽셀 필터를 켜거나 끔 (필터가 바뀐 래스터는 별도 캐시 항목으로 저장됨)"""
+        if np is None:
+            print("픽셀 필터를 사용하려면 numpy 가 필요합니다")
+            return
+        self.pixel_filters = [f for f in self.pixel_filters if f[0] != name]
+        if enabled:
+            self.pixel_filters.append((name,) + args)
+        self.showPage()
+        self.thumbnail_view.viewport().update()  # 썸네일도 새 필터로 다시 요청
+
+    def togglePixelFilter(self, name, *args):
+        enabled = not any(f[0] == name for f in self.pixel_filters)
+        self.setPixelFilter(name, enabled, *args)
+
+    def _display_box(self):
+        """페이지를 맞춰 넣을 화면 영역 크기 (논리 픽셀)"""
+        toolbar = self.findChild(QToolBar)
+        toolbar_height = toolbar.height() if toolbar and toolbar.isVisible() else 0
+        if self.is_maximized and self.pdf_label.width() > 0 and self.pdf_label.height() > 0:
+            return self.pdf_label.width(), self.pdf_label.height()
+        screen_size = QApplication.primaryScreen().availableGeometry()
+        sidebar_width = self.thumbnail_view.width() if self.thumbnail_view.isVisible() else 0
+        return screen_size.width() - sidebar_width, screen_size.height() - toolbar_height
+
+    def _fit_scale(self, page_num):
+        """페이지가 화면 영역에 꼭 맞게 들어가는 배율 (PDF 포인트 -> 논리 픽셀)"""
+        page_rect = self.pdf_document[page_num].rect  # 회전이 반영된 페이지 크기
+        box_width, box_height = self._display_box()
+        return min(box_width / page_rect.width, box_height / page_rect.height)
+
+    def _display_scale(self, page_num):
+        """줌이 반영된 화면 표시 배율 (PDF 포인트 -> 논리 픽셀)"""
+        return self._fit_scale(page_num) * self.zoom_factor
+
+    def _raster_scale(self, page_num):
+        """MuPDF 에 요청할 래스터 배율 (PDF 포인트 -> 장치 픽셀)"""
+        if self.render_quality == 'print':
+            return self.render_dpi / 72
+        # 화면 모드: 표시될 크기 그대로 렌더링해 추가 축소가 필요 없게 함
+        return self._display_scale(page_num) * self.pdf_label.devicePixelRatioF()
+
+    def setRenderQuality(self, quality):
+        """렌더 모드 전환 ('screen' 또는 'print')"""
+        if quality not in ('screen', 'print') or quality == self.render_quality:
+            return
+        self.render_quality = quality
+        if hasattr(self, 'quality_action'):
+            self.quality_action.setChecked(quality == 'print')
+        self.showPage()
+
+    def _page_cache_key(self, page_num, scale=None):
+        """페이지 번호와 현재 배율/회전/옵션으로 캐시 키 생성"""
+        if scale is None:
+            scale = self._raster_scale(page_num)
+        rotation = self.pdf_document[page_num].rotation
+        return PageCache.make_key(page_num, scale, rotation, self._render_options())
+
+    def _raster_size(self, page_num=None):
+        """현재 렌더 상태에서 페이지 래스터의 크기 (장치 픽셀)"""
+        if page_num is None:
+            page_num = self.current_page
+        page_rect = self.pdf_document[page_num].rect
+        scale = self._raster_scale(page_num)
+        return max(1, round(page_rect.width * scale)), max(1, round(page_rect.height * scale))
+
+    def _cached_image(self, key):
+        """메모리 캐시, 없으면 디스크 캐시에서 래스터를 찾음 (디스크에서 찾으면 메모리 캐시에도 넣음)"""
+        image = self.page_cache.get(key)
+        if image is not None:
+            tracer.count('cache_hit_memory')
+            return image
+        if self.disk_cache is not None and self.document_fingerprint:
+            image = self.disk_cache.get(self.document_fingerprint, key)
+            if image is not None:
+                tracer.count('cache_hit_disk')
+                self.page_cache.put(key, image)
+                return image
+        tracer.count('cache_miss')
+        return None
+
+    def _preview_keys(self, key):
+        """최종 래스터보다 먼저 보여줄 저해상도 단계들의 캐시 키 (낮은 배율부터)"""
+        page_num = key[0]
+        screen_scale = self._display_scale(page_num) * self.pdf_label.devicePixelRatioF()
+        scales = [screen_scale * self.preview_fraction]
+        if self.render_quality == 'print':
+            scales.append(screen_scale)  # 인쇄 품질은 화면 배율 단계를 한 번 더 거침
+        best = self.page_cache.best_key(page_num, key[2], key[3])
+        return [self._page_cache_key(page_num, scale) for scale in scales
+                if scale < key[1] and (best is None or best[1] < scale)]
+
+    def _request_page_render(self, key):
+        """현재 페이지 렌더링을 워커에 요청 (다른 페이지의 대기 요청은 취소)
+
+        무거운 페이지도 바로 무언가 보이도록 낮은 배율 단계를 먼저 요청하고, 완성되는 대로
+        더 선명한 단계로 교체한다.
+        """
+        self._pending_display_key = key
+        self._pending_tile_keys = set()
+        previews = self._preview_keys(key)
+        # 아직 유효한 프리페치 요청은 유지하고 나머지 페이지의 요청만 취소
+        self.render_worker.retain({key[0]} | self._prefetch_pages)
+        # 같은 페이지라도 배율이 바뀌어 더 이상 필요 없는 단계는 취소
+        self.render_worker.supersede(key[0], set(previews) | {key})
+        for stage, preview in enumerate(previews):
+            self.render_worker.request(preview, key[0], preview[1], key[2], stage - len(previews),
+                                       persist=False)
+        self.render_worker.request(key, key[0], key[1], key[2])
+
+    def _request_tile_renders(self, tiles):
+        """확대 보기에 보이는 (키, clip) 타일들을 워커에 요청 (보이지 않게 된 타일 요청은 취소)"""
+        self._pending_display_key = None
+        self._pending_tile_keys = {key for key, _ in tiles}
+        self.render_worker.retain({self.current_page} | self._prefetch_pages)
+        self.render_worker.supersede(self.current_page, self._pending_tile_keys)
+        for key, clip in tiles:
+            self.render_worker.request(key, key[0], key[1], key[2], clip=clip)
+
+    def _prefetch(self):
+        """읽는 방향의 다음 페이지들을 낮은 우선순위로 워커에 요청"""
+        if self.pdf_document is None:
+            return
+        raster_width, raster_height = self._raster_size()
+        plan = self.prefetcher.plan(
+            self.current_page, len(self.pdf_document),
+            raster_width * raster_height * 4,
+            self.page_cache.max_bytes * self.prefetcher.budget_fraction)
+        self._prefetch_pages = {page_num for page_num, _ in plan}
+        # 프로세스 풀이 켜져 있으면 프리페치는 여러 코어에 나눠 렌더링
+        backend = self.process_pool if self.process_pool is not None else self.render_worker
+        backend.retain({self.current_page} | self._prefetch_pages)
+        for page_num, priority in plan:
+            key = self._page_cache_key(page_num)
+            if key not in self.page_cache and self._cached_image(key) is None:
+                backend.request(key, page_num, key[1], key[2], priority)
+
+    def setRenderProcesses(self, processes):
+        """다중 프로세스 렌더 백엔드 사용 여부와 프로세스 수 설정 (0이면 끔)"""
+        if self.process_pool is not None:
+            self.process_pool.stop()
+            self.process_pool = None
+        self.render_processes = processes
+        if processes > 0:
+            self.process_pool = ProcessRenderPool(processes, self)
+            self.process_pool.disk_cache = self.disk_cache
+            self.process_pool.imageReady.connect(self._on_image_ready)
+            self.process_pool.thumbnailReady.connect(self._on_thumbnail_ready)
+            if self.pdf_file_name:
+                self.process_pool.open_document(self.pdf_file_name, self.document_generation,
+                                                self.document_fingerprint, self.hidden_annotations)
 
-    def openfile(self):
-        file_name, _ = QFileDialog.getOpenFileName(
-            self, 
-            "파일 선택", 
-            "", 
-            "PDF files (*.pdf);;Markdown files (*.md);;All files (*.*)"
-        )
-        if file_name:
-            file_extension = file_name.lower().split('.')[-1]
-            
-            if file_extension == 'pdf':
-                self.pdf_document = fitz.open(file_name)
-                self.current_page = 0
-                self.showPage()
-            elif file_extension == 'md':
-                try:
-                    with open(file_name, 'r', encoding='utf-8') as f:
-                        md_content = f.read()
-                        
-                    # markdown 텍스트를 HTML로 변환
-                    import markdown
-                    html_content = markdown.markdown(md_content)
-                    
-                    # QTextEdit를 사용하여 HTML 표시
-                    text_view = QTextEdit()
-                    text_view.setReadOnly(True)
-                    text_view.setHtml(html_content)
-                    
-                    # 스타일시트 적용
-                    text_view.setStyleSheet("""
-                        QTextEdit {
-                            background-color: #1a1a1a;
-                            color: #ffffff;
-                            border: none;
-                            padding: 10px;
-                        }
-                    """)
-                    
-                    # 텍스트뷰를 PDF 레이블 대신 표시
-                    self.pdf_label.hide()
-                    layout = self.centralWidget().layout()
-                    layout.addWidget(text_view)
-                    
-                    # PDF 관련 변수 초기화
-                    self.pdf_document = None
-                    self.current_page = 0
-                    
-                except Exception as e:
-                    print(f"MD 파일 열기 오류: {str(e)}")
+    def _placeholder_image(self, page_num, width, height):
+        """렌더링을 기다리는 동안 보여줄 이미지 (같은 페이지의 다른 배율 래스터 또는 빈 종이)"""
+        rotation = self.pdf_document[page_num].rotation
+        image = self.page_cache.find_page(page_num, rotation, self._render_options())
+        if image is None:
+            # 썸네일이 있으면 흐릿하게라도 바로 보여줌
+            image = self.thumbnail_cache.find_page(page_num, rotation, self._render_options())
+        if image is None:
+            image = QImage(width, height, QImage.Format_RGB32)
+            image.fill(Qt.white)
+            return image
+        with tracer.span('placeholder_scale', bytes=width * height * 4):
+            return image.scaled(width, height, Qt.IgnoreAspectRatio, Qt.FastTransformation)
 
-    def preload_pages(self):
-        """백그라운드에서 모든 페이지를 고품질로 미리 렌더링"""
-        from concurrent.futures import ThreadPoolExecutor
-        import threading
-        
-        def render_page(page_num):
-            try:
-                page = self.pdf_document[page_num]
-                # 고품질 렌더링을 위한 매트릭스 설정
-                zoom_matrix = fitz.Matrix(self.zoom_factor * self.render_dpi/72, 
-                                        self.zoom_factor * self.render_dpi/72)
-                
-                # 고품질 렌더링 옵션 설정
-                pix = page.get_pixmap(
-                    matrix=zoom_matrix,
-                    alpha=False,
-                    colorspace=fitz.csRGB
-                )
-                
-                # QImage 변환 시 품질 유지
-                qimage = QImage(pix.samples, pix.width, pix.height,
-                              pix.stride, QImage.Format_RGB888)
-                
-                # 투명도 효과 적용
-                if self.opacity < 1.0:
-                    transparent_image = QImage(pix.width, pix.height, 
-                                            QImage.Format_ARGB32)
-                    for y in range(pix.height):
-                        for x in range(pix.width):
-                            color = qimage.pixelColor(x, y)
-                            if color.red() > 240 and color.green() > 240 and color.blue() > 240:
-                                color.setAlpha(int(self.opacity * 255))
-                            transparent_image.setPixelColor(x, y, color)
-                    qimage = transparent_image
-
-                pixmap = QPixmap.fromImage(qimage)
-                self.page_cache[page_num] = pixmap
-                
-            except Exception as e:
-                print(f"페이지 {page_num} 렌더링 중 오류: {str(e)}")
+    def _thumbnail_key(self, page_num):
+        page = self.pdf_document[page_num]
+        return PageCache.make_key(page_num, self.thumbnail_width / page.rect.width,
+                                  page.rotation, self._render_options())
+
+    def thumbnailImage(self, page_num):
+        """썸네일 이미지 (아직 없으면 백그라운드 렌더링을 요청하고 빈 종이를 반환)"""
+        if self.pdf_document is None:
+            return self._thumbnail_placeholder
+        key = self._thumbnail_key(page_num)
+        image = self.thumbnail_cache.get(key)
+        if image is None:
+            # 프로세스 풀이 켜져 있으면 썸네일도 여러 코어에 나눠 렌더링
+            if self.process_pool is not None:
+                self.process_pool.request_thumbnail(key, page_num, key[1], key[2])
+            else:
+                self.thumbnail_worker.request(key, page_num, key[1], key[2])
+            return self._thumbnail_placeholder
+        return image
+
+    def _on_thumbnail_ready(self, generation, key, image):
+        if generation != self.document_generation or self.pdf_document is None:
+            return
+        self.thumbnail_cache.put(key, image)
+        self.thumbnail_model.page_changed(key[0])
+
+    def _retain_visible_thumbnails(self):
+        """스크롤로 지나간 썸네일 요청은 버리고 보이는 범위만 렌더링"""
+        view = self.thumbnail_view
+        x = view.viewport().width() // 2
+        first = view.indexAt(QPoint(x, 0)).row()
+        last = view.indexAt(QPoint(x, view.viewport().height() - 1)).row()
+        if first < 0:
+            return
+        if last < 0:
+            last = self.thumbnail_model.page_count - 1
+        visible = set(range(first, last + 1))
+        self.thumbnail_worker.retain(visible)
+        if self.process_pool is not None:
+            self.process_pool.retain_thumbnails(visible)
+
+    def _sync_thumbnail_selection(self):
+        if self.thumbnail_view.isVisible():
+            index = self.thumbnail_model.index(self.current_page)
+            self.thumbnail_view.setCurrentIndex(index)
+            self.thumbnail_view.scrollTo(index)
+
+    def toggleThumbnails(self, checked):
+        """썸네일 사이드바 표시 전환"""
+        self.thumbnail_view.setVisible(checked and self.pdf_document is not None)
+        self.thumbnail_action.setChecked(self.thumbnail_view.isVisible())
+        if self.pdf_document is not None:
+            self.showPage()
+
+    def setContinuousMode(self, enabled):
+        """한 페이지 보기와 연속 스크롤 보기 전환 (연속 보기에서는 주석을 표시만 함)"""
+        if self.pdf_document is None or enabled == self.continuous_mode:
+            return
+        self.continuous_mode = enabled
+        self.page_container.setVisible(not enabled)
+        self.continuous_view.setVisible(enabled)
+        if enabled:
+            page_num = self.current_page
+            self._pending_display_key = None
+            self.continuous_view.set_document(self.pdf_document)
+            self.current_page = page_num  # 배치 중 바뀐 현재 페이지를 되돌려 그 페이지로 스크롤
+        self.showPage()
+
+    def goToPage(self, page_num):
+        if self.pdf_document and 0 <= page_num < len(self.pdf_document) and page_num != self.current_page:
+            self.current_page = page_num
+            self.showPage()
+
+    def showOutlineMenu(self):
+        """문서 목차(북마크)를 메뉴로 보여주고 선택한 페이지로 이동"""
+        if self.pdf_document is None:
+            return
+        toc = self.pdf_document.get_toc()
+        if not toc:
+            print("문서에 목차가 없습니다")
+            return
+        menu = QMenu(self)
+        for level, title, page in toc:
+            action = menu.addAction('    ' * (level - 1) + title)
+            action.triggered.connect(lambda checked=False, p=page: self.goToPage(p - 1))
+        menu.exec_(self.mapToGlobal(self.rect().center()))
+
+    def findText(self):
+        """검색어를 입력받아 문서에서 찾기 (색인 중이어도 이미 색인된 페이지에서 바로 찾음)"""
+        query, ok = QInputDialog.getText(self, '찾기', '검색어:', text=self.search_query)
+        if not ok:
+            return
+        self.search_query = query.strip()
+        self._update_search_hits(jump=True)
+
+    def _set_search_hits(self, hits, hit_index):
+        self.search_hits = hits
+        self.search_hit_index = hit_index
+        self.search_page_hits = {}
+        for hit_no, (page_num, _) in enumerate(hits):
+            self.search_page_hits.setdefault(page_num, []).append(hit_no)
+        self.annotation_overlay.update()
+        self.continuous_view.canvas.update()
+
+    def _update_search_hits(self, jump=False):
+        """검색을 다시 실행하고, 보고 있던 결과(없으면 현재 페이지 이후 첫 결과)를 선택"""
+        if not self.search_query:
+            self._set_search_hits([], -1)
+            return
+        previous = None
+        if 0 <= self.search_hit_index < len(self.search_hits):
+            previous = self.search_hits[self.search_hit_index]
+        hits = self.search_index.search(self.search_query)
+        hit_index = -1
+        if previous in hits:
+            hit_index = hits.index(previous)
+        elif hits:
+            hit_index = next((i for i, hit in enumerate(hits) if hit[0] >= self.current_page), 0)
+        self._set_search_hits(hits, hit_index)
+        if jump:
+            total = len(self.pdf_document) if self.pdf_document else 0
+            print(f"'{self.search_query}': {len(hits)}개 (색인 {len(self.search_index)}/{total} 페이지)")
+            if hit_index >= 0:
+                self.goToPage(hits[hit_index][0])
 
-        def preload_worker():
-            with ThreadPoolExecutor(max_workers=2) as executor:  # 작업자 수 제한
-                executor.map(render_page, range(len(self.pdf_document)))
+    def nextSearchHit(self, step=1):
+        """다음(step=1)/이전(step=-1) 검색 결과로 이동"""
+        if not self.search_hits:
+            return
+        self.search_hit_index = (self.search_hit_index + step) % len(self.search_hits)
+        self.goToPage(self.search_hits[self.search_hit_index][0])
+        self.annotation_overlay.update()
+        self.continuous_view.canvas.update()
 
-        # 기존 쓰레드가 실행 중이면 중단
-        if self.preload_thread and self.preload_thread.is_alive():
+    def _on_search_progress(self, generation, indexed, total):
+        if generation != self.document_generation:
             return
+        if self.search_query:
+            self._update_search_hits()
 
-        # 새로운 쓰레드에서 프리로딩 시작
-        self.preload_thread = threading.Thread(target=preload_worker)
-        self.preload_thread.daemon = True
-        self.preload_thread.start()
+    def _on_image_ready(self, generation, key, image):
+        """렌더 워커가 완성한 이미지를 캐시에 넣고, 기다리던 페이지면 선명한 이미지로 교체"""
+        if generation != self.document_generation or self.pdf_document is None:
+            return
+        self.page_cache.put(key, image)
+        if self.continuous_mode:
+            self.continuous_view.image_ready(key, image)
+            return
+        if key in self._pending_tile_keys:
+            self._pending_tile_keys.discard(key)
+            self.tile_timer.start()
+            return
+        pending = self._pending_display_key
+        if key == pending:
+            self._pending_display_key = None
+            self.showPage()
+        elif pending is not None and key[0] == pending[0] and key[2:] == pending[2:] and key[1] < pending[1]:
+            # 중간 단계 결과: 최종 래스터가 올 때까지 더 선명해진 임시 이미지로 교체
+            self.showPage()
 
     def showPage(self):
         if self.pdf_document is None:
             return
         
         try:
-            # 캐시된 페이지가 있는지 확인
-            if self.current_page in self.page_cache:
-                pixmap = self.page_cache[self.current_page]
-            else:
-                # 페이지 새로 렌더링
-                page = self.pdf_document[self.current_page]
-                zoom_matrix = fitz.Matrix(self.zoom_factor * self.render_dpi/72, 
-                                        self.zoom_factor * self.render_dpi/72)
-                
-                pix = page.get_pixmap(
-                    matrix=zoom_matrix,
-                    alpha=False,
-                    colorspace=fitz.csRGB
-                )
-                
-                qimage = QImage(pix.samples, pix.width, pix.height,
-                              pix.stride, QImage.Format_RGB888)
-                pixmap = QPixmap.fromImage(qimage)
-                self.page_cache[self.current_page] = pixmap
-
-            # 고품질 스케일링 적용
-            scaled_pixmap = pixmap.scaled(
-                int(pixmap.width() * self.zoom_factor),
-                int(pixmap.height() * self.zoom_factor),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation  # 부드러운 스케일링 적용
-            )
-
-            # 투명도 적용을 위한 새 QPixmap 생성
-            if self.opacity < 1.0:
-                transparent_pixmap = QPixmap(pixmap.size())
-                transparent_pixmap.fill(Qt.transparent)
-                painter = QPainter(transparent_pixmap)
-                painter.setOpacity(self.opacity)
-                painter.drawPixmap(0, 0, pixmap)
-                painter.end()
-                pixmap = transparent_pixmap
+            with tracer.span('showPage', page=self.current_page):
+                screen = QApplication.primaryScreen()
+                screen_size = screen.availableGeometry()
+                toolbar = self.findChild(QToolBar)
+                toolbar_height = toolbar.height() if toolbar else 0
 
-            # 화면 크기에 맞게 조정
-            screen = QApplication.primaryScreen()
-            screen_size = screen.availableGeometry()
-            toolbar = self.findChild(QToolBar)
-            toolbar_height = toolbar.height() if toolbar else 0
-            
-            scaled_pixmap = pixmap.scaled(
-                screen_size.width(),
-                screen_size.height() - toolbar_height,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-
-            # 주석 그리기
-            if self.current_page in self.annotations:
-                painter = QPainter(scaled_pixmap)
-                scale_factor_x = scaled_pixmap.width() / pixmap.width()
-                scale_factor_y = scaled_pixmap.height() / pixmap.height()
-                
-                for i, ann in enumerate(self.annotations[self.current_page]):
-                    # 선택된 주석은 다른 색으로 표시
-                    if self.selected_annotation and self.selected_annotation[0] == self.current_page and self.selected_annotation[1] == i:
-                        pen = QPen(QColor(255, 255, 0))  # 노란색으로 선택 표시
-                        pen.setWidth(3)
-                    else:
-                        pen = QPen(ann['color'])
-                        pen.setWidth(2)
-                    painter.setPen(pen)
-                    
-                    start = QPointF(ann['start'].x() * scale_factor_x, 
-                              ann['start'].y() * scale_factor_y)
-                    end = QPointF(ann['end'].x() * scale_factor_x, 
-                            ann['end'].y() * scale_factor_y)
-                    
-                    if ann['type'] == '사각형':
-                        painter.drawRect(QRectF(start, end))
-                    elif ann['type'] == '화살표':
-                        painter.drawLine(start, end)
-                    elif ann['type'] == '텍스트':
-                        painter.drawText(start, ann['text'])
-                painter.end()
+                if self.continuous_mode:
+                    # 연속 보기에서는 해당 페이지로 스크롤만 하고 나머지는 보기가 알아서 그림
+                    self.continuous_view.scroll_to_page(self.current_page)
+                    return
+
+                page_rect = self.pdf_document[self.current_page].rect
+                display_scale = self._display_scale(self.current_page)
+                display_width = max(1, round(page_rect.width * display_scale))
+                display_height = max(1, round(page_rect.height * display_scale))
+                box_width, box_height = self._display_box()
+
+                # 페이지가 바뀌면 확대 보기 위치 초기화
+                if self._view_page != self.current_page:
+                    self.view_origin = QPointF(0, 0)
+                    self._view_page = self.current_page
+                self._view_zoom = self.zoom_factor
+
+                # 확대되어 페이지가 화면 영역을 넘으면 보이는 영역만 타일로 렌더링
+                if display_width > box_width or display_height > box_height:
+                    self._show_tiled_view(display_scale)
+                    return
+                self.view_origin = QPointF(0, 0)
 
-            # PDF를 레이블에 표시
-            self.pdf_label.setPixmap(scaled_pixmap)
-            self.pdf_label.setMinimumSize(scaled_pixmap.width(), scaled_pixmap.height())
+                # 이동 방향/속도를 기록하고, 화면 갱신이 끝난 뒤 다음 페이지들을 미리 렌더링
+                self.prefetcher.note_page(self.current_page)
+                self.search_indexer.set_center(self.current_page)
+                self._sync_thumbnail_selection()
+                self.prefetch_timer.start()
+
+                # 캐시된 페이지가 있으면 사용하고, 없으면 워커에 렌더링을 맡기고 임시 이미지를 먼저 표시
+                key = self._page_cache_key(self.current_page)
+                image = self._cached_image(key)
+                if image is None:
+                    self._request_page_render(key)
+                    raster_width, raster_height = self._raster_size()
+                    image = self._placeholder_image(self.current_page, raster_width, raster_height)
+                dpr = self.pdf_label.devicePixelRatioF()
+                if self.render_quality == 'print':
+                    # 인쇄 품질 모드: 300 DPI 래스터를 표시 크기로 한 번만 축소
+                    # 입력이 이어지는 동안은 빠른 축소로 보여주고, 멈추면 부드러운 축소로 다시 그림
+                    if self.interactive_pass:
+                        self._needs_quality_pass = True
+                    with tracer.span('print_scale', bytes=round(display_width * dpr) * round(display_height * dpr) * 4):
+                        image = image.scaled(
+                            round(display_width * dpr),
+                            round(display_height * dpr),
+                            Qt.KeepAspectRatio,
+                            Qt.FastTransformation if self.interactive_pass else Qt.SmoothTransformation
+                        )
+                # 화면 모드: 래스터가 이미 표시 크기이므로 추가 축소 없이 사용
+                # 투명도는 창 전체의 setWindowOpacity 로만 적용하므로 래스터를 다시 합성하지 않음
+                # PDF를 레이블에 표시 (주석은 위 레이어에서 따로 그림)
+                with tracer.span('set_image'):
+                    self.pdf_label.setImage(image, dpr)
+                    self.pdf_label.setMinimumSize(display_width, display_height)
+                    self.annotation_overlay.update()
             
-            # 창 크기 및 위치 조정
-            if not self.is_maximized:
-                window_width = scaled_pixmap.width()
-                window_height = scaled_pixmap.height() + toolbar_height
-                if self.pdf_label.pixmap() is None:
-                    x = (screen_size.width() - window_width) // 2
-                    y = (screen_size.height() - window_height) // 2
-                    self.setGeometry(x, y, window_width, window_height)
-                else:
-                    current_geometry = self.geometry()  # 현재 창 위치 저장
-                    self.resize(window_width, window_height)
-                    self.move(current_geometry.x(), current_geometry.y())
+                # 창 크기 및 위치 조정
+                if not self.is_maximized:
+                    with tracer.span('window_resize'):
+                        window_width = display_width
+                        if self.thumbnail_view.isVisible():
+                            window_width += self.thumbnail_view.width()
+                        window_height = display_height + toolbar_height
+                        if self.pdf_label.image() is None:
+                            x = (screen_size.width() - window_width) // 2
+                            y = (screen_size.height() - window_height) // 2
+                            self.setGeometry(x, y, window_width, window_height)
+                        else:
+                            current_geometry = self.geometry()  # 현재 창 위치 저장
+                            self.resize(window_width, window_height)
+                            self.move(current_geometry.x(), current_geometry.y())
             
-            if self.is_maximized:
-                self.showMaximized()
+                if self.is_maximized:
+                    self.showMaximized()
 
         except Exception as e:
             print(f"페이지 표시 중 오류 발생: {str(e)}")
 
+    def _view_layout(self, display_scale):
+        """확대 보기의 페이지 크기, 보이는 영역 크기, 레이블 내 여백 계산 (논리 픽셀)"""
+        page_rect = self.pdf_document[self.current_page].rect
+        page_width = page_rect.width * display_scale
+        page_height = page_rect.height * display_scale
+        label_width = self.pdf_label.width()
+        label_height = self.pdf_label.height()
+        if label_width <= 1 or label_height <= 1:
+            label_width, label_height = self._display_box()
+        view_width = min(page_width, label_width)
+        view_height = min(page_height, label_height)
+        offset_x = (label_width - view_width) / 2  # QLabel 가운데 정렬로 생기는 여백
+        offset_y = (label_height - view_height) / 2
+        return page_width, page_height, view_width, view_height, offset_x, offset_y
+
+    def _show_tiled_view(self, display_scale):
+        """현재 레이블 크기만큼의 보이는 영역을 타일로 렌더링해 표시 (창 크기는 유지)"""
+        page = self.pdf_document[self.current_page]
+        dpr = self.pdf_label.devicePixelRatioF()
+        page_width, page_height, view_width, view_height, _, _ = self._view_layout(display_scale)
+
+        # 보기 원점이 페이지 밖으로 나가지 않도록 제한
+        origin_x = min(max(0.0, self.view_origin.x()), page_width - view_width)
+        origin_y = min(max(0.0, self.view_origin.y()), page_height - view_height)
+        self.view_origin = QPointF(origin_x, origin_y)
+
+        # 재사용하는 합성 버퍼에 타일을 한 번에 그림 (투명도는 창 단위로 적용)
+        image = self.scratch_buffers.get(max(1, int(view_width * dpr)), max(1, int(view_height * dpr)))
+        image.setDevicePixelRatio(1.0)
+        source = None
+        if self.interactive_pass:
+            source = self.page_cache.find_page(self.current_page, page.rotation, self._render_options())
+        if source is not None:
+            # 확대/축소 제스처 중에는 이미 있는 전체 페이지 래스터를 늘려 바로 보여주고,
+            # 입력이 멈추면 선명한 타일로 다시 그림
+            with tracer.span('zoom_preview', page=self.current_page):
+                ratio_x = source.width() / (page_width * dpr)
+                ratio_y = source.height() / (page_height * dpr)
+                image.fill(Qt.transparent)
+                painter = QPainter(image)
+                painter.drawImage(QRectF(0, 0, image.width(), image.height()), source,
+                                  QRectF(origin_x * dpr * ratio_x, origin_y * dpr * ratio_y,
+                                         image.width() * ratio_x, image.height() * ratio_y))
+                painter.end()
+            self._needs_quality_pass = True
+        else:
+            # 캐시된 타일만 합성하고, 없는 타일은 워커에 맡긴 채 다른 배율 래스터로 채워 둠
+            options = self._render_options()
+            fallback = self.page_cache.find_page(self.current_page, page.rotation, options)
+            if fallback is None:
+                fallback = self.thumbnail_cache.find_page(self.current_page, page.rotation, options)
+            with tracer.span('tile_compose', page=self.current_page):
+                missing = self.tile_renderer.compose(
+                    self.current_page, page.rect, page.rotation, display_scale * dpr, options,
+                    origin_x * dpr, origin_y * dpr, image, fallback)
+            self._request_tile_renders(missing)
+        self.pdf_label.setImage(image, dpr)
+        self.annotation_overlay.update()
+
+    def _annotation_transform(self):
+        """주석 좌표(회전 전 PDF 페이지 좌표) -> 레이블 좌표 변환 행렬
+
+        페이지 회전, 화면 배율, 뷰 위치를 하나의 행렬로 합쳐 모든 주석에 한꺼번에 적용한다.
+        """
+        display_scale = self._display_scale(self.current_page)
+        _, _, _, _, offset_x, offset_y = self._view_layout(display_scale)
+        page = self.pdf_document[self.current_page]
+        m = page.rotation_matrix * fitz.Matrix(display_scale, display_scale)
+        return QTransform(m.a, m.b, m.c, m.d,
+                          m.e + offset_x - self.view_origin.x(),
+                          m.f + offset_y - self.view_origin.y())
+
+    def _label_to_annotation(self, pos):
+        """레이블 좌표를 주석 좌표로 변환"""
+        inverse, _ = self._annotation_transform().inverted()
+        return inverse.map(QPointF(pos))
+
+    def _hit_tolerance(self):
+        """화면상 4픽셀에 해당하는 페이지 좌표 거리"""
+        return 4 / self._display_scale(self.current_page)
+
+    def paintAnnotations(self, painter):
+        """현재 페이지의 주석과 선택 표시, 그리는 중인 주석 미리보기를 그림 (주석 레이어 전용)"""
+        if self.pdf_document is None or self.continuous_mode:
+            return
+        self.paintPageAnnotations(painter, self.current_page, self._annotation_transform(), True)
+
+    def paintPageAnnotations(self, painter, page_num, transform, interactive=False):
+        """한 페이지의 검색 결과와 주석을 transform 으로 옮겨 그림 (interactive 면 선택/미리보기 포함)"""
+        painter.setTransform(transform)
+        painter.setFont(AnnotationStore.font())
+        items = list(self.annotations.page(page_num))
+        selected = set()
+        if interactive:
+            if self.drawing and self.preview_annotation is not None:
+                items.append(self.preview_annotation)
+            selected = set(self.selected_ids)
+            if self.selected_annotation is not None and self.selected_annotation[0] == page_num:
+                selected.add(self.selected_annotation[1])
+
+        # 검색 결과 강조 (현재 결과는 주황색)
+        for hit_no in self.search_page_hits.get(page_num, ()):
+            color = QColor(255, 140, 0, 140) if hit_no == self.search_hit_index else QColor(255, 255, 0, 90)
+            for x0, y0, x1, y1 in self.search_hits[hit_no][1]:
+                painter.fillRect(QRectF(x0, y0, x1 - x0, y1 - y0), color)
+
+        for ann in items:
+            # 선택된 주석은 다른 색으로 표시
+            if ann.id is not None and ann.id in selected:
+                pen = QPen(QColor(255, 255, 0))  # 노란색으로 선택 표시
+                pen.setWidth(3)
+            else:
+                pen = QPen(ann.qcolor())
+                pen.setWidth(2)
+            pen.setCosmetic(True)  # 줌과 관계없이 화면상 두께 유지
+            painter.setPen(pen)
+
+            if ann.kind == AnnotationType.RECT:
+                painter.drawRect(QRectF(QPointF(ann.x0, ann.y0), QPointF(ann.x1, ann.y1)))
+            elif ann.kind == AnnotationType.ARROW:
+                painter.drawLine(QPointF(ann.x0, ann.y0), QPointF(ann.x1, ann.y1))
+            elif ann.kind == AnnotationType.TEXT:
+                painter.drawText(QPointF(ann.x0, ann.y0), ann.text)
+
+        # 러버 밴드/올가미 선택 영역
+        if interactive and self.selection_path:
+            pen = QPen(QColor(255, 255, 0))
+            pen.setStyle(Qt.DashLine)
+            pen.setCosmetic(True)
+            painter.setPen(pen)
+            if self.selection_lasso:
+                painter.drawPolygon(QPolygonF(self.selection_path))
+            elif len(self.selection_path) > 1:
+                painter.drawRect(QRectF(self.selection_path[0], self.selection_path[-1]))
+
     def prevPage(self):
         if self.pdf_document and self.current_page > 0:
             self.current_page -= 1
@@ -548,16 +3392,13 @@ class PDFViewer(QMainWindow):
         else:
             if self.pdf_document:
                 delta = event.angleDelta().y()
-                if delta > 0 and self.current_page > 0:
-                    self.prevPage()
-                elif delta < 0 and self.current_page < len(self.pdf_document) - 1:
-                    self.nextPage()
+                if delta:
+                    self.input_scheduler.scroll_wheel(delta)
 
     def wheelEvent_zoom(self, event):
-        # 현재 레이블과 픽맵의 크기 가져오기
+        # 현재 레이블의 크기 가져오기
         label_rect = self.pdf_label.rect()
-        current_pixmap = self.pdf_label.pixmap()
-        if not current_pixmap:
+        if self.pdf_label.image() is None:
             return
 
         # 마우스 위치를 레이블 좌표계로 변환
@@ -575,193 +3416,36 @@ class PDFViewer(QMainWindow):
             rel_x = 0.5
             rel_y = 0.5
 
-        # 확대/축소 계산
+        # 확대/축소는 프레임마다 모아서 한 번에 반영
         delta = event.angleDelta().y()
-        zoom_change = 1.2 if delta > 0 else 0.8
-        new_zoom = max(0.1, min(5.0, self.zoom_factor * zoom_change))
-
-        if new_zoom != self.zoom_factor:
-            self.zoom_factor = new_zoom
-            
-            # 캐시된 원본 이미지 사용
-            if self.current_page in self.page_cache:
-                self._update_zoomed_page(rel_x, rel_y, event.pos())
-            else:
-                self.showPage()
+        self.input_scheduler.zoom(1.2 if delta > 0 else 0.8, rel_x, rel_y)
 
     def wheelEvent_opacity(self, event):
         delta = event.angleDelta().y()
-        old_opacity = self.opacity
-        
-        if delta > 0:
-            self.opacity = min(1.0, self.opacity + 0.1)
-        else:
-            self.opacity = max(0.1, self.opacity - 0.1)
-        
-        if old_opacity != self.opacity:
-            # 창 자체의 투명도 설정
-            self.setWindowOpacity(self.opacity)
-            
-            # 현재 표시된 pixmap 가져오기
-            current_pixmap = self.pdf_label.pixmap()
-            if current_pixmap:
-                # 현재 pixmap의 크기를 그대로 유지하면서 투명도만 적용
-                transparent_pixmap = QPixmap(current_pixmap.size())
-                transparent_pixmap.fill(Qt.transparent)
-                
-                painter = QPainter(transparent_pixmap)
-                painter.setOpacity(1.0)  # PDF 내용은 완전 불투명하게 유지
-                painter.drawPixmap(0, 0, current_pixmap)
-                
-                # 주석 다시 그리기 (현재 크기 유지)
-                if self.current_page in self.annotations:
-                    for ann in self.annotations[self.current_page]:
-                        pen = QPen(ann['color'])
-                        pen.setWidth(2)
-                        painter.setPen(pen)
-                        
-                        # 현재 표시된 크기 기준으로 주석 위치 계산
-                        scale_factor_x = current_pixmap.width() / self.page_cache[self.current_page].width()
-                        scale_factor_y = current_pixmap.height() / self.page_cache[self.current_page].height()
-                        
-                        start = QPointF(ann['start'].x() * scale_factor_x,
-                                      ann['start'].y() * scale_factor_y)
-                        end = QPointF(ann['end'].x() * scale_factor_x,
-                                    ann['end'].y() * scale_factor_y)
-                        
-                        if ann['type'] == '사각형':
-                            painter.drawRect(QRectF(start, end))
-                        elif ann['type'] == '화살표':
-                            painter.drawLine(start, end)
-                        elif ann['type'] == '텍스트':
-                            painter.drawText(start, ann['text'])
-                
-                painter.end()
-                
-                # 현재 크기 그대로 pixmap 설정
-                self.pdf_label.setPixmap(transparent_pixmap)
-
-    def _update_zoomed_page(self, rel_x, rel_y, mouse_pos):
-        original_pixmap = self.page_cache[self.current_page]
-        
-        # 새로운 크기 계산
-        new_width = int(original_pixmap.width() * self.zoom_factor)
-        new_height = int(original_pixmap.height() * self.zoom_factor)
-        
-        # 스케일 조정
-        scaled_pixmap = original_pixmap.scaled(
-            new_width,
-            new_height,
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        )
-
-        # 투명도 적용
-        if self.opacity < 1.0:
-            transparent_pixmap = QPixmap(scaled_pixmap.size())
-            transparent_pixmap.fill(Qt.transparent)
-            painter = QPainter(transparent_pixmap)
-            painter.setOpacity(self.opacity)
-            painter.drawPixmap(0, 0, scaled_pixmap)
-            painter.end()
-            scaled_pixmap = transparent_pixmap
+        # 투명도 변화도 프레임마다 모아서 한 번에 반영
+        self.input_scheduler.change_opacity(0.1 if delta > 0 else -0.1)
 
-        # 주석 다시 그리기
-        if self.current_page in self.annotations:
-            painter = QPainter(scaled_pixmap)
-            for ann in self.annotations[self.current_page]:
-                pen = QPen(ann['color'])
-                pen.setWidth(2)
-                painter.setPen(pen)
-                
-                start = QPointF(ann['start'].x() * self.zoom_factor,
-                              ann['start'].y() * self.zoom_factor)
-                end = QPointF(ann['end'].x() * self.zoom_factor,
-                           ann['end'].y() * self.zoom_factor)
-                
-                if ann['type'] == '사각형':
-                    painter.drawRect(QRectF(start, end))
-                elif ann['type'] == '화살표':
-                    painter.drawLine(start, end)
-                elif ann['type'] == '텍스트':
-                    painter.drawText(start, ann['text'])
-            painter.end()
+    def _update_zoomed_page(self, rel_x, rel_y):
+        """마우스 아래의 PDF 지점을 고정한 채 새 줌 배율로 다시 표시"""
+        label_width = self.pdf_label.width()
+        label_height = self.pdf_label.height()
+        anchor_x = rel_x * label_width
+        anchor_y = rel_y * label_height
 
-        # 새로운 스크롤 위치 계산
-        scroll_area = self.pdf_label.parent()
-        if isinstance(scroll_area, QScrollArea):
-            # 새로운 스크롤 위치 계산
-            new_x = int(rel_x * scaled_pixmap.width() - mouse_pos.x())
-            new_y = int(rel_y * scaled_pixmap.height() - mouse_pos.y())
-            
-            # 스크롤바 이동
-            scroll_area.horizontalScrollBar().setValue(new_x)
-            scroll_area.verticalScrollBar().setValue(new_y)
-
-        self.pdf_label.setPixmap(scaled_pixmap)
+        # 이전 줌 상태에서 앵커 아래에 있던 PDF 좌표 계산
+        fit_scale = self._fit_scale(self.current_page)
+        old_scale = fit_scale * self._view_zoom
+        _, _, _, _, old_offset_x, old_offset_y = self._view_layout(old_scale)
+        page_x = (self.view_origin.x() + anchor_x - old_offset_x) / old_scale
+        page_y = (self.view_origin.y() + anchor_y - old_offset_y) / old_scale
 
-    def updatePageWithOpacity(self, original_pixmap):
-        """투명도만 업데이트하여 페이지를 빠르게 다시 그리는 메서드"""
-        if not original_pixmap:
-            return
-        
-        # 화면 크기에 맞게 조정
-        screen = QApplication.primaryScreen()
-        screen_size = screen.availableGeometry()
-        toolbar = self.findChild(QToolBar)
-        toolbar_height = toolbar.height() if toolbar else 0
-        
-        # 원본 비율 유지하면서 화면에 맞게 스케일링
-        scaled_pixmap = original_pixmap.scaled(
-            screen_size.width(),
-            screen_size.height() - toolbar_height,
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        )
-        
-        # 현재 줌 팩터 적용
-        scaled_pixmap = scaled_pixmap.scaled(
-            int(scaled_pixmap.width() * self.zoom_factor),
-            int(scaled_pixmap.height() * self.zoom_factor),
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        )
-        
-        if self.opacity < 1.0:
-            # 투명도 적용을 위한 새 QPixmap 생성
-            transparent_pixmap = QPixmap(scaled_pixmap.size())
-            transparent_pixmap.fill(Qt.transparent)
-            painter = QPainter(transparent_pixmap)
-            painter.setOpacity(self.opacity)
-            painter.drawPixmap(0, 0, scaled_pixmap)
-            painter.end()
-            scaled_pixmap = transparent_pixmap
-        
-        # 주석 다시 그리기
-        if self.current_page in self.annotations:
-            painter = QPainter(scaled_pixmap)
-            scale_factor_x = scaled_pixmap.width() / original_pixmap.width()
-            scale_factor_y = scaled_pixmap.height() / original_pixmap.height()
-            
-            for ann in self.annotations[self.current_page]:
-                pen = QPen(ann['color'])
-                pen.setWidth(2)
-                painter.setPen(pen)
-                
-                start = QPointF(ann['start'].x() * scale_factor_x,
-                              ann['start'].y() * scale_factor_y)
-                end = QPointF(ann['end'].x() * scale_factor_x,
-                           ann['end'].y() * scale_factor_y)
-                
-                if ann['type'] == '사각형':
-                    painter.drawRect(QRectF(start, end))
-                elif ann['type'] == '화살표':
-                    painter.drawLine(start, end)
-                elif ann['type'] == '텍스트':
-                    painter.drawText(start, ann['text'])
-            painter.end()
-        
-        self.pdf_label.setPixmap(scaled_pixmap)
+        # 새 줌 상태에서 같은 PDF 좌표가 앵커 아래에 오도록 보기 원점 이동
+        new_scale = fit_scale * self.zoom_factor
+        _, _, _, _, new_offset_x, new_offset_y = self._view_layout(new_scale)
+        self.view_origin = QPointF(page_x * new_scale - (anchor_x - new_offset_x),
+                                   page_y * new_scale - (anchor_y - new_offset_y))
+        self._view_page = self.current_page
+        self.showPage()
 
     def mousePressEvent(self, event):
         if self.is_locked:
@@ -769,31 +3453,31 @@ class PDFViewer(QMainWindow):
             super().mousePressEvent(event)
             return
         if event.button() == Qt.LeftButton:
-            if self.current_tool == '선택' and self.current_page in self.annotations:
-                # 클릭한 위치의 상대 좌표 계산
-                click_pos = self.pdf_label.mapFrom(self, event.pos())
-                scale_factor_x = self.pdf_label.pixmap().width() / self.page_cache[self.current_page].width()
-                scale_factor_y = self.pdf_label.pixmap().height() / self.page_cache[self.current_page].height()
+            if self.current_tool == '선택' and self.current_page in self.annotations and not self.continuous_mode:
+                # 클릭한 위치를 주석 좌표로 변환
+                click_pos = self._label_to_annotation(self.pdf_label.mapFrom(self, event.pos()))
+                self.selected_ids = set()
                 
-                # 주석 선택 검사
-                for i, ann in enumerate(self.annotations[self.current_page]):
-                    start = QPointF(ann['start'].x() * scale_factor_x, ann['start'].y() * scale_factor_y)
-                    end = QPointF(ann['end'].x() * scale_factor_x, ann['end'].y() * scale_factor_y)
-                    
-                    # 주석 영역 계산
-                    rect = QRectF(min(start.x(), end.x()), min(start.y(), end.y()),
-                                abs(end.x() - start.x()), abs(end.y() - start.y()))
-                    
-                    if rect.contains(click_pos):
-                        self.selected_annotation = (self.current_page, i)
-                        self.is_selecting = True
-                        self.showPage()  # 선택 표시를 위해 페이지 다시 그리기
-                        return
+                # 공간 인덱스로 클릭 위치 주변의 주석만 검사 (화면상 4픽셀 허용 오차)
+                index = self.annotations.index(self.current_page)
+                hits = index.hit_test(click_pos.x(), click_pos.y(), self._hit_tolerance()) if index else []
+                if hits:
+                    self.selected_annotation = (self.current_page, hits[0])
+                    self.is_selecting = True
+                    self.annotation_overlay.update()  # 선택 표시는 주석 레이어만 다시 그림
+                    return
                 
-                # 빈 공간 클릭 시 선택 해제
+                # 빈 공간 클릭 시 선택 해제 후 러버 밴드(Shift: 올가미) 선택 시작
                 self.selected_annotation = None
                 self.is_selecting = False
-                self.showPage()
+                self.selection_path = [click_pos]
+                self.selection_lasso = event.modifiers() == Qt.ShiftModifier
+                self.annotation_overlay.update()
+            elif self.current_tool in ('사각형', '화살표', '텍스트') and self.pdf_document and not self.continuous_mode:
+                # 주석 그리기 시작
+                self.drawing = True
+                self.start_pos = self._label_to_annotation(self.pdf_label.mapFrom(self, event.pos()))
+                self.preview_annotation = None
             else:
                 self.drag_pos = event.globalPos() - self.frameGeometry().topLeft()
             event.accept()
@@ -803,33 +3487,59 @@ class PDFViewer(QMainWindow):
             # 관통 기능 활성화
             super().mouseReleaseEvent(event)
             return
+        if event.button() == Qt.LeftButton and self.selection_path is not None:
+            # 러버 밴드/올가미 안에 완전히 들어온 주석을 선택
+            index = self.annotations.index(self.current_page)
+            points = [(p.x(), p.y()) for p in self.selection_path]
+            if index and len(points) > 1:
+                if self.selection_lasso:
+                    self.selected_ids = index.query_polygon(points)
+                else:
+                    self.selected_ids = index.query_rect(*points[0], *points[-1])
+            self.selection_path = None
+            self.annotation_overlay.update()
+            return
         if event.button() == Qt.LeftButton and self.drawing:
             self.drawing = False
-            end_pos = event.pos()
+            self.preview_annotation = None
+            end_pos = self._label_to_annotation(self.pdf_label.mapFrom(self, event.pos()))
             
-            tool = self.tool_combo.currentText()
-            if tool != '선택':
-                annotation = {
-                    'type': tool,
-                    'start': self.start_pos,
-                    'end': end_pos,
-                    'color': self.current_color,
-                    'text': ''
-                }
-
-                if tool == '텍스트':
+            kind = ANNOTATION_TOOLS.get(self.current_tool)
+            if kind is not None:
+                text = ''
+                if kind == AnnotationType.TEXT:
                     text, ok = QInputDialog.getText(self, '텍스트 입력', '내용:')
-                    if ok:
-                        annotation['text'] = text
+                    if not ok:
+                        text = ''
 
-                if self.current_page not in self.annotations:
-                    self.annotations[self.current_page] = []
-                self.annotations[self.current_page].append(annotation)
-                self.showPage()
+                self.annotations.create(self.current_page, kind,
+                                        self.start_pos.x(), self.start_pos.y(),
+                                        end_pos.x(), end_pos.y(),
+                                        self.current_color.rgba(), text)
+            self.annotation_overlay.update()
 
     def mouseMoveEvent(self, event):
         if self.is_locked:
             return
+        if self.selection_path is not None:
+            pos = self._label_to_annotation(self.pdf_label.mapFrom(self, event.pos()))
+            if self.selection_lasso:
+                self.selection_path.append(pos)
+            else:
+                self.selection_path = [self.selection_path[0], pos]
+            self.annotation_overlay.update()
+            event.accept()
+            return
+        if self.drawing:
+            # 그리는 중인 주석은 주석 레이어에서만 미리보기
+            end_pos = self._label_to_annotation(self.pdf_label.mapFrom(self, event.pos()))
+            self.preview_annotation = Annotation(None, ANNOTATION_TOOLS[self.current_tool],
+                                                 self.start_pos.x(), self.start_pos.y(),
+                                                 end_pos.x(), end_pos.y(),
+                                                 self.current_color.rgba())
+            self.annotation_overlay.update()
+            event.accept()
+            return
         if not self.is_maximized and event.buttons() == Qt.LeftButton:  # 최대화 상태가 아닐 때만 이동 가능
             self.move(event.globalPos() - self.drag_pos)
             event.accept()
@@ -849,34 +3559,87 @@ class PDFViewer(QMainWindow):
     def savePDF(self):
         if self.pdf_document is None:
             return
+        if self.save_worker is not None and self.save_worker.isRunning():
+            print("이전 저장이 아직 진행 중입니다")
+            return
         
-        file_name, _ = QFileDialog.getSaveFileName(self, "PDF 저장", "", "PDF files (*.pdf)")
+        file_name, _ = QFileDialog.getSaveFileName(self, "PDF 저장", self.pdf_file_name or "", "PDF files (*.pdf)")
         if file_name:
+            self.saveTo(file_name)
+
+    def saveTo(self, file_name):
+        """주석과 회전을 file_name 에 백그라운드로 저장 (대화상자 없이 호출 가능)"""
+        if self.pdf_document is None:
+            return
+        if self.save_worker is not None and self.save_worker.isRunning():
+            print("이전 저장이 아직 진행 중입니다")
+            return
+        # 저장 스레드는 원본 파일을 따로 열고, 주석은 지금 시점의 사본을 넘김
+        target = os.path.abspath(file_name)
+        snapshot = [(page_num, ann.copy()) for page_num, ann in self.annotations]
+        # 원본 파일에 다시 저장할 때만 이전에 써 넣은 주석을 교체 대상으로 넘김
+        same_file = target == os.path.abspath(self.pdf_file_name)
+        stale_xrefs = dict(self.saved_annotation_xrefs) if same_file else {}
+        self.save_worker = SaveWorker(self.pdf_file_name, target, snapshot,
+                                      dict(self.rotated_pages), stale_xrefs, self)
+        self.save_worker.progress.connect(self._on_save_progress)
+        self.save_worker.saved.connect(self._on_saved)
+        self._title_before_save = self.windowTitle()
+        self.save_worker.start()
+
+    def _open_journal(self, file_name, fingerprint):
+        """문서 해시로 주석 저널을 열고, 이전 세션에서 남은 주석을 복원"""
+        if not fingerprint:
+            return
+        try:
+            journal = AnnotationJournal(AnnotationJournal.path_for(file_name, fingerprint))
+            for page_num, ann in journal.replay():
+                self.annotations.add(page_num, ann)
+            # 이전 세션에서 PDF 에 저장한 주석은 다음 저장 때 교체/삭제되도록 xref 를 이어받음
+            self.saved_annotation_xrefs = AnnotationJournal.saved_xrefs_of(journal.state)
+            if self.saved_annotation_xrefs:
+                self.annotations.next_id = max(self.annotations.next_id, max(self.saved_annotation_xrefs) + 1)
+            self.annotations.journal = journal
+        except Exception as e:
+            print(f"주석 저널 열기 오류: {str(e)}")
+
+    def _close_journal(self):
+        if self.annotations.journal is not None:
+            self.annotations.journal.close()
+            self.annotations.journal = None
+
+    def _on_save_progress(self, done, total):
+        self.setWindowTitle(f"PDF 저장 중... {done * 100 // total}%")
+
+    def _on_saved(self, file_name, written, error):
+        self.setWindowTitle(self._title_before_save)
+        if error:
+            print(f"PDF 저장 중 오류 발생: {error}")
+            return
+        if file_name == os.path.abspath(self.pdf_file_name):
+            self.saved_annotation_xrefs = written
+            # 이후에 (다시) 여는 렌더 핸들은 방금 써 넣은 주석도 래스터에서 빼야 함
+            self.hidden_annotations |= set(written.values())
+            # 파일 해시가 바뀌었으므로 새 해시로 저널을 다시 시작한다. 저장 스냅숏 이후의 편집과
+            # 저장된 주석의 이후 변경을 잃지 않도록, 현재 주석 전체와 저장된 xref 로 채워 둠
+            live = set()
+            records = []
+            for page_num, ann in self.annotations:
+                live.add(ann.id)
+                records.append(AnnotationJournal.encode('add', page_num, ann,
+                                                        written.get(ann.id, (None, None))[1]))
+            records.extend({'op': 'stale', 'page': page_num, 'id': ann_id, 'xref': xref}
+                           for ann_id, (page_num, xref) in written.items() if ann_id not in live)
             try:
-                # 현재 주석이 있는 페이지들만 처리
-                for page_num in self.annotations.keys():
-                    page = self.pdf_document[page_num]
-                    
-                    # 페이지의 모든 주석을 처리
-                    for ann in self.annotations[page_num]:
-                        if ann['type'] == '사각형':
-                            page.draw_rect([ann['start'].x(), ann['start'].y(), 
-                                          ann['end'].x(), ann['end'].y()],
-                                         color=ann['color'].getRgb()[:3])
-                        elif ann['type'] == '화살표':
-                            page.draw_line([ann['start'].x(), ann['start'].y(), 
-                                          ann['end'].x(), ann['end'].y()],
-                                         color=ann['color'].getRgb()[:3])
-                        elif ann['type'] == '텍스트':
-                            page.insert_text([ann['start'].x(), ann['start'].y()],
-                                           ann['text'],
-                                           color=ann['color'].getRgb()[:3])
-                
-                # 변경된 PDF 저장
-                self.pdf_document.save(file_name)
-                
-            except Exception as e:
-                print(f"PDF 저장 중 오류 발생: {str(e)}")
+                journal = AnnotationJournal(
+                    AnnotationJournal.path_for(file_name, document_fingerprint(file_name)))
+            except OSError as e:
+                print(f"주석 저널 열기 오류: {str(e)}")
+                return  # 이전 저널을 그대로 유지
+            journal.reset(records)
+            if self.annotations.journal is not None:
+                self.annotations.journal.discard()
+            self.annotations.journal = journal
 
     def toggleMaximized(self):
         if self.is_maximized:
@@ -890,6 +3653,60 @@ class PDFViewer(QMainWindow):
             self.max_button.setIcon(self.icons['window-small'])  # 아이콘 변경
             self.setMouseTracking(False)  # 마우스 추적 비활성화
 
+    def setTracing(self, enabled):
+        """렌더 계측 켜기/끄기 (켤 때 이전 기록은 지움)"""
+        if enabled and not tracer.enabled:
+            tracer.reset()
+        tracer.enabled = enabled
+        print(f"렌더 계측 {'시작' if enabled else '중지'}")
+
+    def toggleTraceHud(self):
+        if self.trace_hud.isVisible():
+            self.trace_hud_timer.stop()
+            self.trace_hud.hide()
+            return
+        if not tracer.enabled:
+            self.setTracing(True)
+        self._update_trace_hud()
+        self.trace_hud.show()
+        self.trace_hud.raise_()
+        self.trace_hud_timer.start()
+
+    def _update_trace_hud(self):
+        self.trace_hud.setText('\n'.join(tracer.summary_lines()))
+        self.trace_hud.adjustSize()
+
+    def exportTrace(self, file_name=None):
+        """기록한 계측을 Chrome trace-event JSON 으로 저장 (파일 이름이 없으면 대화상자)"""
+        if file_name is None:
+            file_name, _ = QFileDialog.getSaveFileName(self, "계측 내보내기", "pdfview-trace.json",
+                                                       "Trace files (*.json)")
+        if not file_name:
+            return
+        try:
+            tracer.export_chrome_trace(file_name)
+            print(f"계측 저장: {file_name} (이벤트 {len(tracer.events)}개)")
+        except OSError as e:
+            print(f"계측 저장 중 오류: {str(e)}")
+
+    def closeEvent(self, event):
+        # 렌더 워커 스레드를 정리한 뒤 종료
+        self.render_worker.stop()
+        self.thumbnail_worker.stop()
+        self.search_indexer.stop()
+        self.document_opener.stop()
+        if self.process_pool is not None:
+            self.process_pool.stop()
+        if self.disk_cache is not None:
+            self.disk_cache.close()  # 쓰기를 기다리는 래스터를 마저 저장
+        if self.save_worker is not None:
+            self.save_worker.wait()  # 진행 중인 저장은 끝까지 마침
+        self._close_journal()  # 남은 저널 기록을 디스크에 씀
+        trace_path = os.environ.get('PDFVIEW_TRACE', '')
+        if tracer.enabled and trace_path.lower().endswith('.json'):
+            self.exportTrace(trace_path)
+        super().closeEvent(event)
+
     def rotatePage(self, angle):
         """PDF 페이지를 회전시키는 메서드"""
         if self.pdf_document is None:
@@ -907,6 +3724,12 @@ class PDFViewer(QMainWindow):
             
             # 페이지 회전 적용
             page.set_rotation(new_rotation)
+            self.rotated_pages[self.current_page] = new_rotation
+            
+            # 이전 회전 상태의 래스터는 더 이상 쓰이지 않으므로 캐시에서 제거
+            self.page_cache.invalidate(self.current_page)
+            self.thumbnail_cache.invalidate(self.current_page)
+            self.thumbnail_model.page_changed(self.current_page)
             
             # 화면 업데이트
             self.showPage()
@@ -927,6 +3750,14 @@ class PDFViewer(QMainWindow):
                 self.savePDF()
             elif event.key() == Qt.Key_O:  # Ctrl + O
                 self.openfile()
+            elif event.key() == Qt.Key_D:  # Ctrl + D: 다크 모드 (색상 반전)
+                self.togglePixelFilter('invert')
+            elif event.key() == Qt.Key_E:  # Ctrl + E: 세피아
+                self.togglePixelFilter('sepia')
+            elif event.key() == Qt.Key_T:  # Ctrl + T: 종이 투명화
+                self.togglePixelFilter('paper_alpha', 240, int(self.opacity * 255) if self.opacity < 1.0 else 128)
+            elif event.key() == Qt.Key_F:  # Ctrl + F: 찾기
+                self.findText()
             
         # Ctrl + Shift + 단축키 처리
         elif event.modifiers() == (Qt.ControlModifier | Qt.ShiftModifier):
@@ -934,44 +3765,63 @@ class PDFViewer(QMainWindow):
                 self.rotatePage(90)
             elif event.key() == Qt.Key_Minus:  # Ctrl + Shift + -
                 self.rotatePage(-90)
+            elif event.key() == Qt.Key_M:  # Ctrl + Shift + M: 다중 프로세스 렌더링 전환
+                self.setRenderProcesses(0 if self.process_pool else (os.cpu_count() or 1))
+            elif event.key() == Qt.Key_C:  # Ctrl + Shift + C: 연속 스크롤 보기 전환
+                self.setContinuousMode(not self.continuous_mode)
+            elif event.key() == Qt.Key_T:  # Ctrl + Shift + T: 렌더 계측 켜기/끄기
+                self.setTracing(not tracer.enabled)
+            elif event.key() == Qt.Key_H:  # Ctrl + Shift + H: 계측 HUD
+                self.toggleTraceHud()
+            elif event.key() == Qt.Key_E:  # Ctrl + Shift + E: 계측을 trace JSON 으로 내보내기
+                self.exportTrace()
             
         # 페이지 이동 키 처리
+        # (키를 누르고 있어도 프레임마다 한 번만 다시 그림)
         elif event.key() in [Qt.Key_Right, Qt.Key_Down, Qt.Key_PageDown]:
-            if self.current_page < len(self.pdf_document) - 1:
-                self.current_page += 1
-                self.showPage()
+            self.input_scheduler.navigate_pages(1)
             
         elif event.key() in [Qt.Key_Left, Qt.Key_Up, Qt.Key_PageUp]:
-            if self.current_page > 0:
-                self.current_page -= 1
-                self.showPage()
+            self.input_scheduler.navigate_pages(-1)
+        
+        # F3 / Shift + F3: 다음/이전 검색 결과
+        elif event.key() == Qt.Key_F3:
+            self.nextSearchHit(-1 if event.modifiers() == Qt.ShiftModifier else 1)
             
+        # Delete 키로 러버 밴드/올가미로 선택한 주석들 삭제
+        if event.key() == Qt.Key_Delete and self.selected_ids:
+            self.annotations.remove(self.current_page, self.selected_ids)
+            self.selected_ids = set()
+            self.selected_annotation = None
+            self.annotation_overlay.update()
+
         # Delete 키로 선택된 주석 삭제
-        if event.key() == Qt.Key_Delete and self.selected_annotation:
-            page_num, ann_idx = self.selected_annotation
-            if page_num in self.annotations and 0 <= ann_idx < len(self.annotations[page_num]):
-                del self.annotations[page_num][ann_idx]
-                self.selected_annotation = None
-                self.showPage()
+        elif event.key() == Qt.Key_Delete and self.selected_annotation:
+            page_num, ann_id = self.selected_annotation
+            self.annotations.remove(page_num, [ann_id])
+            self.selected_annotation = None
+            self.annotation_overlay.update()
         
         # Enter 키로 선택된 주석 편집
         elif event.key() == Qt.Key_Return and self.selected_annotation:
-            page_num, ann_idx = self.selected_annotation
-            if page_num in self.annotations and 0 <= ann_idx < len(self.annotations[page_num]):
-                ann = self.annotations[page_num][ann_idx]
-                if ann['type'] == '텍스트':
+            page_num, ann_id = self.selected_annotation
+            ann = self.annotations.get(page_num, ann_id)
+            if ann is not None:
+                if ann.kind == AnnotationType.TEXT:
                     text, ok = QInputDialog.getText(self, '텍스트 편집', '내용:', 
-                                                  text=ann['text'])
+                                                  text=ann.text)
                     if ok:
-                        ann['text'] = text
-                        self.showPage()
+                        ann.text = text
+                        self.annotations.update(page_num, ann)  # 텍스트 길이가 바뀌면 경계 상자도 갱신
+                        self.annotation_overlay.update()
                 
                 # 색상 변경 (Ctrl+Enter)
                 if event.modifiers() == Qt.ControlModifier:
-                    color = QColorDialog.getColor(ann['color'])
+                    color = QColorDialog.getColor(ann.qcolor())
                     if color.isValid():
-                        ann['color'] = color
-                        self.showPage()
+                        ann.color = color.rgba()
+                        self.annotations.update(page_num, ann)
+                        self.annotation_overlay.update()
         
         event.accept()
 
@@ -1029,11 +3879,492 @@ class PDFViewer(QMainWindow):
         self.show()
         self.move(current_pos)
 
+
+# ---------------------------------------------------------------------------
+# 헤드리스 일괄 처리 (python pdfview5.0.py render|flatten|text ...)
+# ---------------------------------------------------------------------------
+
+BATCH_COMMANDS = ('render', 'flatten', 'text')
+BATCH_CHUNK_PAGES = 8  # 작업 프로세스에 한 번에 넘기는 페이지 수
+
+_batch_document = None  # 작업 프로세스마다 연 fitz 문서
+_batch_options = None
+
+
+def parse_page_range(spec, page_count):
+    """'1-3,7,10-' 형식(1부터 시작)을 0부터 시작하는 페이지 번호 목록으로 변환 (없으면 전체)"""
+    if not spec:
+        return list(range(page_count))
+    pages = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-', 1)
+            first = int(first) if first else 1
+            last = int(last) if last else page_count
+        else:
+            first = last = int(part)
+        if first < 1 or last > page_count or first > last:
+            raise ValueError(f"잘못된 페이지 범위: {part} (문서는 {page_count} 페이지)")
+        pages.extend(range(first - 1, last))
+    return pages
+
+
+def _batch_init(file_name, options):
+    global _batch_document, _batch_options
+    _batch_document = fitz.open(file_name)
+    _batch_options = options
+
+
+def _batch_render_pages(page_nums):
+    """작업 프로세스에서 실행: 페이지들을 PNG 또는 원시 래스터 파일로 저장하고 처리한 페이지 수 반환"""
+    options = _batch_options
+    for page_num in page_nums:
+        page = _batch_document[page_num]
+        if options['rotation'] is not None:
+            page.set_rotation(options['rotation'])
+        pix = rasterize_page(page, options['scale'])
+        filters = options['filters']
+        if filters and np is not None:
+            data = apply_pixel_filters(pix, filters)
+            image_format = QImage.Format_RGBA8888
+        else:
+            data = pix.samples_mv
+            image_format = QImage.Format_RGBA8888_Premultiplied
+        path = os.path.join(options['output'], f"{options['prefix']}-{page_num + 1:04d}.{options['format']}")
+        if options['format'] == 'png':
+            if filters and np is not None:
+                pix = fitz.Pixmap(fitz.csRGB, pix.width, pix.height, data.tobytes(), True)
+            pix.save(path)
+        else:
+            # 디스크 캐시와 같은 헤더(PVR1)를 붙인 원시 픽셀
+            with open(path, 'wb') as f:
+                f.write(DiskRenderCache.HEADER.pack(DiskRenderCache.MAGIC, pix.width, pix.height,
+                                                    pix.stride, int(image_format)))
+                f.write(memoryview(data).cast('B'))
+    return len(page_nums)
+
+
+def _batch_text_pages(page_nums):
+    """작업 프로세스에서 실행: [(페이지, 텍스트), ...] 반환"""
+    return [(page_num, _batch_document[page_num].get_text()) for page_num in page_nums]
+
+
+def _batch_flatten_file(source, target, journal_path):
+    """작업 프로세스에서 실행: 저널의 주석을 써 넣고 페이지 내용으로 굳혀 저장, 처리한 페이지 수 반환"""
+    if journal_path is None:
+        journal_path = AnnotationJournal.path_for(source, document_fingerprint(source))
+    state, _ = AnnotationJournal.read(journal_path)
+    doc = fitz.open(source)
+    try:
+        # 이미 PDF 에 저장된 주석은 저널의 최신 내용으로 다시 쓰므로 먼저 지움
+        for page_num, xref in AnnotationJournal.saved_xrefs_of(state).values():
+            if 0 <= page_num < doc.page_count:
+                page = doc[page_num]
+                annot = page.load_annot(xref)
+                if annot is not None:
+                    page.delete_annot(annot)
+        for page_num, ann in AnnotationJournal.annotations_of(state):
+            if 0 <= page_num < doc.page_count:
+                write_pdf_annotation(doc[page_num], ann)
+        if hasattr(doc, 'bake'):
+            doc.bake(annots=True, widgets=False)  # 주석을 페이지 내용으로 변환
+        else:
+            print(f"이 PyMuPDF 는 bake() 를 지원하지 않아 주석 객체로 저장합니다: {target}")
+        doc.save(target, garbage=3, deflate=True)
+        return doc.page_count
+    finally:
+        doc.close()
+
+
+def _run_page_jobs(file_name, options, task, page_nums, workers):
+    """페이지를 묶음으로 나눠 작업 프로세스에 분배하고 결과를 순서대로 반환"""
+    from concurrent.futures import ProcessPoolExecutor
+    chunks = [page_nums[i:i + BATCH_CHUNK_PAGES] for i in range(0, len(page_nums), BATCH_CHUNK_PAGES)]
+    if workers <= 1 or len(chunks) <= 1:
+        _batch_init(file_name, options)
+        return [task(chunk) for chunk in chunks]
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_batch_init,
+                             initargs=(file_name, options)) as executor:
+        return list(executor.map(task, chunks))
+
+
+def _report_throughput(label, pages, started):
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    print(f"{label}: {pages} 페이지, {elapsed:.2f} 초, {pages / elapsed:.1f} pages/s")
+
+
+def batch_main(argv):
+    """디스플레이 없이 렌더링/주석 굳히기/텍스트 추출을 여러 프로세스로 수행하는 명령행 모드"""
+    import argparse
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('inputs', nargs='+', help='PDF 파일')
+    common.add_argument('-o', '--output', default='.', help='출력 폴더')
+    common.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='작업 프로세스 수 (기본: CPU 수)')
+    parser = argparse.ArgumentParser(prog='pdfview5.0.py', description='PDF 일괄 처리 (GUI 없이 실행)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    render = commands.add_parser('render', parents=[common], help='페이지를 PNG 또는 원시 래스터로 저장')
+    render.add_argument('-p', '--pages', help="페이지 범위 (예: '1-3,7,10-')")
+    render.add_argument('-s', '--scale', type=float, default=2.0, help='배율 (1.0 = 72 DPI)')
+    render.add_argument('-r', '--rotation', type=int, choices=(0, 90, 180, 270), help='회전 각도')
+    render.add_argument('-f', '--format', choices=('png', 'raw'), default='png',
+                        help='raw 는 디스크 캐시와 같은 헤더의 원시 RGBA')
+    render.add_argument('--filter', action='append', choices=sorted(PIXEL_FILTERS), default=[],
+                        help='픽셀 필터 (여러 번 지정 가능, numpy 필요)')
+
+    flatten = commands.add_parser('flatten', parents=[common], help='저장된 주석을 써 넣고 페이지 내용으로 굳힘')
+    flatten.add_argument('-a', '--annotations', help='주석 저널 파일 (기본: PDF 옆의 저널, 입력이 하나일 때만)')
+
+    text = commands.add_parser('text', parents=[common], help='텍스트 추출')
+    text.add_argument('-p', '--pages', help="페이지 범위 (예: '1-3,7,10-')")
+
+    args = parser.parse_args(argv)
+    if args.command == 'flatten' and args.annotations and len(args.inputs) > 1:
+        parser.error('--annotations 는 입력 파일이 하나일 때만 쓸 수 있습니다')
+    if args.command == 'render' and args.filter and np is None:
+        print("numpy 가 없어 픽셀 필터를 적용하지 않습니다")
+    os.makedirs(args.output, exist_ok=True)
+
+    started = time.perf_counter()
+    total_pages = 0
+    failed = False
+
+    if args.command == 'flatten':
+        from concurrent.futures import ProcessPoolExecutor
+        jobs = []
+        for source in args.inputs:
+            target = os.path.join(args.output, os.path.splitext(os.path.basename(source))[0] + '.flat.pdf')
+            jobs.append((source, target, args.annotations))
+        with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(jobs)))) as executor:
+            futures = [(job, executor.submit(_batch_flatten_file, *job)) for job in jobs]
+            for (source, target, _), future in futures:
+                try:
+                    pages = future.result()
+                except Exception as e:
+                    print(f"주석 굳히기 중 오류 ({source}): {str(e)}")
+                    failed = True
+                    continue
+                total_pages += pages
+                print(f"{source} -> {target}")
+        _report_throughput('flatten', total_pages, started)
+        return 1 if failed else 0
+
+    for source in args.inputs:
+        file_started = time.perf_counter()
+        prefix = os.path.splitext(os.path.basename(source))[0]
+        try:
+            with fitz.open(source) as doc:
+                page_nums = parse_page_range(args.pages, doc.page_count)
+            if args.command == 'render':
+                options = {'output': args.output, 'prefix': prefix, 'scale': args.scale,
+                           'rotation': args.rotation, 'format': args.format,
+                           'filters': tuple((name,) for name in args.filter)}
+                _run_page_jobs(source, options, _batch_render_pages, page_nums, args.workers)
+            else:
+                results = _run_page_jobs(source, {}, _batch_text_pages, page_nums, args.workers)
+                target = os.path.join(args.output, prefix + '.txt')
+                with open(target, 'w', encoding='utf-8') as f:
+                    # 페이지 사이는 폼 피드로 구분 (pdftotext 와 같은 방식)
+                    f.write('\f'.join(text for chunk in results for _, text in chunk))
+        except Exception as e:
+            print(f"{args.command} 처리 중 오류 ({source}): {str(e)}")
+            failed = True
+            continue
+        total_pages += len(page_nums)
+        _report_throughput(f"{args.command} {source}", len(page_nums), file_started)
+
+    if len(args.inputs) > 1:
+        _report_throughput(args.command, total_pages, started)
+    return 1 if failed else 0
+
+
+# ---------------------------------------------------------------------------
+# 성능 벤치마크 (python pdfview5.0.py bench ...)
+# ---------------------------------------------------------------------------
+
+BENCH_KINDS = ('text', 'vector', 'image')
+BENCH_PAGE_COUNTS = (1, 100, 5000)
+BENCH_ZOOM_STEPS = (1.5, 2.0, 3.0, 2.0, 1.0)
+
+
+def make_synthetic_pdf(path, kind, pages, seed=0):
+    """재현 가능한 합성 PDF 생성 (같은 인자면 같은 내용)
+
+    text: 작은 글씨로 빽빽한 본문, vector: 페이지마다 수백 개의 베지어 곡선,
+    image: 미리 만든 패턴 이미지 여러 장을 격자로 배치
+    """
+    import random
+    rng = random.Random(f'{kind}-{pages}-{seed}')
+    doc = fitz.open()
+    image_xrefs = []
+    images = []
+    if kind == 'image':
+        size = 256
+        for n in range(8):
+            samples = bytearray(size * size * 3)
+            for y in range(size):
+                row = bytes(((x * (n + 3)) ^ (y * (n + 5))) & 255 for x in range(size))
+                samples[y * size * 3:(y + 1) * size * 3] = bytes(v for v in row for _ in range(3))
+            images.append(fitz.Pixmap(fitz.csRGB, size, size, bytes(samples), False).tobytes('png'))
+    for _ in range(pages):
+        page = doc.new_page(width=595, height=842)
+        if kind == 'text':
+            words = (''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 10)))
+                     for _ in range(700))
+            page.insert_textbox(fitz.Rect(36, 36, 559, 806), ' '.join(words), fontsize=8)
+        elif kind == 'vector':
+            shape = page.new_shape()
+            for _ in range(400):
+                points = [fitz.Point(rng.uniform(0, 595), rng.uniform(0, 842)) for _ in range(4)]
+                shape.draw_bezier(*points)
+                shape.finish(color=(rng.random(), rng.random(), rng.random()), width=rng.uniform(0.2, 2.0))
+            shape.commit()
+        else:
+            for row in range(4):
+                for col in range(3):
+                    rect = fitz.Rect(36 + col * 178, 36 + row * 195, 200 + col * 178, 220 + row * 195)
+                    n = rng.randrange(len(images))
+                    if len(image_xrefs) < len(images):
+                        n = len(image_xrefs)
+                        image_xrefs.append(page.insert_image(rect, stream=images[n]))
+                    else:
+                        page.insert_image(rect, xref=image_xrefs[n])
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+
+
+def _bench_summary(samples):
+    """샘플(ms) 목록을 {'median', 'p95', 'n'} 로 요약 (샘플이 없으면 None)"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    middle = len(ordered) // 2
+    median = ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+    p95 = ordered[min(len(ordered) - 1, math.ceil(len(ordered) * 0.95) - 1)]
+    return {'median': round(median, 3), 'p95': round(p95, 3), 'n': len(ordered)}
+
+
+def _peak_rss_mb():
+    import sys
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 는 KB, macOS 는 바이트 단위
+    return usage / (1024 * 1024) if sys.platform == 'darwin' else usage / 1024
+
+
+def _wait_until(app, predicate, timeout=30.0):
+    """이벤트를 처리하며 predicate 가 참이 될 때까지 대기 (시간 초과면 False)"""
+    from PyQt5.QtCore import QEventLoop
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            return False
+        app.processEvents(QEventLoop.AllEvents, 5)
+    return True
+
+
+def _bench_document(app, path, flips):
+    """문서 하나에 대해 새 뷰어를 띄워 각 지표의 샘플(ms)을 측정"""
+    import tempfile
+    from PyQt5.QtGui import QWheelEvent
+
+    viewer = PDFViewer()
+    # 이전 실행이 남긴 디스크 캐시를 쓰면 첫 표시가 '차가운' 상태가 아니므로 끔
+    viewer.disk_cache_mb = 0
+    # 프리페처가 다음 페이지를 미리 그려 두면 '처음 보는 페이지' 넘김이 캐시 적중이 되므로
+    # 처음 보는 페이지를 다 넘길 때까지 프리페치 타이머를 막음
+    viewer.prefetch_timer.blockSignals(True)
+    viewer.show()
+    app.processEvents()
+    displayed = lambda: viewer._pending_display_key is None and not viewer._pending_tile_keys
+
+    def wait(predicate, what, timeout=30.0):
+        # 시간 초과로 끝난 샘플은 실제보다 짧게 기록되므로 측정 실패로 처리
+        if not _wait_until(app, predicate, timeout):
+            raise TimeoutError(f"{what} 대기 시간 초과 ({timeout:.0f}초)")
+
+    samples = {}
+    try:
+        started = time.perf_counter()
+        viewer.loadFile(path)
+        wait(lambda: viewer.opening_file is None and displayed(), '문서 열기', timeout=300.0)
+        samples['open_ms'] = [(time.perf_counter() - started) * 1000]
+
+        # 처음 보는 페이지로 넘김 (최종 래스터가 표시될 때까지) 후 같은 페이지들로 되돌아감
+        page_count = len(viewer.pdf_document)
+        steps = min(flips, page_count - 1)
+        for name, flip in (('flip_cold_ms', viewer.nextPage), ('flip_warm_ms', viewer.prevPage)):
+            samples[name] = []
+            for _ in range(steps):
+                started = time.perf_counter()
+                flip()
+                wait(displayed, '페이지 넘김')
+                samples[name].append((time.perf_counter() - started) * 1000)
+            viewer.prefetch_timer.blockSignals(False)
+
+        samples['zoom_ms'] = []
+        for zoom in BENCH_ZOOM_STEPS:
+            started = time.perf_counter()
+            viewer.zoom_factor = zoom
+            viewer._update_zoomed_page(0.5, 0.5)
+            wait(displayed, f'{zoom}배 확대')
+            samples['zoom_ms'].append((time.perf_counter() - started) * 1000)
+
+        # 휠 입력 처리부터 setWindowOpacity 까지 (합성은 창 관리자가 하므로 오프스크린에서는 잴 수 없음)
+        samples['opacity_input_ms'] = []
+        for delta in (-120,) * 5 + (120,) * 5:
+            event = QWheelEvent(QPointF(10, 10), QPointF(10, 10), QPoint(0, 0), QPoint(0, delta),
+                                Qt.NoButton, Qt.ShiftModifier, Qt.NoScrollPhase, False)
+            started = time.perf_counter()
+            viewer.wheelEvent_opacity(event)
+            # 입력은 다음 프레임에 반영되므로 모아 둔 변화를 바로 적용
+            viewer.input_scheduler.flush()
+            app.processEvents()
+            samples['opacity_input_ms'].append((time.perf_counter() - started) * 1000)
+
+        # 앞쪽 페이지마다 주석 몇 개를 넣고 새 파일로 저장
+        for page_num in range(min(page_count, 10)):
+            for n in range(5):
+                viewer.annotations.create(page_num, AnnotationType.RECT, 50 + n * 20, 50 + n * 20,
+                                          150 + n * 20, 120 + n * 20, 0xFFFF0000, '')
+        with tempfile.TemporaryDirectory() as folder:
+            started = time.perf_counter()
+            viewer.saveTo(os.path.join(folder, 'saved.pdf'))
+            wait(lambda: not viewer.save_worker.isRunning(), '저장', timeout=300.0)
+            samples['save_ms'] = [(time.perf_counter() - started) * 1000]
+    finally:
+        viewer.annotations.clear()
+        viewer._close_journal()
+        journal = viewer.document_fingerprint and AnnotationJournal.path_for(path, viewer.document_fingerprint)
+        viewer.close()
+        viewer.deleteLater()
+        app.processEvents()
+        if journal and os.path.exists(journal):
+            os.remove(journal)
+    return samples
+
+
+def compare_benchmarks(results, baseline, tolerance):
+    """중앙값을 기준 결과와 비교해 [(문서, 지표, 기준, 현재, 변화율), ...] 과 회귀 여부 반환"""
+    rows = []
+    regressed = False
+    for corpus, metrics in sorted(results['corpora'].items()):
+        base_metrics = baseline.get('corpora', {}).get(corpus, {})
+        for metric, summary in sorted(metrics.items()):
+            base = base_metrics.get(metric)
+            if not summary or not base or not base['median']:
+                continue
+            change = summary['median'] / base['median'] - 1
+            rows.append((corpus, metric, base['median'], summary['median'], change))
+            if change > tolerance:
+                regressed = True
+    return rows, regressed
+
+
+def bench_main(argv):
+    """오프스크린 Qt 에서 합성 문서로 뷰어의 주요 동작 시간을 재고 기준 결과와 비교"""
+    import argparse
+    import platform
+    from PyQt5.QtCore import QT_VERSION_STR
+    parser = argparse.ArgumentParser(prog='pdfview5.0.py bench', description='성능 벤치마크 (GUI 없이 실행)')
+    parser.add_argument('--kinds', default=','.join(BENCH_KINDS), help='문서 종류 (text,vector,image)')
+    parser.add_argument('--pages', default=','.join(map(str, BENCH_PAGE_COUNTS)), help='페이지 수 목록')
+    parser.add_argument('--flips', type=int, default=20, help='문서마다 넘겨 볼 페이지 수')
+    parser.add_argument('--corpus', default=os.path.join(os.path.expanduser('~'), '.cache', 'pdfview', 'bench'),
+                        help='합성 문서를 만들어 둘 폴더 (다음 실행에 재사용)')
+    parser.add_argument('-o', '--output', default='bench-results.json', help='결과 JSON 파일')
+    parser.add_argument('--baseline', help='비교할 기준 결과 JSON 파일')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='회귀로 볼 중앙값 증가 비율')
+    args = parser.parse_args(argv)
+
+    kinds = [kind for kind in args.kinds.split(',') if kind]
+    unknown = set(kinds) - set(BENCH_KINDS)
+    if unknown:
+        parser.error(f"알 수 없는 문서 종류: {', '.join(sorted(unknown))}")
+    page_counts = [int(count) for count in args.pages.split(',') if count]
+
+    app = QApplication.instance() or QApplication(['pdfview5.0.py'])
+    os.makedirs(args.corpus, exist_ok=True)
+    results = {
+        'meta': {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'pymupdf': fitz.VersionBind,
+            'qt': QT_VERSION_STR,
+            'qpa': app.platformName(),
+            'cpus': os.cpu_count(),
+            'flips': args.flips,
+        },
+        'corpora': {},
+        'failed': {},  # 측정에 실패한 문서 -> 오류 메시지
+    }
+    # 최대 RSS 는 프로세스 전체에서 단조 증가하므로 작은 문서부터 측정
+    for pages in sorted(page_counts):
+        for kind in kinds:
+            name = f'{kind}-{pages}'
+            path = os.path.join(args.corpus, name + '.pdf')
+            if not os.path.exists(path):
+                print(f"합성 문서 생성: {path}")
+                make_synthetic_pdf(path + '.tmp', kind, pages)
+                os.replace(path + '.tmp', path)
+            print(f"측정: {name}")
+            try:
+                samples = _bench_document(app, path, args.flips)
+            except TimeoutError as e:
+                print(f"  측정 실패: {str(e)}")
+                results['failed'][name] = str(e)
+                continue
+            metrics = {metric: _bench_summary(values) for metric, values in samples.items()}
+            rss = _peak_rss_mb()
+            metrics['peak_rss_mb'] = None if rss is None else {'median': round(rss, 1), 'p95': round(rss, 1), 'n': 1}
+            results['corpora'][name] = metrics
+            for metric, summary in sorted(metrics.items()):
+                if summary:
+                    print(f"  {metric:<14}{summary['median']:10.2f}  (p95 {summary['p95']:.2f}, n={summary['n']})")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"결과 저장: {args.output}")
+    failed = 1 if results['failed'] else 0
+
+    if not args.baseline:
+        return failed
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    rows, regressed = compare_benchmarks(results, baseline, args.tolerance)
+    print(f"기준 결과와 비교: {args.baseline}")
+    for corpus, metric, old, new, change in rows:
+        flag = '  <-- 회귀' if change > args.tolerance else ''
+        print(f"  {corpus:<14}{metric:<14}{old:10.2f} -> {new:10.2f}  {change * 100:+6.1f}%{flag}")
+    return 1 if regressed or failed else 0
+
+
 if __name__ == '__main__':
     import sys
+    if sys.argv[1:2] and sys.argv[1] in BATCH_COMMANDS:
+        sys.exit(batch_main(sys.argv[1:]))
     from PyQt5.QtWidgets import QApplication
+    if sys.argv[1:2] == ['bench']:
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')  # 디스플레이 없이 실행
+        sys.exit(bench_main(sys.argv[2:]))
     
+    startup_profile.mark('모듈 import')
     app = QApplication(sys.argv)
+    startup_profile.mark('QApplication 생성')
     viewer = PDFViewer()
     viewer.show()
+    startup_profile.mark('창 표시')
+    if '--startup-report' in sys.argv:
+        def report_startup():
+            startup_profile.mark('첫 이벤트 루프')
+            startup_profile.report()
+        QTimer.singleShot(0, report_startup)
     sys.exit(app.exec_())
@@ -0,0 +1,58 @@
+import importlib.util
+import os
+
+import pytest
+
+pytest.importorskip('PyQt5')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='session')
+def pdfview():
+    """pdfview5.0.py 모듈 (파일 이름에 점이 있어 import 문 대신 경로로 불러옴)"""
+    spec = importlib.util.spec_from_file_location('pdfview', os.path.join(ROOT, 'pdfview5.0.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='session')
+def qapp(pdfview):
+    """오프스크린 QApplication (모듈은 시작 시간을 위해 QApplication 을 __main__ 에서만 불러옴)"""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    pdfview.QApplication = QApplication
+    return QApplication.instance() or QApplication(['pdfview'])
+
+
+@pytest.fixture
+def pdf_path(tmp_path, monkeypatch):
+    fitz = pytest.importorskip('fitz')
+    # 디스크 캐시와 검색 색인이 사용자 캐시 폴더 대신 임시 폴더에 쓰이도록 함
+    monkeypatch.setenv('HOME', str(tmp_path))
+    path = str(tmp_path / 'doc.pdf')
+    document = fitz.open()
+    document.new_page(width=200, height=200)
+    document.save(path)
+    return path
+
+
+@pytest.fixture
+def open_viewer(pdfview, qapp):
+    viewers = []
+
+    def open_viewer(path):
+        viewer = pdfview.PDFViewer()
+        viewers.append(viewer)
+        viewer.show()
+        viewer.loadFile(path)
+        assert pdfview._wait_until(qapp, lambda: viewer.opening_file is None
+                                   and viewer._pending_display_key is None)
+        return viewer
+
+    yield open_viewer
+    for viewer in viewers:
+        viewer.close()
+        viewer.deleteLater()
+    qapp.processEvents()
@@ -0,0 +1,52 @@
+def make_index(pdfview):
+    index = pdfview.AnnotationIndex(cell_size=64.0)
+    index.insert(1, 'rect', (10, 10, 50, 40))
+    index.insert(2, 'line', (100, 100, 300, 100))
+    index.insert(3, 'rect', (30, 20, 200, 180))  # 여러 칸에 걸친 큰 사각형
+    return index
+
+
+def test_hit_test_returns_topmost_first(pdfview):
+    index = make_index(pdfview)
+    assert index.hit_test(35, 30) == [3, 1]
+    assert index.hit_test(5, 5) == []
+
+
+def test_hit_test_tolerance_and_reversed_corners(pdfview):
+    index = pdfview.AnnotationIndex()
+    index.insert(7, 'rect', (50, 50, 10, 10))  # 끝점이 시작점보다 위/왼쪽인 사각형
+    assert index.hit_test(30, 30) == [7]
+    assert index.hit_test(53, 30) == []
+    assert index.hit_test(53, 30, tolerance=4) == [7]
+
+
+def test_line_hit_uses_distance_to_segment(pdfview):
+    index = make_index(pdfview)
+    assert index.hit_test(250, 103, tolerance=4) == [2]
+    assert index.hit_test(250, 110, tolerance=4) == []
+    assert index.hit_test(310, 100, tolerance=4) == []  # 선분 끝을 지난 지점
+
+
+def test_query_rect_only_returns_fully_contained(pdfview):
+    index = make_index(pdfview)
+    assert index.query_rect(0, 0, 60, 60) == {1}
+    assert index.query_rect(320, 0, 0, 320) == {1, 2, 3}
+
+
+def test_query_polygon(pdfview):
+    index = make_index(pdfview)
+    triangle = [(0, 0), (120, 0), (0, 120)]
+    assert index.query_polygon(triangle) == {1}
+    assert index.query_polygon([(0, 0), (10, 10)]) == set()
+
+
+def test_insert_moves_and_remove_clears_cells(pdfview):
+    index = make_index(pdfview)
+    index.insert(1, 'rect', (400, 400, 420, 420))
+    assert index.hit_test(20, 15) == []
+    assert index.hit_test(410, 410) == [1]
+    for ann_id in (1, 2, 3):
+        index.remove(ann_id)
+    index.remove(99)  # 없는 id 는 무시
+    assert index.items == {}
+    assert index.cells == {}
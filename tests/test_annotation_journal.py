@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def open_journal(pdfview, tmp_path):
+    journals = []
+
+    def open_journal(flush_interval=0.01):
+        journal = pdfview.AnnotationJournal(str(tmp_path / 'doc.journal'))
+        journal.flush_interval = flush_interval
+        journals.append(journal)
+        return journal
+
+    yield open_journal
+    for journal in journals:
+        journal.close()
+
+
+def rect(pdfview, ann_id, color=0xFFFF0000):
+    return pdfview.Annotation(ann_id, pdfview.AnnotationType.RECT, 1, 2, 3, 4, color)
+
+
+def test_replay_restores_add_update_delete(pdfview, open_journal):
+    journal = open_journal()
+    encode = pdfview.AnnotationJournal.encode
+    journal.append(encode('add', 0, rect(pdfview, 1)))
+    journal.append(encode('add', 2, rect(pdfview, 2)))
+    journal.append(encode('update', 0, rect(pdfview, 1, 0xFF00FF00)))
+    journal.append({'op': 'delete', 'ids': [2]})
+    journal.append(encode('update', 0, rect(pdfview, 2)))  # 삭제된 주석의 갱신은 무시
+    journal.close()
+
+    restored = open_journal().replay()
+    assert [(page, ann.id, ann.color) for page, ann in restored] == [(0, 1, 0xFF00FF00)]
+
+
+def test_records_written_in_one_batch(pdfview, open_journal):
+    journal = open_journal(flush_interval=0.2)
+    batches = []
+    write = journal._write
+    journal._write = lambda batch: (batches.append(len(batch)), write(batch))
+    for ann_id in range(50):
+        journal.append(pdfview.AnnotationJournal.encode('add', 0, rect(pdfview, ann_id)))
+    journal.close()
+    assert batches == [50]
+
+
+def test_truncated_last_line_is_ignored(pdfview, open_journal):
+    journal = open_journal()
+    journal.append(pdfview.AnnotationJournal.encode('add', 0, rect(pdfview, 1)))
+    journal.close()
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "add", "page": 0, "id": 2, "ki')
+
+    state, records = pdfview.AnnotationJournal.read(journal.path)
+    assert list(state) == [1]
+    assert records == 1
+
+
+def test_compaction_keeps_only_live_state(pdfview, open_journal):
+    journal = open_journal()
+    journal.compact_min_records = 5
+    for color in range(10):
+        journal.append(pdfview.AnnotationJournal.encode('update' if color else 'add', 0, rect(pdfview, 1, color)))
+    journal.close()
+
+    with open(journal.path, encoding='utf-8') as f:
+        assert len(f.readlines()) < 10
+    (page, ann), = open_journal().replay()
+    assert ann.color == 9
+
+
+def test_reset_keeps_saved_xrefs_across_edits_and_compaction(pdfview, open_journal):
+    journal_class = pdfview.AnnotationJournal
+    journal = open_journal()
+    journal.append(journal_class.encode('add', 0, rect(pdfview, 9)))  # 저장 전 기록은 reset 이 대체
+    journal.reset([
+        journal_class.encode('add', 0, rect(pdfview, 1), xref=11),
+        journal_class.encode('add', 1, rect(pdfview, 2), xref=12),
+        journal_class.encode('add', 1, rect(pdfview, 3)),
+        {'op': 'stale', 'page': 2, 'id': 4, 'xref': 14},
+    ])
+    journal.close()
+
+    journal = open_journal()
+    assert [ann.id for _, ann in journal.replay()] == [1, 2, 3]
+    journal.append(journal_class.encode('update', 0, rect(pdfview, 1, 0xFF00FF00)))
+    journal.append({'op': 'delete', 'ids': [2, 3]})
+    journal.close()
+
+    state, _ = journal_class.read(journal.path)
+    assert [(page, ann.id, ann.color) for page, ann in journal_class.annotations_of(state)] == [(0, 1, 0xFF00FF00)]
+    assert journal_class.saved_xrefs_of(state) == {1: (0, 11), 2: (1, 12), 4: (2, 14)}
+
+    # 압축된 파일을 다시 읽어도 삭제된 저장 주석의 xref 가 남아 있음
+    journal = open_journal()
+    journal.replay()
+    journal.reset(list(state.values()))
+    journal.close()
+    with open(journal.path, encoding='utf-8') as f:
+        assert {json.loads(line)['op'] for line in f} == {'add', 'stale'}
+    state, _ = journal_class.read(journal.path)
+    assert journal_class.saved_xrefs_of(state) == {1: (0, 11), 2: (1, 12), 4: (2, 14)}
@@ -0,0 +1,40 @@
+def result(**corpora):
+    return {'corpora': {name: {metric: {'median': median, 'p95': median, 'n': 1}
+                               for metric, median in metrics.items()}
+                        for name, metrics in corpora.items()}}
+
+
+def test_regression_beyond_tolerance(pdfview):
+    baseline = result(**{'text-1': {'open_ms': 100.0, 'zoom_ms': 50.0}})
+    current = result(**{'text-1': {'open_ms': 115.0, 'zoom_ms': 40.0}})
+    rows, regressed = pdfview.compare_benchmarks(current, baseline, 0.10)
+    assert regressed
+    assert [(corpus, metric) for corpus, metric, *_ in rows] == [('text-1', 'open_ms'), ('text-1', 'zoom_ms')]
+    assert rows[0][2:4] == (100.0, 115.0)
+    assert round(rows[0][4], 3) == 0.15
+    assert round(rows[1][4], 3) == -0.2
+
+
+def test_change_within_tolerance_is_not_a_regression(pdfview):
+    baseline = result(**{'text-1': {'open_ms': 100.0}})
+    current = result(**{'text-1': {'open_ms': 109.0}})
+    _, regressed = pdfview.compare_benchmarks(current, baseline, 0.10)
+    assert not regressed
+
+
+def test_missing_or_empty_metrics_are_skipped(pdfview):
+    baseline = result(**{'text-1': {'open_ms': 100.0, 'save_ms': 0.0}})
+    current = result(**{'text-1': {'open_ms': 100.0, 'save_ms': 500.0, 'zoom_ms': 10.0},
+                        'image-1': {'open_ms': 999.0}})
+    current['corpora']['text-1']['peak_rss_mb'] = None
+    rows, regressed = pdfview.compare_benchmarks(current, baseline, 0.10)
+    assert [(corpus, metric) for corpus, metric, *_ in rows] == [('text-1', 'open_ms')]
+    assert not regressed
+    assert pdfview.compare_benchmarks(current, {}, 0.10) == ([], False)
+
+
+def test_bench_summary_median_and_p95(pdfview):
+    assert pdfview._bench_summary([]) is None
+    assert pdfview._bench_summary([3.0, 1.0, 2.0]) == {'median': 2.0, 'p95': 3.0, 'n': 3}
+    summary = pdfview._bench_summary([float(v) for v in range(1, 21)])
+    assert summary == {'median': 10.5, 'p95': 19.0, 'n': 20}
@@ -0,0 +1,28 @@
+def raster(pdfview, width=4, height=3, fill=0x7F):
+    from PyQt5.QtGui import QImage
+    buffer = bytearray([fill]) * (width * 4 * height)
+    return pdfview.RasterImage(buffer, buffer, width, height, width * 4,
+                               QImage.Format_RGBA8888_Premultiplied)
+
+
+def test_put_later_writes_raster_buffer(pdfview, qapp, tmp_path):
+    cache = pdfview.DiskRenderCache(str(tmp_path))
+    key = (0, 1.0, 0, ('rgba',))
+    cache.put_later('doc', key, raster(pdfview))
+    cache.close()  # 대기 중인 쓰기를 마친 뒤 종료
+
+    image = cache.get('doc', key)
+    assert (image.width(), image.height(), image.bytesPerLine()) == (4, 3, 16)
+    assert bytes(image.buffer) == bytes([0x7F]) * 48
+    assert cache.get('other', key) is None
+
+
+def test_put_later_skips_when_writer_is_behind_or_closed(pdfview, qapp, tmp_path):
+    cache = pdfview.DiskRenderCache(str(tmp_path))
+    cache.max_pending = 0
+    cache.put_later('doc', (0,), raster(pdfview))
+    assert cache._thread is None  # 쓸 것이 없으면 쓰기 스레드도 시작하지 않음
+    cache.max_pending = 8
+    cache.close()
+    cache.put_later('doc', (1,), raster(pdfview))
+    assert cache.get('doc', (1,)) is None
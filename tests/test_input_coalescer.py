@@ -0,0 +1,29 @@
+import pytest
+
+from PyQt5.QtCore import QPoint, QPointF, Qt
+from PyQt5.QtGui import QWheelEvent
+
+
+def ctrl_wheel(delta=120):
+    return QWheelEvent(QPointF(10, 10), QPointF(10, 10), QPoint(0, 0), QPoint(0, delta),
+                       Qt.NoButton, Qt.ControlModifier, Qt.NoScrollPhase, False)
+
+
+def test_continuous_zoom_burst_is_one_relayout(pdfview, qapp, pdf_path, open_viewer, monkeypatch):
+    viewer = open_viewer(pdf_path)
+    viewer.setContinuousMode(True)
+    view = viewer.continuous_view
+    scheduler = viewer.input_scheduler
+    scheduler.frame_interval = lambda: 10.0  # 테스트 도중 다음 프레임이 오지 않도록
+    scheduler.flush()
+    relayouts = []
+    relayout = view.relayout
+    monkeypatch.setattr(view, 'relayout', lambda: (relayouts.append(1), relayout()))
+
+    for _ in range(3):
+        view.wheelEvent(ctrl_wheel())
+    assert viewer.zoom_factor == 1.0 and relayouts == []  # 다음 프레임까지 모아 둠
+
+    scheduler.flush()
+    assert viewer.zoom_factor == pytest.approx(1.2 ** 3)
+    assert len(relayouts) == 1
@@ -0,0 +1,87 @@
+from PyQt5.QtGui import QImage
+
+
+def image(width, height=1):
+    # 32비트 이미지: 1x1 은 4바이트
+    return QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+
+
+def test_make_key_rounds_scale_and_normalizes_rotation(pdfview):
+    key = pdfview.PageCache.make_key(3, 1.000004, 450, ['rgba'])
+    assert key == (3, 1.0, 90, ('rgba',))
+    assert pdfview.PageCache.make_key(3, 0.99999999, 90, ('rgba',)) == key
+
+
+def test_evicts_least_recently_used_by_bytes(pdfview):
+    cache = pdfview.PageCache(max_bytes=12)
+    cache.put('a', image(1))
+    cache.put('b', image(1))
+    cache.put('c', image(1))
+    assert cache.get('a') is not None  # a 가 가장 최근 사용이 됨
+    cache.put('d', image(1))
+    assert 'b' not in cache
+    assert set(cache.entries) == {'c', 'a', 'd'}
+    assert cache.current_bytes == 12
+    assert cache.evictions == 1
+
+
+def test_replacing_a_key_updates_size(pdfview):
+    cache = pdfview.PageCache(max_bytes=100)
+    cache.put('a', image(4))
+    cache.put('a', image(2))
+    assert len(cache) == 1
+    assert cache.current_bytes == 8
+
+
+def test_oversized_image_is_not_cached(pdfview):
+    cache = pdfview.PageCache(max_bytes=8)
+    cache.put('a', image(1))
+    cache.put('big', image(3))
+    assert 'big' not in cache
+    assert 'a' in cache
+
+
+def test_set_budget_evicts_down_to_new_limit(pdfview):
+    cache = pdfview.PageCache(max_bytes=16)
+    for name in 'abcd':
+        cache.put(name, image(1))
+    cache.set_budget(8)
+    assert list(cache.entries) == ['c', 'd']
+
+
+def test_hit_and_miss_counters(pdfview):
+    cache = pdfview.PageCache()
+    cache.put('a', image(1))
+    cache.get('a')
+    cache.get('missing')
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+
+
+def test_best_key_picks_largest_scale_matching_state(pdfview):
+    cache = pdfview.PageCache()
+    make_key = pdfview.PageCache.make_key
+    cache.put(make_key(0, 0.5, 0, ('rgba',)), image(1))
+    cache.put(make_key(0, 2.0, 0, ('rgba',)), image(2))
+    cache.put(make_key(0, 4.0, 90, ('rgba',)), image(3))
+    cache.put(make_key(0, 8.0, 0, ('rgba', ('invert',))), image(4))
+    cache.put(make_key(1, 9.0, 0, ('rgba',)), image(5))
+    assert cache.best_key(0, 0, ('rgba',)) == make_key(0, 2.0, 0, ('rgba',))
+    assert cache.best_key(0) == make_key(0, 8.0, 0, ('rgba', ('invert',)))
+    assert cache.find_page(0, 90).width() == 3
+    assert cache.find_page(2) is None
+
+
+def test_invalidate_page_and_remove(pdfview):
+    cache = pdfview.PageCache()
+    make_key = pdfview.PageCache.make_key
+    cache.put(make_key(0, 1.0, 0), image(1))
+    cache.put(make_key(0, 2.0, 0), image(1))
+    cache.put(make_key(1, 1.0, 0), image(1))
+    cache.invalidate(0)
+    assert list(cache.entries) == [make_key(1, 1.0, 0)]
+    assert cache.current_bytes == 4
+    cache.remove(make_key(1, 1.0, 0))
+    cache.remove(make_key(1, 1.0, 0))  # 없는 키는 무시
+    assert len(cache) == 0
+    assert cache.current_bytes == 0
@@ -0,0 +1,22 @@
+import pytest
+
+
+def test_empty_spec_means_all_pages(pdfview):
+    assert pdfview.parse_page_range(None, 3) == [0, 1, 2]
+    assert pdfview.parse_page_range('', 3) == [0, 1, 2]
+
+
+def test_single_pages_and_ranges_are_zero_based(pdfview):
+    assert pdfview.parse_page_range('1-3,7', 10) == [0, 1, 2, 6]
+    assert pdfview.parse_page_range(' 2 , 4-4 ,', 5) == [1, 3]
+
+
+def test_open_ended_ranges(pdfview):
+    assert pdfview.parse_page_range('8-', 10) == [7, 8, 9]
+    assert pdfview.parse_page_range('-2', 10) == [0, 1]
+
+
+@pytest.mark.parametrize('spec', ['0', '11', '3-2', '9-11', 'x', '1-a'])
+def test_invalid_ranges_raise_value_error(pdfview, spec):
+    with pytest.raises(ValueError):
+        pdfview.parse_page_range(spec, 10)
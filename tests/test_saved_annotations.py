@@ -0,0 +1,67 @@
+import pytest
+
+fitz = pytest.importorskip('fitz')
+
+RED = 0xFFFF0000
+
+
+def save(pdfview, qapp, viewer, path):
+    viewer.saveTo(path)
+    assert pdfview._wait_until(qapp, lambda: not viewer.save_worker.isRunning())
+    qapp.processEvents()  # saved 시그널 전달
+
+
+def border_pixel(viewer):
+    """(20, 70) 에 그려지는 사각형 주석 테두리 위치의 래스터 픽셀 색"""
+    key = viewer.page_cache.best_key(0)
+    image = viewer.page_cache.get(key)
+    return image.pixelColor(round(20 * key[1]), round(70 * key[1])).name()
+
+
+def native_annots(path):
+    with fitz.open(path) as document:
+        return [annot.xref for annot in document[0].annots()]
+
+
+def test_saved_annotation_is_drawn_once_after_reopen(pdfview, qapp, pdf_path, open_viewer):
+    viewer = open_viewer(pdf_path)
+    viewer.annotations.create(0, pdfview.AnnotationType.RECT, 20, 20, 120, 120, RED)
+    save(pdfview, qapp, viewer, pdf_path)
+    viewer.close()
+    assert len(native_annots(pdf_path)) == 1
+
+    viewer = open_viewer(pdf_path)
+    assert [ann.color for _, ann in viewer.annotations] == [RED]
+    # 같은 주석이 페이지 래스터에도 들어가면 두 번 보이고, 지워도 원래 모습이 남음
+    assert border_pixel(viewer) == '#ffffff'
+
+
+def test_journal_replay_after_save_tracks_saved_annotations(pdfview, qapp, pdf_path, open_viewer):
+    viewer = open_viewer(pdf_path)
+    kept = viewer.annotations.create(0, pdfview.AnnotationType.RECT, 20, 20, 120, 120, RED)
+    removed = viewer.annotations.create(0, pdfview.AnnotationType.RECT, 150, 150, 190, 190, RED)
+    save(pdfview, qapp, viewer, pdf_path)
+    viewer.close()
+    saved = native_annots(pdf_path)
+    assert len(saved) == 2
+
+    # 다시 연 세션: 저장된 주석을 고치고 지운 뒤 저장하지 않고 닫음 (저널에만 남음)
+    viewer = open_viewer(pdf_path)
+    assert viewer.saved_annotation_xrefs == {kept.id: (0, saved[0]), removed.id: (0, saved[1])}
+    ann = viewer.annotations.get(0, kept.id)
+    ann.color = 0xFF0000FF
+    viewer.annotations.update(0, ann)
+    viewer.annotations.remove(0, [removed.id])
+    viewer.close()
+
+    # 저널 재생: 주석 레이어에 한 번씩만 있고, 지운 주석은 다음 저장 때 지우도록 xref 를 기억
+    viewer = open_viewer(pdf_path)
+    assert [(ann.id, ann.color) for _, ann in viewer.annotations] == [(kept.id, 0xFF0000FF)]
+    assert set(viewer.saved_annotation_xrefs) == {kept.id, removed.id}
+    assert border_pixel(viewer) == '#ffffff'
+    save(pdfview, qapp, viewer, pdf_path)
+
+    with fitz.open(pdf_path) as document:
+        annots = list(document[0].annots())
+        assert len(annots) == 1
+        assert annots[0].colors['stroke'] == pytest.approx((0.0, 0.0, 1.0))
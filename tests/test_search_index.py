@@ -0,0 +1,74 @@
+import gzip
+import json
+
+import pytest
+
+
+def words(*texts):
+    # 단어마다 가로로 10pt 씩 떨어진 상자
+    return [(text, i * 10.0, 0.0, i * 10.0 + 8, 10.0) for i, text in enumerate(texts)]
+
+
+def make_index(pdfview):
+    index = pdfview.SearchIndex()
+    index.add_page(3, words('the', 'quick', 'brown', 'fox'))
+    index.add_page(0, words('a', 'quick', 'fox', 'and', 'a', 'quick', 'brown', 'dog'))
+    return index
+
+
+def test_normalize_strips_punctuation_and_case(pdfview):
+    assert pdfview.SearchIndex.normalize('“Hello,”') == 'hello'
+    assert pdfview.SearchIndex.normalize('...') == ''
+
+
+def test_single_word_hits_in_page_then_reading_order(pdfview):
+    hits = make_index(pdfview).search('Quick')
+    assert [page for page, _ in hits] == [0, 0, 3]
+    assert [boxes[0][0] for _, boxes in hits] == [10.0, 50.0, 10.0]
+
+
+def test_phrase_search_requires_consecutive_words(pdfview):
+    hits = make_index(pdfview).search('quick brown!')
+    assert [(page, len(boxes)) for page, boxes in hits] == [(0, 2), (3, 2)]
+    assert hits[0][1] == [(50.0, 0.0, 58.0, 10.0), (60.0, 0.0, 68.0, 10.0)]
+    assert make_index(pdfview).search('fox and a quick brown dog')[0][0] == 0
+    assert make_index(pdfview).search('brown quick') == []
+    assert make_index(pdfview).search('dog cat') == []  # 페이지 끝을 넘는 구절
+
+
+def test_empty_query_and_duplicate_page(pdfview):
+    index = make_index(pdfview)
+    assert index.search('  ,. ') == []
+    index.add_page(3, words('other'))  # 이미 색인된 페이지는 무시
+    assert index.search('other') == []
+    assert len(index) == 2
+    assert index.is_indexed(0) and not index.is_indexed(1)
+
+
+def test_save_and_load_round_trip(pdfview, tmp_path):
+    path = str(tmp_path / 'cache' / 'index.json.gz')
+    make_index(pdfview).save(path)
+    loaded = pdfview.SearchIndex()
+    loaded.load(path)
+    assert loaded.search('quick brown') == make_index(pdfview).search('quick brown')
+
+
+def test_extract_page_words_uses_unrotated_coordinates(pdfview):
+    fitz = pytest.importorskip('fitz')
+    document = fitz.open()
+    page = document.new_page(width=200, height=100)
+    page.insert_text((20, 50), 'Hello, World', fontsize=12)
+    unrotated = pdfview.extract_page_words(page)
+    page.set_rotation(90)
+    rotated = pdfview.extract_page_words(page)
+    assert [word[0] for word in unrotated] == ['hello', 'world']
+    assert rotated == unrotated
+
+
+def test_load_ignores_other_versions(pdfview, tmp_path):
+    path = str(tmp_path / 'index.json.gz')
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump({'version': 1, 'pages': {'0': [['quick', 0, 0, 1, 1]]}}, f)
+    index = pdfview.SearchIndex()
+    index.load(path)
+    assert len(index) == 0